@@ -0,0 +1,17 @@
+"""
+Analytics module para FUTBIN
+"""
+
+from .analytics import (
+    price_matrix,
+    forward_fill,
+    rolling_mean,
+    pct_change,
+    volatility,
+    rolling_bands,
+    correlations,
+    summarize,
+    price_changes,
+)
+
+__version__ = "1.0.0"
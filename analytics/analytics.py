@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Análisis de precios sobre el historial completo con NumPy
+
+El historial columnar (get_price_histories o la copia local de database/mirror.py)
+se convierte en una matriz tiempo x serie, con una columna por (página, plataforma,
+rating) y una fila por intervalo (una hora por defecto). Todas las funciones
+trabajan sobre esa matriz a la vez, sin recorrer los ratings uno por uno. Los
+huecos (horas sin precio) son NaN.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from scraping.platforms import split_source_key
+
+
+# Intervalo de la matriz
+DEFAULT_STEP = timedelta(hours=1)
+
+# Ventanas del resumen, en horas
+SUMMARY_CHANGES = {"1h": 1, "24h": 24, "7d": 168}
+SUMMARY_VOLATILITY_HOURS = 24
+SUMMARY_BAND_HOURS = 168
+
+
+def _category_codes(history, column, names_key):
+    """Índices y nombres de una columna de texto (la copia local ya trae índices)"""
+    values = history[column]
+    if names_key in history:
+        return np.asarray(values), list(history[names_key])
+    names, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+    return codes, list(names)
+
+
+def price_matrix(history, step=DEFAULT_STEP):
+    """
+    Convierte el historial columnar en una matriz tiempo x serie
+
+    Si una serie tiene varios precios en el mismo intervalo queda el último.
+
+    Args:
+        history (dict): Columnas "timestamp", "source", "platform", "rating", "price"
+            ordenadas por timestamp (listas o arrays)
+        step (timedelta): Tamaño de cada intervalo
+
+    Returns:
+        dict: {"timestamp": array (T,) con el inicio de cada intervalo,
+            "keys": lista de (origen, plataforma, rating) de cada columna,
+            "prices": array (T, K) de float con NaN donde no hay precio}
+    """
+    timestamps = np.asarray(history["timestamp"], dtype="datetime64[us]")
+    if len(timestamps) == 0:
+        return {"timestamp": timestamps, "keys": [], "prices": np.empty((0, 0))}
+
+    source_codes, sources = _category_codes(history, "source", "sources")
+    platform_codes, platforms = _category_codes(history, "platform", "platforms")
+    ratings = np.asarray(history["rating"], dtype=np.int64)
+
+    # Una columna por combinación (origen, plataforma, rating) presente, con un entero por
+    # combinación: np.unique sobre una sola columna es mucho más rápido que por filas
+    low = int(ratings.min())
+    span = int(ratings.max()) - low + 1
+    combined = (np.asarray(source_codes, dtype=np.int64) * len(platforms)
+                + np.asarray(platform_codes, dtype=np.int64)) * span + (ratings - low)
+    series, column = np.unique(combined, return_inverse=True)
+    column = column.reshape(-1)
+    keys = [
+        (sources[code // span // len(platforms)], platforms[code // span % len(platforms)], int(code % span + low))
+        for code in series.tolist()
+    ]
+
+    step_us = np.timedelta64(int(step.total_seconds() * 1_000_000), "us")
+    start = timestamps[0] - (timestamps[0] - np.datetime64("1970-01-01T00:00:00", "us")) % step_us
+    row = ((timestamps - start) // step_us).astype(np.int64)
+
+    # Último precio de cada celda: recorriendo al revés, np.unique se queda con la primera aparición
+    cell = row * len(keys) + column
+    _, last = np.unique(cell[::-1], return_index=True)
+    last = len(cell) - 1 - last
+
+    prices = np.full((int(row[-1]) + 1, len(keys)), np.nan)
+    prices[row[last], column[last]] = np.asarray(history["price"], dtype=np.float64)[last]
+    return {
+        "timestamp": start + np.arange(prices.shape[0]) * step_us,
+        "keys": keys,
+        "prices": prices,
+    }
+
+
+def forward_fill(prices):
+    """Rellena cada hueco con el último precio anterior de la misma columna"""
+    rows = np.arange(prices.shape[0])[:, None]
+    source_row = np.maximum.accumulate(np.where(np.isnan(prices), 0, rows), axis=0)
+    return prices[source_row, np.arange(prices.shape[1])]
+
+
+def _pad_front(values, rows):
+    """Agrega rows filas de NaN al principio (para devolver arrays del mismo largo que la entrada)"""
+    return np.concatenate([np.full((rows,) + values.shape[1:], np.nan), values])
+
+
+def _rolling_sums(prices, window):
+    """Suma, suma de cuadrados y cantidad de valores de cada ventana (sumas acumuladas)"""
+    valid = ~np.isnan(prices)
+    values = np.where(valid, prices, 0.0)
+    zeros = np.zeros((1, prices.shape[1]))
+    cumsum = np.concatenate([zeros, np.cumsum(values, axis=0)])
+    cumsq = np.concatenate([zeros, np.cumsum(values * values, axis=0)])
+    count = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+    return (
+        cumsum[window:] - cumsum[:-window],
+        cumsq[window:] - cumsq[:-window],
+        count[window:] - count[:-window],
+    )
+
+
+def rolling_mean(prices, window):
+    """
+    Media de las últimas window filas de cada columna (ignora los NaN)
+
+    Returns:
+        array: (T, K); las primeras window - 1 filas son NaN
+    """
+    if window > prices.shape[0]:
+        return np.full(prices.shape, np.nan)
+    total, _, count = _rolling_sums(prices, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, np.nan)
+    return _pad_front(mean, window - 1)
+
+
+def pct_change(prices, periods=1):
+    """
+    Cambio porcentual de cada columna frente a periods filas antes
+
+    Returns:
+        array: (T, K); las primeras periods filas son NaN
+    """
+    change = np.full(prices.shape, np.nan)
+    if periods < prices.shape[0]:
+        previous = prices[:-periods]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            change[periods:] = (prices[periods:] - previous) / previous * 100
+    return change
+
+
+def volatility(prices, window):
+    """
+    Desvío estándar de los cambios porcentuales entre filas en las últimas window filas
+
+    Returns:
+        array: (T, K) en puntos porcentuales; NaN con menos de dos cambios en la ventana
+    """
+    returns = pct_change(prices, 1)
+    if window > returns.shape[0]:
+        return np.full(prices.shape, np.nan)
+    total, squares, count = _rolling_sums(returns, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - total * total / count) / (count - 1)
+    variance = np.where(count > 1, np.maximum(variance, 0.0), np.nan)
+    return _pad_front(np.sqrt(variance), window - 1)
+
+
+def _rolling_extreme(prices, window, extreme, fill):
+    """
+    Mínimo o máximo móvil en tiempo lineal (van Herk / Gil-Werman)
+
+    Divide cada columna en bloques de window filas; el extremo de una ventana es
+    el extremo entre el sufijo del bloque donde empieza y el prefijo del bloque
+    donde termina, así que no depende del tamaño de la ventana.
+    """
+    rows, columns = prices.shape
+    blocks = -(-rows // window)
+    padded = np.full((blocks * window, columns), fill)
+    padded[:rows] = np.where(np.isnan(prices), fill, prices)
+    shaped = padded.reshape(blocks, window, columns)
+
+    prefix = extreme.accumulate(shaped, axis=1).reshape(-1, columns)
+    suffix = extreme.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(-1, columns)
+
+    # Ventana que termina en la fila end: [end - window + 1, end]
+    end = np.arange(window - 1, rows)
+    result = extreme(suffix[end - window + 1], prefix[end])
+    result[np.isinf(result)] = np.nan
+    return _pad_front(result, window - 1)
+
+
+def rolling_bands(prices, window):
+    """
+    Mínimo y máximo de las últimas window filas de cada columna (ignora los NaN)
+
+    Returns:
+        tuple: (mínimos, máximos), arrays (T, K); las primeras window - 1 filas son NaN
+    """
+    if window > prices.shape[0]:
+        empty = np.full(prices.shape, np.nan)
+        return empty, empty.copy()
+    low = _rolling_extreme(prices, window, np.minimum, np.inf)
+    high = _rolling_extreme(prices, window, np.maximum, -np.inf)
+    return low, high
+
+
+def correlations(prices, window=None):
+    """
+    Correlación entre columnas de los cambios porcentuales entre filas
+
+    Args:
+        prices (array): Matriz (T, K)
+        window (int): Usar solo las últimas window filas (None para todas)
+
+    Returns:
+        array: (K, K); NaN para las series sin al menos dos cambios en común con las demás
+    """
+    if window is not None:
+        prices = prices[-(window + 1):]
+    returns = pct_change(forward_fill(prices), 1)[1:]
+    finite = np.isfinite(returns)
+
+    # Series con menos de dos cambios (por ejemplo, una página recién agregada) quedan
+    # en NaN para no dejar a las demás sin filas completas
+    usable = finite.sum(axis=0) >= 2
+    complete = returns[finite[:, usable].all(axis=1)][:, usable]
+
+    result = np.full((prices.shape[1], prices.shape[1]), np.nan)
+    if len(complete) >= 2:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result[np.ix_(usable, usable)] = np.corrcoef(complete, rowvar=False)
+    return result
+
+
+def _steps(hours, step):
+    return max(1, int(round(hours * 3600 / step.total_seconds())))
+
+
+def summarize(matrix, step=DEFAULT_STEP, changes=None, volatility_hours=SUMMARY_VOLATILITY_HOURS,
+              band_hours=SUMMARY_BAND_HOURS):
+    """
+    Resumen del final del historial para todas las series a la vez
+
+    Args:
+        matrix (dict): Resultado de price_matrix
+        step (timedelta): Intervalo con el que se armó la matriz
+        changes (dict): {nombre: horas} de los cambios a calcular (por defecto SUMMARY_CHANGES)
+        volatility_hours (float): Ventana de la volatilidad
+        band_hours (float): Ventana del mínimo y máximo
+
+    Returns:
+        dict: {(origen, plataforma, rating): {"price", "change_<nombre>", "low", "high",
+            "mean" (de la ventana band_hours), "volatility"}} con None donde no hay datos suficientes
+    """
+    changes = SUMMARY_CHANGES if changes is None else changes
+    prices = matrix["prices"]
+    if prices.size == 0:
+        return {}
+
+    filled = forward_fill(prices)
+    last = filled[-1]
+    columns = {"price": last}
+
+    for name, hours in changes.items():
+        periods = _steps(hours, step)
+        if periods < len(filled):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                columns[f"change_{name}"] = (last - filled[-1 - periods]) / filled[-1 - periods] * 100
+        else:
+            columns[f"change_{name}"] = np.full(len(last), np.nan)
+
+    # Ventanas solo sobre las últimas filas: no hace falta calcular toda la serie
+    band = prices[-_steps(band_hours, step):]
+    recent = filled[-(_steps(volatility_hours, step) + 1):]
+    valid = ~np.isnan(band)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        columns["low"] = np.where(valid.any(axis=0), np.where(valid, band, np.inf).min(axis=0), np.nan)
+        columns["high"] = np.where(valid.any(axis=0), np.where(valid, band, -np.inf).max(axis=0), np.nan)
+        columns["mean"] = np.where(valid.any(axis=0), np.where(valid, band, 0).sum(axis=0) / valid.sum(axis=0), np.nan)
+    columns["volatility"] = volatility(recent, max(2, len(recent) - 1))[-1] if len(recent) > 2 else np.full(len(last), np.nan)
+
+    summary = {}
+    for index, key in enumerate(matrix["keys"]):
+        summary[key] = {
+            name: (None if np.isnan(values[index]) else round(float(values[index]), 2))
+            for name, values in columns.items()
+        }
+    return summary
+
+
+def price_changes(matrix, prices_dict, hours, now=None):
+    """
+    Cambio porcentual de cada precio actual frente al del historial hace hours horas
+
+    Args:
+        matrix (dict): Resultado de price_matrix (debe cubrir el momento now - hours)
+        prices_dict (dict): Precios actuales con las claves del scraper
+        hours (float): Horas hacia atrás
+        now (datetime): Momento de los precios actuales (por defecto ahora)
+
+    Returns:
+        dict: {clave: cambio en %} con las mismas claves que prices_dict; None si no hay referencia
+    """
+    now = now or datetime.now()
+    filled = forward_fill(matrix["prices"]) if matrix["prices"].size else matrix["prices"]
+    row = int(np.searchsorted(matrix["timestamp"], np.datetime64(now - timedelta(hours=hours), "us"), side="right")) - 1
+    columns = {key: index for index, key in enumerate(matrix["keys"])}
+
+    changes = {}
+    for key, price in prices_dict.items():
+        column = columns.get(tuple(split_source_key(key)))
+        reference = filled[row, column] if row >= 0 and column is not None else np.nan
+        if price is None or np.isnan(reference) or reference == 0:
+            changes[key] = None
+        else:
+            changes[key] = round((price - reference) / reference * 100, 2)
+    return changes
+
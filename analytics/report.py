@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Reporte de precios: último precio, cambios, volatilidad, bandas y correlaciones
+
+Lee el historial de la copia local (database/mirror.py) si existe y, si no, del
+backend de almacenamiento.
+
+Uso:
+    python -m analytics.report [--days 30] [--platform ps] [--source cheapest] [--json]
+"""
+
+import argparse
+import json
+import sys
+from datetime import timedelta
+
+import numpy as np
+
+from scraping.platforms import DEFAULT_SOURCE
+from .analytics import SUMMARY_CHANGES, correlations, price_matrix, summarize
+
+
+def load_history(days, platforms=None, sources=None, use_mirror=True):
+    """
+    Historial de los últimos days días, de la copia local o del backend
+
+    Returns:
+        tuple: (historial columnar o None, "mirror" o "backend")
+    """
+    since = timedelta(days=days)
+    if use_mirror:
+        from database.mirror import filter_mirror, load_mirror
+
+        mirror = load_mirror()
+        if mirror["last_timestamp"] is not None:
+            return filter_mirror(mirror, platforms=platforms, sources=sources, since=since), "mirror"
+
+    from database.database import get_price_histories
+
+    return get_price_histories(platforms=platforms, sources=sources, since=since), "backend"
+
+
+def _format(value, suffix=""):
+    if value is None:
+        return "-"
+    if suffix:
+        return f"{value:+.1f}{suffix}"
+    return f"{value:,.0f}".replace(",", ".")
+
+
+def _label(key):
+    source, platform, rating = key
+    return f"{platform.upper()} {rating}" if source == DEFAULT_SOURCE else f"{source} {platform.upper()} {rating}"
+
+
+def format_report(summary, keys, correlation):
+    """Tabla de texto con el resumen de cada serie y sus correlaciones más altas"""
+    changes = [f"change_{name}" for name in SUMMARY_CHANGES]
+    header = ["serie", "precio", *SUMMARY_CHANGES, "volat.", "mín 7d", "máx 7d", "correlación"]
+    lines = []
+    for index, key in enumerate(keys):
+        stats = summary[key]
+
+        # La otra serie más correlacionada
+        related = "-"
+        if len(keys) > 1:
+            row = np.where(np.arange(len(keys)) == index, np.nan, correlation[index])
+            if np.isfinite(row).any():
+                best = int(np.nanargmax(row))
+                related = f"{_label(keys[best])} ({row[best]:.2f})"
+
+        lines.append([
+            _label(key),
+            _format(stats["price"]),
+            *(_format(stats[change], "%") for change in changes),
+            _format(stats["volatility"], "%").lstrip("+"),
+            _format(stats["low"]),
+            _format(stats["high"]),
+            related,
+        ])
+
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *lines)]
+    text = [" ".join(str(cell).rjust(width) for cell, width in zip(header, widths))]
+    text += [" ".join(str(cell).rjust(width) for cell, width in zip(line, widths)) for line in lines]
+    return "\n".join(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reporte de precios a partir del historial")
+    parser.add_argument("--days", type=float, default=30, help="Días de historial a analizar")
+    parser.add_argument("--platform", action="append", help="Plataforma a incluir (se puede repetir)")
+    parser.add_argument("--source", action="append", help="Página (target) a incluir (se puede repetir)")
+    parser.add_argument("--no-mirror", action="store_true", help="Leer del backend aunque exista la copia local")
+    parser.add_argument("--json", action="store_true", help="Imprimir el resumen en JSON")
+    args = parser.parse_args(argv)
+
+    history, origin = load_history(args.days, args.platform, args.source, use_mirror=not args.no_mirror)
+    if history is None:
+        print("[ERROR] No se pudo leer el historial")
+        return 1
+    if len(history["price"]) == 0:
+        print("[ADVERTENCIA] No hay precios en el período pedido")
+        return 1
+
+    matrix = price_matrix(history)
+    summary = summarize(matrix)
+    correlation = correlations(matrix["prices"])
+
+    if args.json:
+        print(json.dumps([{"source": key[0], "platform": key[1], "rating": key[2], **summary[key]}
+                          for key in matrix["keys"]], indent=2))
+        return 0
+
+    print(f"[INFO] {len(history['price'])} precios de {len(matrix['keys'])} series "
+          f"({origin}, últimos {args.days:g} días)")
+    print()
+    print(format_report(summary, matrix["keys"], correlation))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
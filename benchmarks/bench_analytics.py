@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Mide el módulo de análisis (analytics/analytics.py) sobre años de historial horario sintético
+
+Genera un paseo aleatorio por hora para cada plataforma y rating (con huecos,
+como ejecuciones que fallaron), en el formato de la copia local, y mide cada
+cálculo sobre todas las series a la vez. Compara además:
+  - la media móvil vectorizada con un recorrido en Python serie por serie
+  - el mínimo/máximo móvil en tiempo lineal con una ventana deslizante directa
+
+Que den lo mismo se comprueba en tests/test_analytics.py.
+
+Uso:
+    python benchmarks/bench_analytics.py [--years 3] [--repeat 3]
+"""
+
+import argparse
+import sys
+from collections import deque
+
+import numpy as np
+
+from common import PLATFORMS, RATINGS, median_seconds
+from analytics.analytics import (
+    correlations,
+    pct_change,
+    price_matrix,
+    rolling_bands,
+    rolling_mean,
+    summarize,
+    volatility,
+)
+
+
+def make_history(years, gap_rate=0.02, seed=7):
+    """Historial columnar como el de load_mirror: una fila por hora, plataforma y rating"""
+    rng = np.random.default_rng(seed)
+    hours = int(years * 365 * 24)
+    start = np.datetime64("2023-01-01T00:00:00", "us")
+    series = [(platform, rating) for platform in range(len(PLATFORMS)) for rating in RATINGS]
+
+    timestamps = start + np.repeat(np.arange(hours), len(series)) * np.timedelta64(3600, "s")
+    walk = np.cumsum(rng.normal(0, 0.01, size=(hours, len(series))), axis=0)
+    base = np.array([1000 + (rating - RATINGS[0]) * 2000 for _, rating in series])
+    prices = np.round(base * np.exp(walk)).astype(np.int64).reshape(-1)
+
+    keep = rng.random(len(prices)) >= gap_rate
+    return {
+        "timestamp": timestamps[keep],
+        "source": np.zeros(len(prices), dtype=np.int16)[keep],
+        "platform": np.tile([platform for platform, _ in series], hours).astype(np.int16)[keep],
+        "rating": np.tile([rating for _, rating in series], hours).astype(np.int16)[keep],
+        "price": prices[keep],
+        "sources": ["cheapest"],
+        "platforms": PLATFORMS,
+    }
+
+
+def python_rolling_mean(prices, window):
+    """Media móvil recorriendo cada serie en Python (referencia)"""
+    result = []
+    for column in prices.T.tolist():
+        values = deque()
+        total = 0.0
+        means = []
+        for value in column:
+            values.append(value)
+            if value == value:
+                total += value
+            if len(values) > window:
+                old = values.popleft()
+                if old == old:
+                    total -= old
+            count = sum(1 for item in values if item == item) if len(values) == window else 0
+            means.append(total / count if count else float("nan"))
+        result.append(means)
+    return np.array(result).T
+
+
+def naive_bands(prices, window):
+    """Mínimo y máximo con una ventana deslizante directa (O(filas x ventana))"""
+    windows = np.lib.stride_tricks.sliding_window_view(prices, window, axis=0)
+    with np.errstate(invalid="ignore"):
+        low = np.where(np.isnan(windows), np.inf, windows).min(axis=-1)
+        high = np.where(np.isnan(windows), -np.inf, windows).max(axis=-1)
+    low[np.isinf(low)] = np.nan
+    high[np.isinf(high)] = np.nan
+    pad = np.full((window - 1, prices.shape[1]), np.nan)
+    return np.concatenate([pad, low]), np.concatenate([pad, high])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del módulo de análisis de precios")
+    parser.add_argument("--years", type=float, default=3, help="Años de historial horario")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones de cada cálculo")
+    args = parser.parse_args()
+
+    history = make_history(args.years)
+    seconds, matrix = median_seconds(lambda: price_matrix(history), args.repeat)
+    prices = matrix["prices"]
+    print(f"Historial: {len(history['price'])} filas -> matriz {prices.shape[0]} horas x {prices.shape[1]} series")
+    print(f"{'price_matrix':<28} {seconds * 1000:>9.1f}ms")
+
+    cases = [
+        ("rolling_mean 24h", lambda: rolling_mean(prices, 24)),
+        ("rolling_mean 30d", lambda: rolling_mean(prices, 720)),
+        ("pct_change 7d", lambda: pct_change(prices, 168)),
+        ("volatility 24h", lambda: volatility(prices, 24)),
+        ("rolling_bands 7d", lambda: rolling_bands(prices, 168)),
+        ("rolling_bands 30d", lambda: rolling_bands(prices, 720)),
+        ("correlations", lambda: correlations(prices)),
+        ("summarize", lambda: summarize(matrix)),
+    ]
+    for name, function in cases:
+        seconds, _ = median_seconds(function, args.repeat)
+        print(f"{name:<28} {seconds * 1000:>9.1f}ms")
+
+    print()
+    vectorized, _ = median_seconds(lambda: rolling_mean(prices, 24), args.repeat)
+    loop, _ = median_seconds(lambda: python_rolling_mean(prices, 24), 1)
+    print(f"media móvil 24h: NumPy {vectorized * 1000:.1f}ms, Python {loop * 1000:.0f}ms "
+          f"({loop / vectorized:.0f}x)")
+
+    for window in (168, 720):
+        linear, _ = median_seconds(lambda: rolling_bands(prices, window), args.repeat)
+        direct, _ = median_seconds(lambda: naive_bands(prices, window), 1)
+        print(f"mín/máx {window}h: lineal {linear * 1000:.1f}ms, directa {direct * 1000:.1f}ms "
+              f"({direct / linear:.1f}x)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
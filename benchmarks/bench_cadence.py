@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compara la cadencia fija con la adaptativa (scheduler/cadence.py) sobre precios simulados
+
+Simula --days días de precios minuto a minuto para cada plataforma y rating: en
+calma se mueven muy poco y durante los eventos (promos) caen de golpe y oscilan
+fuerte unas horas. Cada política "ejecuta" el scraper en sus horarios, guarda lo
+que vio y decide cuándo volver. Por política muestra:
+  - ejecuciones
+  - desfase medio: diferencia en % entre el precio real y el último visto, promediada
+    en todos los minutos, solo en calma y solo durante eventos
+  - demora media en ver el comienzo de cada evento
+
+Uso:
+    python benchmarks/bench_cadence.py [--days 30] [--events 6] [--min 10] [--max 90]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from common import PLATFORMS, RATINGS
+from scheduler.cadence import SCHEDULER_CADENCE_WINDOW_H, choose_interval, price_activity
+
+START = np.datetime64("2026-01-01T00:00", "m")
+
+
+def simulate(days, events, seed=11):
+    """Precios por minuto (minutos x series) y máscara de los minutos dentro de un evento"""
+    rng = np.random.default_rng(seed)
+    minutes = days * 24 * 60
+    series = len(PLATFORMS) * len(RATINGS)
+
+    returns = rng.normal(0, 0.0002, size=(minutes, series))
+    in_event = np.zeros(minutes, dtype=bool)
+    starts = np.sort(rng.choice(np.arange(60 * 24, minutes - 60 * 12), size=events, replace=False))
+    event_starts = []
+    for start in starts:
+        length = int(rng.integers(4 * 60, 10 * 60))
+        if in_event[start:start + length].any():
+            continue
+        in_event[start:start + length] = True
+        event_starts.append(int(start))
+        # Caída inicial de 10-25% y oscilaciones fuertes mientras dura la promo
+        returns[start] += np.log(1 - rng.uniform(0.10, 0.25, size=series))
+        returns[start + 1:start + length] += rng.normal(0, 0.003, size=(length - 1, series))
+
+    base = np.array([1000 + index * 2000 for index in range(len(RATINGS))] * len(PLATFORMS), dtype=float)
+    prices = np.round(base * np.exp(np.cumsum(returns, axis=0)))
+    return prices, in_event, event_starts
+
+
+def observed_history(times, observations, now, window_h):
+    """Historial columnar con lo visto en las últimas window_h horas"""
+    keep = [index for index, time in enumerate(times) if time > now - window_h * 60]
+    series = len(PLATFORMS) * len(RATINGS)
+    return {
+        "timestamp": np.repeat(START + np.array([times[index] for index in keep]), series),
+        "source": ["cheapest"] * (len(keep) * series),
+        "platform": [platform for _ in keep for platform in PLATFORMS for _ in RATINGS],
+        "rating": [rating for _ in keep for _ in PLATFORMS for rating in RATINGS],
+        "price": np.concatenate([observations[index] for index in keep]) if keep else np.array([]),
+    }
+
+
+def run_policy(prices, next_interval):
+    """Ejecuciones de una política; next_interval(times, observations, previous_s) -> segundos"""
+    times, observations = [], []
+    now, interval_s = 0, None
+    while now < len(prices):
+        times.append(now)
+        observations.append(prices[now])
+        interval_s = next_interval(times, observations, interval_s)
+        now += max(1, int(round(interval_s / 60)))
+    return times
+
+
+def score(prices, in_event, event_starts, times):
+    """Desfase medio (%) total, en calma y en eventos, y demora media en ver cada evento (min)"""
+    seen = np.zeros(len(prices), dtype=np.int64)
+    seen[times] = times
+    seen = np.maximum.accumulate(seen)
+    error = np.abs(prices - prices[seen]) / prices * 100
+    per_minute = error.mean(axis=1)
+
+    index = np.searchsorted(times, event_starts)
+    delays = [times[position] - start for position, start in zip(index, event_starts) if position < len(times)]
+    return per_minute.mean(), per_minute[~in_event].mean(), per_minute[in_event].mean(), np.mean(delays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cadencia fija frente a adaptativa sobre precios simulados")
+    parser.add_argument("--days", type=int, default=30, help="Días a simular")
+    parser.add_argument("--events", type=int, default=6, help="Eventos (promos) a simular")
+    parser.add_argument("--min", type=float, default=10, help="Intervalo mínimo de la cadencia adaptativa (min)")
+    parser.add_argument("--max", type=float, default=90, help="Intervalo máximo de la cadencia adaptativa (min)")
+    args = parser.parse_args()
+
+    prices, in_event, event_starts = simulate(args.days, args.events)
+
+    def adaptive(times, observations, previous_s):
+        history = observed_history(times, observations, times[-1], SCHEDULER_CADENCE_WINDOW_H)
+        activity = price_activity(history)["activity"]
+        return choose_interval(activity, previous_s, min_s=args.min * 60, max_s=args.max * 60)[0]
+
+    policies = {
+        "fija 60 min": lambda times, observations, previous_s: 3600,
+        "fija 15 min": lambda times, observations, previous_s: 900,
+        f"adaptativa {args.min:g}-{args.max:g} min": adaptive,
+    }
+
+    print(f"{args.days} días, {len(event_starts)} eventos ({in_event.mean() * 100:.1f}% del tiempo)")
+    print(f"{'política':<26} {'ejecuciones':>11} {'desfase':>8} {'en calma':>9} {'en eventos':>11} {'demora':>8}")
+    for name, next_interval in policies.items():
+        times = run_policy(prices, next_interval)
+        total, calm, event, delay = score(prices, in_event, event_starts, times)
+        print(f"{name:<26} {len(times):>11} {total:>7.2f}% {calm:>8.2f}% {event:>10.2f}% {delay:>6.0f}min")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
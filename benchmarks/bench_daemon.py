@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Costo por ejecución del scraper en frío frente al modo daemon con el navegador abierto
+
+Sirve las páginas guardadas (benchmarks/fixtures/) en un servidor local y mide,
+con Playwright (sin la ruta HTTP):
+  - frío: un proceso nuevo por ejecución (intérprete, imports, Playwright y Chromium),
+    como cada ejecución del workflow de GitHub Actions
+  - en proceso: el mismo proceso, pero lanzando un navegador por ejecución
+  - daemon: el mismo proceso y el mismo navegador (scraping/warm_browser.py)
+Para el daemon muestra además el RSS de Chromium y el driver después de cada
+ejecución, para ver si crece entre reciclajes.
+
+Uso:
+    python benchmarks/bench_daemon.py [--runs 10] [--max-runs 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import subprocess
+import sys
+import time
+
+from common import BENCHMARKS, PLATFORMS, fixture_server
+from monitoring.monitoring import process_tree_rss_mb
+from scraping.scraper import scrape_futbin_cheapest
+from scraping.warm_browser import WarmBrowser
+
+# Una ejecución en un proceso nuevo: termina con código 1 si no obtuvo precios
+COLD_RUN = """
+import asyncio, sys
+sys.path.insert(0, {benchmarks!r})
+from common import PLATFORMS
+from scraping.scraper import scrape_futbin_cheapest
+prices = asyncio.run(scrape_futbin_cheapest(session_state_path=None, base_url={base_url!r}, platforms=PLATFORMS))
+sys.exit(0 if prices else 1)
+"""
+
+
+def scrape(base_url, browser=None):
+    return scrape_futbin_cheapest(session_state_path=None, base_url=base_url, platforms=PLATFORMS, browser=browser)
+
+
+def check(prices, mode):
+    if not prices:
+        raise RuntimeError(f"La ejecución {mode} no devolvió precios")
+
+
+def run_cold(base_url, runs):
+    code = COLD_RUN.format(benchmarks=BENCHMARKS, base_url=base_url)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        times.append(time.perf_counter() - start)
+        if process.returncode:
+            raise RuntimeError("La ejecución en frío no devolvió precios")
+    return times
+
+
+def run_in_process(base_url, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        prices = asyncio.run(scrape(base_url))
+        times.append(time.perf_counter() - start)
+        check(prices, "en proceso")
+    return times
+
+
+def run_warm(base_url, runs, max_runs):
+    async def main():
+        warm = WarmBrowser(max_runs=max_runs, max_rss_mb=0)
+        times, rss = [], []
+        try:
+            for _ in range(runs):
+                start = time.perf_counter()
+                prices = await scrape(base_url, await warm.get())
+                times.append(time.perf_counter() - start)
+                check(prices, "del daemon")
+                await warm.release(ok=True)
+                rss.append(process_tree_rss_mb(include_self=False))
+        finally:
+            await warm.close()
+        return times, rss, warm.launches
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraping en frío frente al daemon con navegador abierto")
+    parser.add_argument("--runs", type=int, default=10, help="Ejecuciones por modo")
+    parser.add_argument("--max-runs", type=int, default=50, help="Ejecuciones del daemon antes de reciclar")
+    args = parser.parse_args()
+
+    with fixture_server() as base_url, contextlib.redirect_stderr(io.StringIO()):
+        cold = run_cold(base_url, args.runs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            in_process = run_in_process(base_url, args.runs)
+            warm, rss, launches = run_warm(base_url, args.runs, args.max_runs)
+
+    print(f"{'modo':<32} {'mediana':>9} {'primera':>9} {'máx':>9}")
+    for name, times in [("frío (proceso nuevo)", cold), ("en proceso (navegador nuevo)", in_process),
+                        ("daemon (navegador abierto)", warm)]:
+        print(f"{name:<32} {statistics.median(times) * 1000:>7.0f}ms {times[0] * 1000:>7.0f}ms "
+              f"{max(times) * 1000:>7.0f}ms")
+    print(f"  daemon: {statistics.median(cold) / statistics.median(warm):.1f}x menos por ejecución que en frío, "
+          f"{launches} lanzamiento(s) en {args.runs} ejecuciones")
+    if rss and rss[0] is not None:
+        print(f"  RSS de Chromium y el driver: {rss[0]:.0f} MB después de la primera, {rss[-1]:.0f} MB al final")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Mide el envío de notificaciones a varios destinos (notifications/dispatcher.py)
+contra un servidor local sin red
+
+El servidor tiene destinos rápidos, lentos, colgados y con fallos (503 las
+primeras veces), y simula el costo de abrir cada conexión (handshake TCP/TLS)
+con --connect-ms. Compara:
+  - requests.post secuencial, una conexión nueva por destino (como antes)
+  - dispatch: sesiones con keep-alive y todos los destinos a la vez
+El plazo con un destino colgado y los reintentos se comprueban en
+tests/test_dispatcher.py con el mismo servidor.
+
+Uso:
+    python benchmarks/bench_dispatcher.py [--messages 20] [--sinks 4] [--connect-ms 30] [--latency-ms 20]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+import requests
+
+from common import SinkHandler, reset_sinks, sink_server
+from notifications import dispatcher
+
+
+def sequential(urls, messages):
+    """Envío anterior: requests.post por destino, uno detrás de otro, sin sesión"""
+    for index in range(messages):
+        for url in urls:
+            requests.post(url, data=f"mensaje {index}".encode("utf-8"), timeout=(5, 10))
+
+
+def pooled(sinks, messages):
+    """dispatch con sesiones compartidas y destinos en paralelo"""
+    latencies = []
+    for index in range(messages):
+        results = dispatcher.dispatch("bench", f"mensaje {index}", sinks)
+        latencies.extend(result["seconds"] for result in results.values())
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del envío de notificaciones a varios destinos")
+    parser.add_argument("--messages", type=int, default=20, help="Mensajes a enviar")
+    parser.add_argument("--sinks", type=int, default=4, help="Destinos por mensaje")
+    parser.add_argument("--connect-ms", type=float, default=30, help="Costo simulado de abrir una conexión")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Latencia simulada de cada respuesta")
+    args = parser.parse_args()
+
+    SinkHandler.connect_s = args.connect_ms / 1000
+    SinkHandler.latency_s = args.latency_ms / 1000
+
+    with sink_server() as base:
+        urls = [f"{base}/fast/{index}" for index in range(args.sinks)]
+        sinks = dispatcher.parse_sinks(",".join(f"webhook:{url}" for url in urls))
+        total = args.messages * args.sinks
+
+        reset_sinks()
+        start = time.perf_counter()
+        sequential(urls, args.messages)
+        before = time.perf_counter() - start
+        before_connections = SinkHandler.connections
+
+        reset_sinks()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            latencies = pooled(sinks, args.messages)
+            after = time.perf_counter() - start
+        after_connections = SinkHandler.connections
+        latencies.sort()
+
+        print(f"{args.messages} mensajes x {args.sinks} destinos ({total} envíos)")
+        print(f"{'modo':<28} {'total':>9} {'por mensaje':>12} {'conexiones':>11}")
+        print(f"{'requests.post secuencial':<28} {before * 1000:>7.0f}ms {before / args.messages * 1000:>10.1f}ms "
+              f"{before_connections:>11}")
+        print(f"{'dispatch (pool + paralelo)':<28} {after * 1000:>7.0f}ms {after / args.messages * 1000:>10.1f}ms "
+              f"{after_connections:>11}")
+        print(f"  {before / after:.1f}x más rápido; latencia por destino p50 "
+              f"{latencies[len(latencies) // 2] * 1000:.1f}ms, p95 {latencies[int(len(latencies) * 0.95)] * 1000:.1f}ms")
+
+    dispatcher.close_sessions()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Mide cómo crece el tiempo del motor de scraping con la cantidad de targets
+
+Sirve futbin_cheapest.html en un servidor local (con latencia simulada) bajo
+varias rutas y ejecuta scrape_targets con 1, 2, 4, ... targets, con una sola
+pestaña y con el pool de pestañas. Con el pool, agregar targets debería sumar
+mucho menos que el tiempo de un target cada uno.
+
+Uso:
+    python benchmarks/bench_engine.py [--targets 1,2,4,8] [--concurrency 4] [--latency-ms 300]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+
+from common import PLATFORMS, FixtureHandler, fixture_server, make_targets
+from scraping.engine import scrape_targets
+
+
+def run(base_url, count, concurrency):
+    """Ejecuta scrape_targets una vez y devuelve los segundos"""
+    targets = make_targets(count)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        results = asyncio.run(scrape_targets(
+            targets,
+            concurrency=concurrency,
+            session_state_path=None,
+            base_url=base_url,
+            platforms=PLATFORMS,
+        ))
+        seconds = time.perf_counter() - start
+    failed = [name for name, result in results.items() if result["prices"] is None]
+    if failed:
+        raise RuntimeError(f"Targets sin precios: {', '.join(failed)}")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del motor de scraping por cantidad de targets")
+    parser.add_argument("--targets", default="1,2,4,8", help="Cantidades de targets separadas por comas")
+    parser.add_argument("--concurrency", type=int, default=4, help="Pestañas del pool")
+    parser.add_argument("--latency-ms", type=int, default=300, help="Latencia simulada de cada respuesta")
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.targets.split(",") if count.strip()]
+    FixtureHandler.latency = args.latency_ms / 1000
+
+    print(f"{'targets':>8} {'1 pestaña':>11} {f'{args.concurrency} pestañas':>12} {'aceleración':>12}")
+    with fixture_server() as base_url:
+        for count in counts:
+            sequential = run(base_url, count, 1)
+            pooled = run(base_url, count, args.concurrency)
+            print(f"{count:>8} {sequential:>10.2f}s {pooled:>11.2f}s {sequential / pooled:>11.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
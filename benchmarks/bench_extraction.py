@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compara los tiempos de extracción de precios sobre una copia guardada de la página
+
+Carga benchmarks/fixtures/futbin_cheapest.html en Chromium y mide:
+  - "handles": el recorrido elemento por elemento (text_content por columna y por precio)
+  - "evaluate": todas las columnas y precios en un único page.evaluate
+
+Que ambos modos devuelvan los mismos precios se comprueba en tests/test_scraper.py.
+
+Uso:
+    python benchmarks/bench_extraction.py [--runs 20] [--fixture ruta.html]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+from common import FIXTURES, PLATFORMS, RATINGS
+from playwright.async_api import async_playwright
+from scraping.scraper import extract_prices
+
+FIXTURE = os.path.join(FIXTURES, "futbin_cheapest.html")
+
+
+async def run_benchmark(fixture, runs):
+    """
+    Ejecuta ambos modos de extracción sobre la misma página y devuelve los tiempos
+
+    Returns:
+        dict: {modo: [segundos, ...]}
+    """
+    with open(fixture, "r", encoding="utf-8") as f:
+        html = f.read()
+
+    report = {}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.set_content(html)
+
+        for mode in ("handles", "evaluate"):
+            times = []
+            for _ in range(runs):
+                # Silenciar los prints para medir solo la extracción
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    await extract_prices(page, PLATFORMS, RATINGS, mode)
+                    times.append(time.perf_counter() - start)
+            report[mode] = times
+
+        await browser.close()
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de modos de extracción")
+    parser.add_argument("--runs", type=int, default=20, help="Repeticiones por modo")
+    parser.add_argument("--fixture", default=FIXTURE, help="HTML guardado de la página")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.fixture, args.runs))
+
+    print(f"{'modo':<10} {'media (ms)':>12} {'mediana (ms)':>14} {'min (ms)':>10}")
+    for mode, times in report.items():
+        print(f"{mode:<10} {statistics.mean(times) * 1000:>12.2f} "
+              f"{statistics.median(times) * 1000:>14.2f} {min(times) * 1000:>10.2f}")
+
+    handles = statistics.median(report["handles"])
+    evaluate = statistics.median(report["evaluate"])
+    print(f"\nAceleración (mediana): x{handles / evaluate:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
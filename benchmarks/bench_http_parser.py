@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Mide el parser HTML de la ruta HTTP sobre la copia guardada de la página
+
+Los precios que devuelve y la detección de bloqueos se comprueban en
+tests/test_http_fetcher.py.
+
+Uso:
+    python benchmarks/bench_http_parser.py [--runs 50]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+from common import PLATFORMS, RATINGS, read_fixture
+from scraping.http_fetcher import parse_cheapest_html
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del parser HTML de la ruta HTTP")
+    parser.add_argument("--runs", type=int, default=50, help="Repeticiones del parseo")
+    args = parser.parse_args()
+
+    html = read_fixture("futbin_cheapest.html")
+
+    times = []
+    for _ in range(args.runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            parse_cheapest_html(html, RATINGS, PLATFORMS)
+            times.append(time.perf_counter() - start)
+
+    print(f"Parseo de {len(html) / 1024:.0f} KB: media {statistics.mean(times) * 1000:.2f} ms, "
+          f"mediana {statistics.median(times) * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
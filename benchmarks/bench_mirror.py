@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Mide la copia local columnar de pricehistory (database/mirror.py)
+
+Carga un historial horario sintético en el backend SQLite en memoria y mide:
+  - la primera sincronización (todo el historial)
+  - una sincronización incremental después de una ejecución nueva (filas recibidas)
+  - cargar y filtrar toda la copia (load_mirror + filter_mirror) frente a
+    get_price_histories sobre el backend
+
+Que la sincronización incremental traiga solo las filas nuevas se comprueba en
+tests/test_mirror.py.
+
+Uso:
+    python benchmarks/bench_mirror.py [--days 90] [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from common import make_runs, median_seconds
+
+# Backend embebido para medir sin red (la configuración se lee al importar database)
+os.environ.setdefault("STORAGE_BACKEND", "sqlite")
+os.environ.setdefault("STORAGE_SQLITE_PATH", ":memory:")
+
+from database.database import get_backend, get_price_histories
+from database.mirror import filter_mirror, load_mirror, sync_mirror
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la copia local de pricehistory")
+    parser.add_argument("--days", type=int, default=90, help="Días de historial horario a cargar")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de cada lectura")
+    args = parser.parse_args()
+
+    backend = get_backend()
+    runs = make_runs(args.days)
+    for run in runs[:-1]:
+        backend.write_records(run, run)
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-mirror-"), "mirror")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        full = sync_mirror(path)
+        backend.write_records(runs[-1], runs[-1])
+        incremental = sync_mirror(path, overlap_hours=0)
+
+    rows = sum(len(run) for run in runs)
+    print(f"Backend: {backend.LABEL}, {len(runs)} ejecuciones, {rows} filas\n")
+    print(f"Sincronización completa:    {full['fetched']:>8} filas en {full['seconds'] * 1000:>8.1f}ms")
+    print(f"Sincronización incremental: {incremental['fetched']:>8} filas en {incremental['seconds'] * 1000:>8.1f}ms")
+
+    since = datetime.now() - timedelta(days=args.days)
+    mirror_seconds, loaded = median_seconds(lambda: filter_mirror(load_mirror(path), since=since), args.repeat)
+    backend_seconds, _ = median_seconds(lambda: get_price_histories(since=since), args.repeat)
+    print(f"\nCargar {len(loaded['price'])} filas:")
+    print(f"  copia local (memory-map)    {mirror_seconds * 1000:>8.2f}ms")
+    print(f"  get_price_histories ({backend.LABEL}) {backend_seconds * 1000:>8.2f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
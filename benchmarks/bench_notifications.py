@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Cuenta cuántas notificaciones y cuántos bytes se enviarían con cada modo de notificación
+
+Simula --days días de precios horarios (un paseo aleatorio por plataforma y
+rating) y compara NOTIFY_MODE=always con NOTIFY_MODE=changes para varios
+umbrales, usando las mismas funciones que send_scraper_notification (sin red).
+
+Uso:
+    python benchmarks/bench_notifications.py [--days 30] [--thresholds 2,5,10]
+"""
+
+import argparse
+import random
+import sys
+
+from common import EXPECTED
+from notifications.notifications import diff_prices, format_changes, format_prices
+from scraping.platforms import split_source_key
+
+
+def simulate(days, seed=3):
+    """Lista de precios por hora con un paseo aleatorio (1% de desvío por hora)"""
+    rng = random.Random(seed)
+    prices = dict(EXPECTED)
+    runs = []
+    for _ in range(days * 24):
+        prices = {key: max(200, round(price * (1 + rng.gauss(0, 0.01)), -2)) for key, price in prices.items()}
+        runs.append(prices)
+    return runs
+
+
+def count_changes_mode(runs, min_pct, min_coins=0):
+    """Envíos y bytes en modo "changes" (el snapshot solo avanza en las claves notificadas)"""
+    snapshot = None
+    sent = 0
+    size = 0
+    for prices in runs:
+        if snapshot is None:
+            body = format_prices(prices)
+            snapshot = {tuple(split_source_key(key)): price for key, price in prices.items()}
+        else:
+            changes = diff_prices(snapshot, prices, min_pct, min_coins)
+            if not changes:
+                continue
+            body = format_changes(changes)
+            snapshot.update({key: new for key, (_, new) in changes.items()})
+        sent += 1
+        size += len(body.encode("utf-8"))
+    return sent, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Notificaciones enviadas por modo y umbral")
+    parser.add_argument("--days", type=int, default=30, help="Días de precios horarios a simular")
+    parser.add_argument("--thresholds", default="2,5,10", help="Umbrales en %% separados por comas")
+    args = parser.parse_args()
+
+    runs = simulate(args.days)
+    always_size = sum(len(format_prices(prices).encode("utf-8")) for prices in runs)
+    print(f"{'modo':>16} {'envíos':>8} {'bytes':>10}")
+    print(f"{'always':>16} {len(runs):>8} {always_size:>10}")
+    for threshold in (float(value) for value in args.thresholds.split(",") if value.strip()):
+        sent, size = count_changes_mode(runs, threshold)
+        print(f"{f'changes {threshold:g}%':>16} {sent:>8} {size:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
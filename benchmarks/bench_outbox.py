@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Mide save_prices con el outbox local contra un Supabase simulado (benchmarks/fake_postgrest.py)
+
+Ejecuta varias veces save_prices con el servidor disponible, con latencia y
+caído (los lotes quedan en el outbox y save_prices responde igual de rápido), y
+mide el flush de los pendientes cuando vuelve. Que no se pierdan precios ni se
+dupliquen al reenviar se comprueba en tests/test_outbox.py.
+
+Uso:
+    python benchmarks/bench_outbox.py [--runs 5] [--latency-ms 200]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from common import EXPECTED
+from fake_postgrest import FAKE_KEY, FakePostgrestHandler, fake_postgrest, reset
+
+
+def timed_saves(save_prices, runs):
+    """Ejecuta save_prices runs veces y devuelve los segundos de cada una"""
+    times = []
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            saved = save_prices(EXPECTED)
+            times.append(time.perf_counter() - start)
+        if not saved:
+            raise RuntimeError("save_prices devolvió False")
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del outbox de escrituras de precios")
+    parser.add_argument("--runs", type=int, default=5, help="Ejecuciones de save_prices por escenario")
+    parser.add_argument("--latency-ms", type=int, default=200, help="Latencia simulada de Supabase")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-outbox-")
+    with fake_postgrest() as url:
+        # La configuración se lee al importar database
+        os.environ["SUPABASE_URL"] = url
+        os.environ["SUPABASE_KEY"] = FAKE_KEY
+        os.environ["OUTBOX_PATH"] = os.path.join(workdir, "outbox.sqlite3")
+
+        from database import outbox
+        from database.database import flush_outbox, save_prices
+
+        reset()
+
+        scenarios = [("disponible", False, 0.0), ("lento", False, args.latency_ms / 1000), ("caído", True, 0.0)]
+        print(f"{'Supabase':>12} {'media':>9} {'máx':>9} {'pendientes':>11}")
+        for name, down, latency in scenarios:
+            FakePostgrestHandler.down = down
+            FakePostgrestHandler.latency = latency
+            times = timed_saves(save_prices, args.runs)
+            pending = outbox.status()["pending_batches"]
+            print(f"{name:>12} {statistics.mean(times) * 1000:>7.1f}ms {max(times) * 1000:>7.1f}ms {pending:>11}")
+
+        # Supabase vuelve: el flush envía todo lo que quedó pendiente
+        FakePostgrestHandler.down = False
+        FakePostgrestHandler.latency = 0.0
+        start = time.perf_counter()
+        result = flush_outbox(retries=0)
+        seconds = time.perf_counter() - start
+        print(f"\nFlush: {result['sent_batches']} lotes ({result['sent_rows']} filas) en {seconds * 1000:.1f}ms, "
+              f"pendientes: {result['pending_batches']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
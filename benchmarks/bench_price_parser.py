@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark del parser de precios sobre un corpus generado
+
+Genera textos de precios en los formatos que aparecen en FUTBIN (850, 1,500,
+1.500, 15K, 15.5K, 1,234.5K, 1.2M, con espacios y texto alrededor) junto con su
+valor esperado, con los separadores de cada locale ("auto" mezcla los de "en" y
+"es"), y mide para extract_price_values (todo el corpus en una llamada) y para
+el parser anterior (el de la versión original, con los mismos patrones
+compilados en cada llamada):
+  - exactitud: porcentaje de textos interpretados con el valor correcto
+  - rendimiento: textos por segundo
+
+Uso:
+    python benchmarks/bench_price_parser.py [--size 200000] [--seed 7] [--locales auto,en,es]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+import common  # noqa: F401 (agrega la raíz del proyecto a sys.path)
+from scraping.price_extractor import PRICE_LOCALES, extract_price_values
+
+# Separadores con los que se escriben los textos de cada locale
+CORPUS_SEPARATORS = {
+    "en": [(",", ".")],
+    "es": [(".", ",")],
+    "auto": [(",", "."), (".", ",")],
+}
+
+
+def legacy_extract_price_value(text):
+    """Parser anterior (sin los prints): sufijo k con un solo separador, miles y enteros"""
+    if not text or not isinstance(text, str):
+        return None
+
+    k_pattern = re.search(r'(\d+(?:[.,]\d+)?)\s*[kK]', text)
+    if k_pattern:
+        value_str = k_pattern.group(1)
+        if '.' in value_str or ',' in value_str:
+            return int(float(value_str.replace(',', '.')) * 1000)
+        return int(value_str) * 1000
+
+    numbers = re.findall(r'(\d{1,3}(?:[.,]\d{3})+)', text)
+    if not numbers:
+        numbers = re.findall(r'\d+', text)
+    if numbers:
+        return int(numbers[0].replace(',', '').replace('.', ''))
+    return None
+
+
+def _thousands(value, separator):
+    return f"{value:,}".replace(",", separator)
+
+
+def generate_corpus(size, seed, locale="auto"):
+    """
+    Genera textos de precios con su valor esperado
+
+    Returns:
+        tuple: (textos, valores esperados)
+    """
+    rng = random.Random(seed)
+    texts = []
+    expected = []
+
+    for _ in range(size):
+        thousands, decimal = rng.choice(CORPUS_SEPARATORS[locale])
+        kind = rng.randrange(8)
+        if kind == 6 and locale == "auto":
+            # En "auto" un único separador antes del sufijo es decimal (7,499K son 7.499K)
+            kind = 5
+        if kind == 0:
+            value = rng.randint(200, 999)
+            text = str(value)
+        elif kind == 1:
+            value = rng.randint(1000, 999999)
+            text = _thousands(value, thousands)
+        elif kind == 2:
+            value = rng.randint(1, 999) * 1000
+            text = f"{value // 1000}{rng.choice('kK')}"
+        elif kind == 3:
+            tenths = rng.randint(10, 9999)
+            value = tenths * 100
+            text = f"{tenths // 10}{decimal}{tenths % 10}K"
+        elif kind == 4:
+            hundredths = rng.randint(100, 999)
+            value = hundredths * 10000
+            text = f"{hundredths // 100}{decimal}{hundredths % 100:02d}M"
+        elif kind == 5:
+            # Miles y decimales con sufijo: 1,234.5K
+            tenths = rng.randint(10000, 99999)
+            value = tenths * 100
+            text = f"{_thousands(tenths // 10, thousands)}{decimal}{tenths % 10}K"
+        elif kind == 6:
+            # Solo miles con sufijo (locales explícitos): 7,499K
+            value = rng.randint(1000, 99999) * 1000
+            text = f"{_thousands(value // 1000, thousands)}K"
+        else:
+            value = None
+            text = rng.choice(["", "-", "N/A", "sin precio"])
+
+        # Espacios y texto alrededor, como en el textContent de la página
+        if value is not None and rng.random() < 0.3:
+            text = f"  {text} coins\n"
+        texts.append(text)
+        expected.append(value)
+
+    return texts, expected
+
+
+def measure(parse, texts, expected):
+    """Devuelve (exactitud %, textos/s, ejemplos mal interpretados); parse recibe todo el corpus"""
+    start = time.perf_counter()
+    values = parse(texts)
+    seconds = time.perf_counter() - start
+    mismatches = [(text, value, want) for text, value, want in zip(texts, values, expected) if value != want]
+    return (len(texts) - len(mismatches)) / len(texts) * 100, len(texts) / seconds, mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark del parser de precios")
+    parser.add_argument("--size", type=int, default=200000, help="Cantidad de textos del corpus por locale")
+    parser.add_argument("--seed", type=int, default=7, help="Semilla del generador")
+    parser.add_argument("--locales", default="auto,en,es", help="Locales separados por comas")
+    args = parser.parse_args()
+
+    locales = [locale.strip() for locale in args.locales.split(",") if locale.strip()]
+    unknown = [locale for locale in locales if locale not in CORPUS_SEPARATORS or locale not in PRICE_LOCALES]
+    if unknown:
+        print(f"[ERROR] Locales sin corpus: {', '.join(unknown)}")
+        return 1
+
+    print(f"{'locale':<8} {'parser':<10} {'exactitud':>10} {'textos/s':>12}")
+    for locale in locales:
+        texts, expected = generate_corpus(args.size, args.seed, locale)
+        parsers = {
+            "actual": lambda texts: extract_price_values(texts, locale)[0],
+            "anterior": lambda texts: [legacy_extract_price_value(text) for text in texts],
+        }
+        for name, parse in parsers.items():
+            accuracy, rate, mismatches = measure(parse, texts, expected)
+            print(f"{locale:<8} {name:<10} {accuracy:>9.2f}% {rate:>12,.0f}")
+            for text, value, want in mismatches[:3]:
+                print(f"    {text!r}: {value} (esperado {want})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo del scraper contra páginas guardadas servidas en local
+
+Levanta un servidor HTTP local con las copias de benchmarks/fixtures/ y ejecuta
+cada variante del scraper contra él, varias veces. Por ejecución registra:
+  - tiempo por fase: launch, navigation, wait, extraction, parsing
+  - tiempo total
+  - pico de RSS del proceso y sus hijos (driver de Playwright y Chromium)
+  - cantidad de llamadas al driver de Playwright (IPC)
+
+El resultado se escribe en JSON para poder compararlo entre commits:
+
+    python benchmarks/bench_scraper.py --runs 5 --output bench.json
+    python benchmarks/bench_scraper.py --runs 5 --compare bench.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from common import PLATFORMS, RATINGS, fixture_server
+from scraping.http_fetcher import fetch_cheapest_http
+from scraping.scraper import scrape_futbin_cheapest
+
+PHASES = ["launch", "navigation", "wait", "extraction", "parsing"]
+
+
+class IpcCounter:
+    """
+    Cuenta los mensajes que el cliente de Playwright envía a su driver
+
+    Usa una API interna de Playwright: si no existe en la versión instalada,
+    el conteo queda en None.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.available = False
+        try:
+            from playwright._impl._connection import Connection
+        except ImportError:
+            return
+
+        original = getattr(Connection, "send_message_to_server", None)
+        if original is None:
+            return
+
+        counter = self
+
+        def counting_send(self, *args, **kwargs):
+            counter.count += 1
+            return original(self, *args, **kwargs)
+
+        Connection.send_message_to_server = counting_send
+        self.available = True
+
+    def reset(self):
+        self.count = 0
+
+    def value(self):
+        return self.count if self.available else None
+
+
+class RssSampler:
+    """
+    Muestrea el RSS del proceso y de todos sus descendientes leyendo /proc (Linux)
+
+    Chromium y el driver de Playwright son procesos hijos, así que su memoria no
+    aparece en el RSS del proceso de Python.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak_kb = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _children_map():
+        children = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as f:
+                    stat = f.read()
+            except OSError:
+                continue
+            # El nombre del proceso va entre paréntesis y puede contener espacios
+            ppid = int(stat.rsplit(")", 1)[1].split()[1])
+            children.setdefault(ppid, []).append(int(entry))
+        return children
+
+    @staticmethod
+    def _rss_kb(pid):
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return 0
+
+    def sample(self):
+        children = self._children_map()
+        pending = [os.getpid()]
+        total = 0
+        while pending:
+            pid = pending.pop()
+            total += self._rss_kb(pid)
+            pending.extend(children.get(pid, []))
+        self.peak_kb = max(self.peak_kb, total)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        if os.path.isdir("/proc"):
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def peak_mb(self):
+        if self._thread is None:
+            # Sin /proc: pico del propio proceso (ru_maxrss en KB en Linux, bytes en macOS)
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+        return round(self.peak_kb / 1024, 1)
+
+
+async def run_playwright(base_url, stats, extraction):
+    return await scrape_futbin_cheapest(
+        extraction=extraction,
+        session_state_path=None,
+        base_url=base_url,
+        platforms=PLATFORMS,
+        stats=stats,
+    )
+
+
+async def run_http(base_url, stats):
+    return await asyncio.to_thread(fetch_cheapest_http, RATINGS, PLATFORMS, base_url=base_url, stats=stats)
+
+
+# Variantes disponibles: nombre -> función (base_url, stats) -> resultado
+VARIANTS = {
+    "playwright": lambda base_url, stats: run_playwright(base_url, stats, "evaluate"),
+    "playwright-handles": lambda base_url, stats: run_playwright(base_url, stats, "handles"),
+    "http": run_http,
+}
+
+
+def run_variant(name, base_url, ipc):
+    """Ejecuta una vez la variante y devuelve sus métricas"""
+    stats = {}
+    ipc.reset()
+    with RssSampler() as sampler:
+        # Silenciar los prints del scraper para no medir la escritura en consola
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = asyncio.run(VARIANTS[name](base_url, stats))
+            total = time.perf_counter() - start
+    if result is None:
+        raise RuntimeError(f"La variante {name} no devolvió precios")
+
+    phases = {key: round(stats.get("phases", {}).get(key, 0.0), 4) for key in PHASES}
+    return {
+        "total": round(total, 4),
+        "phases": phases,
+        "peak_rss_mb": sampler.peak_mb(),
+        "ipc_calls": ipc.value() if name.startswith("playwright") else 0,
+    }
+
+
+def summarize(runs):
+    """Medianas de cada métrica sobre las ejecuciones"""
+    summary = {
+        "total": statistics.median(run["total"] for run in runs),
+        "peak_rss_mb": statistics.median(run["peak_rss_mb"] for run in runs),
+        "phases": {key: statistics.median(run["phases"][key] for run in runs) for key in PHASES},
+    }
+    ipc = [run["ipc_calls"] for run in runs if run["ipc_calls"] is not None]
+    summary["ipc_calls"] = statistics.median(ipc) if ipc else None
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def print_report(report, previous=None):
+    header = f"{'variante':<20} {'total':>8} " + " ".join(f"{key:>11}" for key in PHASES) + f" {'RSS MB':>8} {'IPC':>6}"
+    print(header)
+    print("-" * len(header))
+    for name, data in report["variants"].items():
+        summary = data["median"]
+        ipc = "-" if summary["ipc_calls"] is None else f"{summary['ipc_calls']:.0f}"
+        print(f"{name:<20} {summary['total']:>8.3f} "
+              + " ".join(f"{summary['phases'][key]:>11.3f}" for key in PHASES)
+              + f" {summary['peak_rss_mb']:>8.1f} {ipc:>6}")
+
+        if previous and name in previous.get("variants", {}):
+            before = previous["variants"][name]["median"]
+            delta = summary["total"] - before["total"]
+            pct = delta / before["total"] * 100 if before["total"] else 0.0
+            print(f"  vs {previous['meta'].get('commit')}: total {before['total']:.3f}s -> "
+                  f"{summary['total']:.3f}s ({pct:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del scraper contra páginas guardadas")
+    parser.add_argument("--runs", type=int, default=5, help="Ejecuciones por variante")
+    parser.add_argument("--variants", default=",".join(VARIANTS), help="Variantes separadas por comas")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--compare", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.variants.split(",") if name.strip()]
+    unknown = [name for name in names if name not in VARIANTS]
+    if unknown:
+        print(f"[ERROR] Variantes desconocidas: {', '.join(unknown)}")
+        return 1
+
+    ipc = IpcCounter()
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": args.runs,
+        },
+        "variants": {},
+    }
+
+    with fixture_server() as base_url:
+        for name in names:
+            runs = [run_variant(name, base_url, ipc) for _ in range(args.runs)]
+            report["variants"][name] = {"runs": runs, "median": summarize(runs)}
+
+    previous = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+
+    print_report(report, previous)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Resultados guardados en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
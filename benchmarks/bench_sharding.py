@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Mide el rendimiento del scraping repartido entre procesos según la cantidad de workers
+
+Sirve futbin_cheapest.html en un servidor local bajo N rutas y scrapea todas con
+scrape_sharded usando 1, 2, 4... workers (cada uno con su navegador). Informa
+targets por segundo y la aceleración respecto de un solo worker. Conviene
+ejecutarlo en una máquina Linux con varios núcleos.
+
+Uso:
+    python benchmarks/bench_sharding.py [--targets 24] [--workers 1,2,4] [--concurrency 3]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from common import PLATFORMS, FixtureHandler, fixture_server, make_targets
+from scraping.sharding import scrape_sharded
+
+
+def run(base_url, targets, workers, concurrency):
+    """Scrapea todos los targets y devuelve (segundos, workers usados)"""
+    stats = {}
+    start = time.perf_counter()
+    results = asyncio.run(scrape_sharded(
+        targets,
+        workers,
+        stats=stats,
+        concurrency=concurrency,
+        session_state_path=None,
+        base_url=base_url,
+        platforms=PLATFORMS,
+    ))
+    seconds = time.perf_counter() - start
+    failed = [name for name, result in results.items() if result["prices"] is None]
+    if failed:
+        raise RuntimeError(f"Targets sin precios: {', '.join(failed)}")
+    return seconds, stats.get("workers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del scraping repartido entre procesos")
+    parser.add_argument("--targets", type=int, default=24, help="Cantidad de páginas a scrapear")
+    parser.add_argument("--workers", default="1,2,4", help="Cantidades de workers separadas por comas")
+    parser.add_argument("--concurrency", type=int, default=3, help="Pestañas por worker")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Latencia simulada de cada respuesta")
+    args = parser.parse_args()
+
+    worker_counts = [int(count) for count in args.workers.split(",") if count.strip()]
+    FixtureHandler.latency = args.latency_ms / 1000
+    targets = make_targets(args.targets)
+
+    print(f"{args.targets} targets, {args.concurrency} pestañas por worker, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'total':>9} {'targets/s':>10} {'aceleración':>12}")
+    baseline = None
+    with fixture_server() as base_url:
+        for workers in worker_counts:
+            seconds, used = run(base_url, targets, workers, args.concurrency)
+            baseline = baseline or seconds
+            print(f"{used:>8} {seconds:>8.2f}s {args.targets / seconds:>10.2f} {baseline / seconds:>11.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Arranque en frío de los subcomandos de run_pipeline.py y control de presupuesto
+
+Cada medición es un intérprete nuevo que importa run_pipeline y carga los módulos
+de un subcomando (run_pipeline.load_command, lo mismo que hace main() antes de
+ejecutarlo), con python -X importtime (monitoring/startup.py). Por subcomando muestra
+la mediana del arranque, lo que suma sobre el intérprete solo y el import más pesado.
+Como referencia mide también el stack completo (scraper, Playwright, Supabase,
+NumPy y requests), que es lo que se carga al ejecutar el pipeline.
+
+Termina con código 1 si un subcomando sin scraping supera --budget-ms o importa
+Playwright, el scraper o el cliente de Supabase, así que sirve como control de
+regresión en CI.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 300] [--commands save,notify]
+"""
+
+import argparse
+import statistics
+import sys
+
+import common  # noqa: F401 (agrega la raíz del proyecto a sys.path)
+from monitoring.startup import import_profile, top_imports
+from run_pipeline import COMMANDS, PROFILE_CODE
+
+# Módulos que un subcomando sin scraping nunca debería importar al arrancar
+FORBIDDEN = ("playwright", "supabase", "scraping.engine", "scraping.scraper", "scraping.main")
+
+# Todo lo que usa el pipeline completo
+FULL_STACK = ("import scraping.main, database.supabase_backend, notifications.notifications, "
+              "analytics.report, requests")
+
+
+def measure(code, runs):
+    """Mediana del arranque de runs intérpretes nuevos, y el último perfil"""
+    profiles = [import_profile(code) for _ in range(runs)]
+    return statistics.median(profile["wall_ms"] for profile in profiles), profiles[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Arranque en frío de los subcomandos de run_pipeline.py")
+    parser.add_argument("--runs", type=int, default=5, help="Intérpretes nuevos por subcomando")
+    parser.add_argument("--budget-ms", type=float, default=300,
+                        help="Arranque máximo (mediana) de los subcomandos sin scraping")
+    parser.add_argument("--commands", help="Subcomandos separados por comas (por defecto todos)")
+    args = parser.parse_args()
+
+    names = args.commands.split(",") if args.commands else list(COMMANDS)
+    interpreter_ms, interpreter = measure("pass", args.runs)
+    print(f"intérprete solo: {interpreter_ms:.0f}ms, presupuesto: {args.budget_ms:.0f}ms "
+          f"(mediana de {args.runs})")
+    print(f"{'subcomando':<12} {'arranque':>9} {'+intérprete':>12} {'módulos':>8}  {'import más pesado':<34} estado")
+
+    failed = []
+    for name in names + ["(stack)"]:
+        code = FULL_STACK if name == "(stack)" else PROFILE_CODE.format(command=name)
+        wall_ms, profile = measure(code, args.runs)
+        reference = name in ("scrape", "(stack)")
+        if profile["error"]:
+            print(f"{name:<12} {'-':>9} {'-':>12} {'-':>8}  {'-':<34} "
+                  f"no disponible ({profile['error'].splitlines()[-1]})")
+            if not reference:
+                failed.append(name)
+            continue
+
+        heaviest = top_imports(profile, 1, interpreter)
+        heaviest = f"{heaviest[0][0]} {heaviest[0][1]:.0f}ms" if heaviest else "-"
+        modules = {module["module"] for module in profile["modules"]}
+        status = "referencia" if reference else "ok"
+        if not reference:
+            forbidden = sorted(module for module in modules
+                               if any(module == prefix or module.startswith(prefix + ".") for prefix in FORBIDDEN))
+            if forbidden:
+                status = f"[ERROR] importa {', '.join(forbidden[:3])}"
+            elif wall_ms > args.budget_ms:
+                status = f"[ERROR] supera {args.budget_ms:.0f}ms"
+            if status != "ok":
+                failed.append(name)
+        print(f"{name:<12} {wall_ms:>7.0f}ms {wall_ms - interpreter_ms:>10.0f}ms "
+              f"{len(modules) - len(interpreter['modules']):>8}  {heaviest:<34} {status}")
+
+    if failed:
+        print(f"[ERROR] Subcomandos fuera de presupuesto o con imports de más: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
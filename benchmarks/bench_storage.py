@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Compara los backends de almacenamiento con el mismo historial generado
+
+Carga un historial sintético (una ejecución por hora durante --days días, con
+todos los ratings y plataformas de rating_rules) en cada backend y mide:
+  - write: escritura de una ejecución (write_records)
+  - latest: lectura de latest_prices
+  - history: últimos 10 precios de un rating
+  - window: historial de todos los ratings de los últimos 7 días
+
+Supabase se mide contra benchmarks/fake_postgrest.py (con --latency-ms para
+aproximar la red); SQLite en archivo y en memoria. Que los backends devuelvan lo
+mismo se comprueba en tests/test_storage.py.
+
+Uso:
+    python benchmarks/bench_storage.py [--days 30] [--repeat 5] [--latency-ms 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from common import PLATFORMS, RATINGS, make_runs
+from fake_postgrest import FAKE_KEY, FakePostgrestHandler, fake_postgrest, reset
+
+OPERATIONS = ["write", "latest", "history", "window"]
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def measure(backend, runs, repeat, page_size):
+    """Carga el historial y devuelve ({operación: segundos (mediana)}, filas de la ventana)"""
+    writes = [timed(backend.write_records, run, run) for run in runs]
+
+    since = (datetime.now() - timedelta(days=7)).isoformat()
+    times = {operation: [] for operation in OPERATIONS[1:]}
+    window_rows = 0
+    for _ in range(repeat):
+        times["latest"].append(timed(backend.read_latest))
+        times["history"].append(timed(backend.read_history, "cheapest", PLATFORMS[0], RATINGS[0], 10))
+        start = time.perf_counter()
+        window = backend.read_histories(None, None, None, since, None, page_size)
+        times["window"].append(time.perf_counter() - start)
+        window_rows = len(window["price"])
+
+    result = {"write": statistics.median(writes)}
+    result.update({operation: statistics.median(values) for operation, values in times.items()})
+    return result, window_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los backends de almacenamiento")
+    parser.add_argument("--days", type=int, default=30, help="Días de historial horario a cargar")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones de cada lectura")
+    parser.add_argument("--latency-ms", type=int, default=20, help="Latencia simulada de Supabase")
+    args = parser.parse_args()
+
+    runs = make_runs(args.days)
+    workdir = tempfile.mkdtemp(prefix="bench-storage-")
+
+    with fake_postgrest() as url:
+        # La configuración se lee al importar los backends
+        os.environ["SUPABASE_URL"] = url
+        os.environ["SUPABASE_KEY"] = FAKE_KEY
+
+        from database import sqlite_backend
+        from database.database import HISTORY_PAGE_SIZE, get_backend
+
+        results = {}
+        window_rows = {}
+
+        reset()
+        FakePostgrestHandler.latency = args.latency_ms / 1000
+        results["supabase"], window_rows["supabase"] = measure(
+            get_backend("supabase"), runs, args.repeat, HISTORY_PAGE_SIZE
+        )
+
+        for name, path in (("sqlite", os.path.join(workdir, "prices.sqlite3")), ("sqlite-memory", ":memory:")):
+            sqlite_backend.reset_connection()
+            sqlite_backend.get_connection(path)
+            results[name], window_rows[name] = measure(sqlite_backend, runs, args.repeat, HISTORY_PAGE_SIZE)
+        sqlite_backend.reset_connection()
+
+    rows = sum(len(run) for run in runs)
+    print(f"Historial: {len(runs)} ejecuciones, {rows} filas; ventana de 7 días: {window_rows['sqlite']} filas\n")
+    print(f"{'backend':>14}" + "".join(f"{operation:>12}" for operation in OPERATIONS))
+    for name, result in results.items():
+        print(f"{name:>14}" + "".join(f"{result[operation] * 1000:>10.2f}ms" for operation in OPERATIONS))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Datos y utilidades compartidas por los benchmarks y los tests
+
+Al importarse agrega la raíz del proyecto a sys.path, así que los benchmarks
+(que se ejecutan como python benchmarks/bench_*.py) lo importan antes que los
+módulos del proyecto:
+
+    from common import EXPECTED, PLATFORMS, RATINGS
+    from scraping.http_fetcher import parse_cheapest_html
+
+Contiene los precios de las páginas guardadas en benchmarks/fixtures/, el
+servidor local que las sirve, un historial sintético de precios y un servidor de
+destinos de notificaciones.
+"""
+
+import contextlib
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCHMARKS)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(BENCHMARKS, "fixtures")
+RATINGS = [83, 84, 85, 86, 87, 88, 89, 90]
+PLATFORMS = ["ps", "pc"]
+
+# Precios de futbin_cheapest.html por (plataforma, rating), los mismos con Playwright y con HTTP
+EXPECTED_PRICES = {
+    "ps": [1100, 1600, 3000, 6100, 11500, 19800, 31400, 52800],
+    "pc": [1200, 1900, 3500, 7000, 13300, 22900, 36500, 60500],
+}
+EXPECTED = {
+    (platform, rating): price
+    for platform, prices in EXPECTED_PRICES.items()
+    for rating, price in zip(RATINGS, prices)
+}
+
+# Rutas servidas por el servidor local
+ROUTES = {
+    "/": "futbin_home.html",
+    "/squad-building-challenges/cheapest": "futbin_cheapest.html",
+}
+
+
+def read_fixture(name):
+    """Contenido de una página guardada en benchmarks/fixtures/"""
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def make_targets(count):
+    """count targets que el servidor local resuelve a la misma página (ignora la query)"""
+    return [
+        {"name": f"target-{index}", "path": f"/squad-building-challenges/cheapest?target={index}"}
+        for index in range(count)
+    ]
+
+
+def make_runs(days):
+    """Una lista de filas por ejecución horaria, de la más antigua a la más reciente"""
+    end = datetime.now().replace(minute=0, second=0, microsecond=0)
+    runs = []
+    for hour in range(days * 24, 0, -1):
+        timestamp = (end - timedelta(hours=hour)).isoformat()
+        runs.append([
+            {"source": "cheapest", "platform": platform, "rating": rating,
+             "timestamp": timestamp, "price": 1000 + rating * 10 + hour % 50}
+            for platform in PLATFORMS for rating in RATINGS
+        ])
+    return runs
+
+
+def median_seconds(function, repeat):
+    """Mediana de repeat ejecuciones de function y el resultado de la última"""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Sirve las páginas guardadas; cualquier otra ruta devuelve 404"""
+
+    # Demora de cada respuesta en segundos, para simular la latencia de red
+    latency = 0.0
+
+    def do_GET(self):
+        name = ROUTES.get(self.path.split("?")[0])
+        if name is None:
+            self.send_error(404)
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        with open(os.path.join(FIXTURES, name), "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def fixture_server():
+    """Levanta el servidor local en un puerto libre y devuelve su URL base"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    """Destinos de notificaciones: responde según la ruta (/fast, /slow, /hang y /flaky)"""
+
+    protocol_version = "HTTP/1.1"
+    connect_s = 0.0
+    latency_s = 0.0
+    flaky_failures = 2
+    connections = 0
+    requests = {}
+    _lock = threading.Lock()
+
+    def setup(self):
+        # Cada conexión nueva paga el costo del handshake
+        with SinkHandler._lock:
+            SinkHandler.connections += 1
+        time.sleep(self.connect_s)
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        path = self.path.rstrip("/")
+        with SinkHandler._lock:
+            count = SinkHandler.requests[path] = SinkHandler.requests.get(path, 0) + 1
+
+        if path.startswith("/hang"):
+            time.sleep(3600)
+        time.sleep(self.latency_s * (10 if path.startswith("/slow") else 1))
+
+        status = 503 if path.startswith("/flaky") and count <= self.flaky_failures else 200
+        body = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def sink_server():
+    """Levanta el servidor de destinos en un puerto libre y devuelve su URL base"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SinkHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def reset_sinks():
+    """Vuelve a cero los contadores del servidor y cierra las sesiones del dispatcher"""
+    from notifications import dispatcher
+
+    SinkHandler.connections = 0
+    SinkHandler.requests = {}
+    dispatcher.close_sessions()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Servidor local que imita la API REST de Supabase (PostgREST) para pruebas sin red
+
+Guarda las tablas en memoria y entiende lo que usa database.py:
+  - POST /rest/v1/<tabla> (insert, y upsert con on_conflict y Prefer resolution=...)
+  - GET /rest/v1/<tabla> con filtros eq., in.(...), gte., lt., order (.asc/.desc), limit y offset
+  - POST /rest/v1/rpc/upsert_latest_prices (database/migrations/003_latest_prices.sql)
+
+Se puede "apagar" (FakePostgrestHandler.down = True, responde 503) y agregar
+latencia a cada respuesta para simular un Supabase caído o lento.
+
+    with fake_postgrest() as url:
+        os.environ["SUPABASE_URL"] = url
+        os.environ["SUPABASE_KEY"] = FAKE_KEY
+"""
+
+import contextlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+
+# Clave con forma de JWT (el cliente de Supabase rechaza otras); el servidor no la valida
+FAKE_KEY = "fake.postgrest.key"
+
+# Tablas en memoria: {nombre: [filas]}
+TABLES = {}
+_tables_lock = threading.Lock()
+
+
+def _compare(value, literal):
+    """Compara una columna con un literal de la URL como número si se puede"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value, float(literal)
+    return str(value), literal
+
+
+def _matches(row, column, condition):
+    """Evalúa un filtro de PostgREST (eq., in.(...), gte., gt., lte., lt.) sobre una fila"""
+    operator, _, literal = condition.partition(".")
+    value = row.get(column)
+    if operator == "in":
+        options = [option.strip('"') for option in literal.strip("()").split(",")]
+        return any(_compare(value, option)[0] == _compare(value, option)[1] for option in options)
+    left, right = _compare(value, literal)
+    return {
+        "eq": left == right,
+        "gte": left >= right,
+        "gt": left > right,
+        "lte": left <= right,
+        "lt": left < right,
+    }[operator]
+
+
+def upsert_latest_prices(records):
+    """Igual que la función SQL: actualiza cada clave salvo que tenga un timestamp más nuevo"""
+    rows = TABLES.setdefault("latest_prices", [])
+    index = {(row["source"], row["platform"], row["rating"]): row for row in rows}
+    for record in records:
+        key = (record["source"], record["platform"], record["rating"])
+        if key not in index:
+            index[key] = dict(record)
+            rows.append(index[key])
+        elif record["timestamp"] >= index[key]["timestamp"]:
+            index[key].update(record)
+
+
+# Funciones de /rest/v1/rpc/<función>: {nombre: función(**parámetros)}
+RPC_FUNCTIONS = {"upsert_latest_prices": upsert_latest_prices}
+
+
+class FakePostgrestHandler(BaseHTTPRequestHandler):
+    """Atiende /rest/v1/<tabla> sobre TABLES"""
+
+    # True: responde 503 a todo, como un Supabase caído
+    down = False
+
+    # Demora de cada respuesta en segundos
+    latency = 0.0
+
+    # Peticiones recibidas: (método, tabla, filas enviadas o None)
+    requests = []
+
+    def _table(self):
+        return urlparse(self.path).path.rstrip("/").split("/")[-1]
+
+    def _respond(self, status, rows=None):
+        body = json.dumps(rows).encode() if rows is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _unavailable(self):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.down:
+            self._respond(503, {"message": "service unavailable"})
+            return True
+        return False
+
+    def do_GET(self):
+        table = self._table()
+        self.requests.append(("GET", table, None))
+        if self._unavailable():
+            return
+
+        params = parse_qsl(urlparse(self.path).query)
+        with _tables_lock:
+            rows = list(TABLES.get(table, []))
+
+        offset = 0
+        limit = None
+        order = []
+        descending = False
+        columns = None
+        for name, value in params:
+            if name == "select":
+                columns = None if value == "*" else value.split(",")
+            elif name == "order":
+                order = [column.split(".")[0] for column in value.split(",")]
+                descending = value.split(",")[0].endswith(".desc")
+            elif name == "limit":
+                limit = int(value)
+            elif name == "offset":
+                offset = int(value)
+            else:
+                rows = [row for row in rows if _matches(row, name, value)]
+
+        if order:
+            rows.sort(key=lambda row: tuple(row.get(column) for column in order), reverse=descending)
+        rows = rows[offset:offset + limit if limit is not None else None]
+        if columns:
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+        self._respond(200, rows)
+
+    def do_POST(self):
+        table = self._table()
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"[]")
+        records = payload if isinstance(payload, list) else [payload]
+        self.requests.append(("POST", table, records))
+        if self._unavailable():
+            return
+
+        if "/rpc/" in urlparse(self.path).path:
+            function = RPC_FUNCTIONS.get(table)
+            if function is None:
+                self._respond(404, {"message": f"function {table} not found"})
+                return
+            with _tables_lock:
+                function(**payload)
+            self._respond(204)
+            return
+
+        prefer = self.headers.get("Prefer") or ""
+        on_conflict = dict(parse_qsl(urlparse(self.path).query)).get("on_conflict")
+        key_columns = on_conflict.split(",") if on_conflict else None
+
+        with _tables_lock:
+            rows = TABLES.setdefault(table, [])
+            if key_columns is None:
+                rows.extend(dict(record) for record in records)
+            else:
+                index = {tuple(row.get(column) for column in key_columns): row for row in rows}
+                for record in records:
+                    key = tuple(record.get(column) for column in key_columns)
+                    if key not in index:
+                        index[key] = dict(record)
+                        rows.append(index[key])
+                    elif "resolution=merge-duplicates" in prefer:
+                        index[key].update(record)
+        self._respond(201)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def reset():
+    """Vacía las tablas, el registro de peticiones y vuelve a encender el servidor"""
+    with _tables_lock:
+        TABLES.clear()
+    FakePostgrestHandler.requests.clear()
+    FakePostgrestHandler.down = False
+    FakePostgrestHandler.latency = 0.0
+
+
+@contextlib.contextmanager
+def fake_postgrest():
+    """Levanta el servidor en un puerto libre y devuelve la URL que va en SUPABASE_URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakePostgrestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
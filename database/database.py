@@ -1,136 +1,368 @@
 #!/usr/bin/env python3
 """
-Módulo para manejar la base de datos Supabase que almacena los precios de FUTBIN
+Módulo para manejar la base de datos que almacena los precios de FUTBIN
+
+Las lecturas y escrituras pasan por un backend elegido con STORAGE_BACKEND:
+"supabase" (por defecto, database/supabase_backend.py) o "sqlite"
+(database/sqlite_backend.py, embebido, sin red). Cada backend implementa
+check, write_records, read_latest, read_history y read_histories.
 """
 
+import importlib
 import os
-from datetime import datetime
-from supabase import create_client, Client
-from dotenv import load_dotenv
+import threading
+import time
+from datetime import datetime, timedelta
+from scraping.platforms import DEFAULT_PLATFORM, DEFAULT_SOURCE, split_source_key
+
+# Backends disponibles: nombre en STORAGE_BACKEND -> módulo
+BACKENDS = {
+    "supabase": "database.supabase_backend",
+    "sqlite": "database.sqlite_backend",
+}
+
+# Backend de almacenamiento
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "supabase")
+
+# Segundos durante los que se reutiliza en memoria la última lectura de latest_prices
+LATEST_PRICES_TTL_S = float(os.getenv("LATEST_PRICES_TTL_S", "60"))
+
+# Filas por página en las consultas de historial (el máximo por defecto de PostgREST en Supabase)
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "1000"))
+
+# Cómo resumir los precios de cada intervalo al agrupar el historial
+BUCKET_AGGREGATES = {
+    "last": lambda prices: prices[-1],
+    "first": lambda prices: prices[0],
+    "min": min,
+    "max": max,
+    "mean": lambda prices: round(sum(prices) / len(prices)),
+}
 
-# Cargar variables de entorno
-load_dotenv()
+# Backend en uso (se importa en la primera llamada: el de Supabase carga su cliente)
+_backend = None
+_backend_lock = threading.Lock()
 
-def get_supabase_client() -> Client:
+# Última lectura de latest_prices: (momento de la lectura, precios)
+_latest_cache = None
+
+def get_backend(name=None):
     """
-    Obtiene el cliente de Supabase
+    Devuelve el módulo del backend de almacenamiento
+    
+    Args:
+        name (str): Nombre del backend; por defecto el elegido con STORAGE_BACKEND
+            (o con use_backend)
     
     Returns:
-        Client: Cliente de Supabase configurado
+        module: Módulo con check, write_records, read_latest, read_history y read_histories
+    """
+    global _backend
+    if name is not None:
+        if name not in BACKENDS:
+            raise ValueError(f"Backend de almacenamiento desconocido: {name}")
+        return importlib.import_module(BACKENDS[name])
+    
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = get_backend(STORAGE_BACKEND)
+    return _backend
+
+def use_backend(name):
     """
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_KEY")
+    Cambia el backend de almacenamiento del proceso (y descarta la copia de latest_prices)
     
-    if not supabase_url or not supabase_key:
-        raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar configurados")
+    Args:
+        name (str): Nombre del backend ("supabase", "sqlite")
+    """
+    global _backend, _latest_cache
+    backend = get_backend(name)
+    with _backend_lock:
+        _backend = backend
+        _latest_cache = None
+
+def check_database():
+    """
+    Comprueba una vez por proceso que el backend responde y que la tabla existe
     
-    return create_client(supabase_url, supabase_key)
+    Returns:
+        bool: True si la base de datos responde (lanza la excepción del backend si no)
+    """
+    return get_backend().check()
 
 def init_database():
     """
-    Inicializa la tabla en Supabase (se ejecuta automáticamente si la tabla no existe)
-    No es necesario para Supabase, pero mantiene la interfaz compatible
+    Conecta con el backend de almacenamiento y comprueba que la tabla pricehistory responde
+    
+    En Supabase la tabla se crea desde el dashboard (ver README); en SQLite se crea
+    al abrir la base.
     """
+    backend = get_backend()
     try:
-        client = get_supabase_client()
-        # Supabase crea la tabla automáticamente o se debe crear desde el dashboard
-        print("[INFO] Conectado a Supabase")
+        check_database()
+        print(f"[INFO] Conectado a {backend.LABEL}")
         return True
     except Exception as e:
-        print(f"[ERROR] Error al conectar con Supabase: {e}")
+        print(f"[ERROR] Error al conectar con {backend.LABEL}: {e}")
         return False
 
+def write_price_records(records):
+    """
+    Escribe filas de precios en el backend (lo usa el outbox para enviar sus lotes)
+    
+    El histórico se inserta ignorando las filas que ya existen (clave source,
+    platform, rating, timestamp), así que reenviar un lote no duplica precios.
+    latest_prices se actualiza con la fila más reciente de cada clave.
+    
+    Args:
+        records (list): Filas con source, platform, rating, timestamp y price
+    
+    Raises:
+        Exception: Si el backend rechaza o no responde la escritura del histórico
+    """
+    # Un envío puede juntar varios lotes: solo la fila más reciente de cada clave
+    latest = {}
+    for record in records:
+        key = (record["source"], record["platform"], record["rating"])
+        if key not in latest or record["timestamp"] >= latest[key]["timestamp"]:
+            latest[key] = record
+    
+    global _latest_cache
+    _latest_cache = None
+    get_backend().write_records(records, list(latest.values()))
+
+def flush_outbox(retries=None):
+    """
+    Envía al backend los lotes pendientes del outbox local
+    
+    Args:
+        retries (int): Reintentos de cada envío (por defecto OUTBOX_RETRIES)
+    
+    Returns:
+        dict: {"sent_batches", "sent_rows", "pending_batches", "error"}
+    """
+    # Importación diferida: python -m database.outbox no debe encontrar el módulo ya cargado
+    from . import outbox
+    
+    return outbox.flush(write_price_records, retries=retries)
+
 def save_prices(prices_dict):
     """
-    Guarda los precios en Supabase usando el esquema de dos tablas
+    Guarda los precios en el backend usando el esquema de dos tablas
+    
+    Con un backend remoto (Supabase) los precios se agregan primero al outbox local
+    (database/outbox.py) y después se envían, junto con los lotes que hayan quedado
+    pendientes de ejecuciones anteriores. Si Supabase no responde, el lote queda en
+    disco y se envía en la próxima ejecución (o con python -m database.outbox flush).
+    Con un backend local (SQLite) se escriben directamente.
+    
+    Inserta el histórico en pricehistory y actualiza latest_prices (una fila por
+    target, plataforma y rating con el último precio) para que la lectura del
+    precio actual sea una sola consulta.
     
     Args:
-        prices_dict (dict): Diccionario con {rating: precio}
+        prices_dict (dict): Diccionario con {(plataforma, rating): precio} o
+            {(target, plataforma, rating): precio}; las claves sin target se guardan
+            como DEFAULT_SOURCE y las que solo tienen el rating como DEFAULT_PLATFORM
         
     Returns:
-        bool: True si se guardaron correctamente, False en caso contrario
+        bool: True si se guardaron (en el backend o en el outbox), False en caso contrario
     """
-    try:
-        client = get_supabase_client()
-        
-        # Obtener timestamp actual
-        timestamp = datetime.now().isoformat()
-        
-        # Preparar datos para insertar en pricehistory
-        records = []
-        for rating, price in prices_dict.items():
-            if price is not None:
-                records.append({
-                    "rating": rating,
-                    "timestamp": timestamp,
-                    "price": price
-                })
-        
-        if not records:
-            print("[ADVERTENCIA] No hay datos para guardar")
-            return False
-        
-        # Insertar todos los registros en pricehistory
-        response = client.table("pricehistory").insert(records).execute()
-        
-        print(f"[OK] Precios guardados en Supabase ({len(records)} registros)")
-        return True
-        
-    except Exception as e:
-        print(f"[ERROR] Error al guardar precios en Supabase: {e}")
+    # Obtener timestamp actual
+    timestamp = datetime.now().isoformat()
+    
+    # Preparar datos para insertar en pricehistory
+    records = []
+    for key, price in prices_dict.items():
+        if price is not None:
+            source, platform, rating = split_source_key(key)
+            records.append({
+                "source": source,
+                "platform": platform,
+                "rating": rating,
+                "timestamp": timestamp,
+                "price": price
+            })
+    
+    if not records:
+        print("[ADVERTENCIA] No hay datos para guardar")
         return False
+    
+    from . import outbox
+    
+    backend = get_backend()
+    queued = False
+    if backend.REMOTE:
+        try:
+            outbox.enqueue(records)
+            queued = True
+        except Exception as e:
+            # Sin outbox (disco lleno, solo lectura...): escribir directamente
+            print(f"[ADVERTENCIA] No se pudo escribir el outbox local: {e}")
+    
+    if not queued:
+        try:
+            write_price_records(records)
+            print(f"[OK] Precios guardados en {backend.LABEL} ({len(records)} registros)")
+            return True
+        except Exception as e:
+            print(f"[ERROR] Error al guardar precios en {backend.LABEL}: {e}")
+            return False
+    
+    # Un solo intento: si el backend falla, la ejecución no espera los reintentos
+    result = flush_outbox(retries=0)
+    if result["error"]:
+        print(f"[ADVERTENCIA] {backend.LABEL} no disponible, {result['pending_batches']} lotes pendientes "
+              f"en el outbox: {result['error']}")
+    else:
+        print(f"[OK] Precios guardados en {backend.LABEL} ({result['sent_rows']} registros, "
+              f"{result['sent_batches']} lotes)")
+    
+    return True
 
-def get_latest_prices():
+def get_latest_prices(max_age_s=None):
     """
-    Obtiene los precios más recientes de Supabase usando el esquema de dos tablas
+    Obtiene el precio más reciente de cada rating con una sola consulta a latest_prices
+    
+    La lectura se guarda en memoria: durante max_age_s segundos las siguientes
+    llamadas no consultan el backend. save_prices descarta esa copia.
+    
+    Args:
+        max_age_s (float): Antigüedad máxima aceptada de la copia en memoria
+            (por defecto LATEST_PRICES_TTL_S; 0 fuerza la consulta)
     
     Returns:
-        dict: Diccionario con {rating: precio} o None si hay error
+        dict: Diccionario con {(plataforma, rating): precio} (con el target delante,
+            (target, plataforma, rating), para las páginas distintas de DEFAULT_SOURCE)
+            o None si hay error
     """
+    global _latest_cache
+    if max_age_s is None:
+        max_age_s = LATEST_PRICES_TTL_S
+    
+    cached = _latest_cache
+    if cached is not None and time.monotonic() - cached[0] < max_age_s:
+        return dict(cached[1])
+    
+    backend = get_backend()
     try:
-        client = get_supabase_client()
-        
-        # Obtener el timestamp más reciente
-        max_timestamp_response = client.table("pricehistory").select("timestamp").order("timestamp", desc=True).limit(1).execute()
+        rows = backend.read_latest()
         
-        if not max_timestamp_response.data:
+        if not rows:
             return None
         
-        latest_timestamp = max_timestamp_response.data[0]["timestamp"]
-        
-        # Obtener todos los precios de ese timestamp
-        prices_response = client.table("pricehistory").select("rating,price").eq("timestamp", latest_timestamp).order("rating").execute()
-        
         prices_dict = {}
-        for row in prices_response.data:
-            prices_dict[row["rating"]] = row["price"]
+        for row in sorted(rows, key=lambda row: (row["source"], row["platform"], row["rating"])):
+            if row["source"] == DEFAULT_SOURCE:
+                prices_dict[(row["platform"], row["rating"])] = row["price"]
+            else:
+                prices_dict[(row["source"], row["platform"], row["rating"])] = row["price"]
         
-        return prices_dict
+        _latest_cache = (time.monotonic(), prices_dict)
+        return dict(prices_dict)
         
     except Exception as e:
-        print(f"[ERROR] Error al leer precios de Supabase: {e}")
+        print(f"[ERROR] Error al leer precios de {backend.LABEL}: {e}")
         return None
 
-def get_price_history(rating, limit=10):
+def get_price_history(rating, limit=10, platform=DEFAULT_PLATFORM, source=DEFAULT_SOURCE):
     """
     Obtiene el historial de precios para un rating específico usando el esquema de dos tablas
     
     Args:
         rating (int): El rating del que se quiere obtener el historial
         limit (int): Número máximo de registros a obtener
+        platform (str): Plataforma del historial
+        source (str): Página (target) de la que salen los precios
         
     Returns:
         list: Lista de tuplas (timestamp, price) o None si hay error
     """
     try:
-        client = get_supabase_client()
-        
-        response = client.table("pricehistory").select("timestamp,price").eq("rating", rating).order("timestamp", desc=True).limit(limit).execute()
+        rows = get_backend().read_history(source, platform, rating, limit)
         
-        history = [(row["timestamp"], row["price"]) for row in response.data]
+        history = [(row["timestamp"], row["price"]) for row in rows]
         
         return history
         
     except Exception as e:
         print(f"[ERROR] Error al obtener historial: {e}")
         return None
+
+def _as_timestamp(value):
+    """Convierte un datetime o un timedelta (hacia atrás desde ahora) al formato de la columna timestamp"""
+    if isinstance(value, timedelta):
+        value = datetime.now() - value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _bucket_history(history, bucket, agg):
+    """
+    Agrupa el historial columnar en intervalos de bucket por (origen, plataforma, rating)
+    
+    Cada intervalo queda con el timestamp de su inicio y el precio resumido con agg.
+    """
+    bucket_seconds = bucket.total_seconds() if isinstance(bucket, timedelta) else float(bucket)
+    aggregate = BUCKET_AGGREGATES[agg]
+    
+    groups = {}
+    for source, platform, rating, timestamp, price in zip(
+        history["source"], history["platform"], history["rating"], history["timestamp"], history["price"]
+    ):
+        epoch = datetime.fromisoformat(timestamp).timestamp()
+        start = epoch - epoch % bucket_seconds
+        groups.setdefault((start, source, platform, rating), []).append(price)
+    
+    bucketed = {column: [] for column in history}
+    for (start, source, platform, rating), prices in sorted(groups.items(), key=lambda item: item[0]):
+        bucketed["source"].append(source)
+        bucketed["platform"].append(platform)
+        bucketed["rating"].append(rating)
+        bucketed["timestamp"].append(datetime.fromtimestamp(start).isoformat())
+        bucketed["price"].append(aggregate(prices))
+    return bucketed
+
+def get_price_histories(ratings=None, platforms=None, sources=None, since=None, until=None,
+                        bucket=None, agg="last", page_size=None):
+    """
+    Obtiene el historial de varios ratings y plataformas con una consulta (paginada en Supabase)
+    
+    Ejemplo: los últimos 7 días de todos los ratings, un precio por hora:
+        get_price_histories(since=timedelta(days=7), bucket=timedelta(hours=1))
+    
+    Args:
+        ratings (list): Ratings a incluir (None para todos)
+        platforms (list): Plataformas a incluir (None para todas)
+        sources (list): Páginas (targets) a incluir (None para todas)
+        since (datetime | timedelta): Inicio de la ventana; un timedelta cuenta hacia atrás desde ahora
+        until (datetime | timedelta): Fin de la ventana (excluido)
+        bucket (timedelta | float): Agrupar en intervalos de este tamaño (segundos si es un número)
+        agg (str): Resumen de cada intervalo: "last", "first", "min", "max" o "mean"
+        page_size (int): Filas por petición a Supabase (por defecto HISTORY_PAGE_SIZE)
+        
+    Returns:
+        dict: Columnas {"timestamp": [...], "source": [...], "platform": [...],
+            "rating": [...], "price": [...]} ordenadas por timestamp, o None si hay error
+    """
+    if agg not in BUCKET_AGGREGATES:
+        raise ValueError(f"Resumen desconocido: {agg}")
+    page_size = page_size or HISTORY_PAGE_SIZE
+    
+    try:
+        history = get_backend().read_histories(
+            ratings, platforms, sources,
+            _as_timestamp(since) if since is not None else None,
+            _as_timestamp(until) if until is not None else None,
+            page_size,
+        )
+        
+        if bucket:
+            history = _bucket_history(history, bucket, agg)
+        
+        return history
+        
+    except Exception as e:
+        print(f"[ERROR] Error al obtener historiales: {e}")
+        return None
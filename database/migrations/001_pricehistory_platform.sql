@@ -0,0 +1,4 @@
+-- Precios por plataforma: las filas anteriores quedan como 'ps'
+alter table pricehistory add column if not exists platform text not null default 'ps';
+create index if not exists pricehistory_platform_rating_timestamp_idx
+    on pricehistory (platform, rating, timestamp desc);
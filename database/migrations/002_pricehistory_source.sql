@@ -0,0 +1,2 @@
+-- Página de la que sale cada precio (SCRAPER_TARGETS_PATH): las filas anteriores quedan como 'cheapest'
+alter table pricehistory add column if not exists source text not null default 'cheapest';
@@ -0,0 +1,31 @@
+-- Último precio de cada página, plataforma y rating (lo actualiza save_prices)
+create table if not exists latest_prices (
+    source text not null default 'cheapest',
+    platform text not null,
+    rating integer not null,
+    price integer not null,
+    timestamp timestamp not null,
+    primary key (source, platform, rating)
+);
+
+-- Cargar el último precio de cada clave desde el histórico existente
+insert into latest_prices (source, platform, rating, price, timestamp)
+select distinct on (source, platform, rating) source, platform, rating, price, timestamp
+from pricehistory
+order by source, platform, rating, timestamp desc
+on conflict do nothing;
+
+-- Upsert de latest_prices que usa database/supabase_backend.py: un lote reenviado por el
+-- outbox (más viejo) no pisa un precio más reciente
+create or replace function upsert_latest_prices(records jsonb)
+returns void
+language sql
+as $$
+    insert into latest_prices (source, platform, rating, price, timestamp)
+    select source, platform, rating, price, timestamp
+    from jsonb_to_recordset(records)
+        as r(source text, platform text, rating integer, price integer, timestamp timestamp)
+    on conflict (source, platform, rating) do update
+    set price = excluded.price, timestamp = excluded.timestamp
+    where excluded.timestamp >= latest_prices.timestamp;
+$$;
@@ -0,0 +1,2 @@
+-- Consultas por ventana de tiempo (get_price_histories y la copia local de database/mirror.py)
+create index if not exists pricehistory_timestamp_idx on pricehistory (timestamp);
@@ -0,0 +1,17 @@
+-- Un lote reenviado por el outbox no duplica filas (save_prices hace upsert ignorando las repetidas)
+--
+-- Si la tabla ya tiene filas repetidas la restricción no se puede crear. Antes de
+-- ejecutar este archivo, borrarlas dejando una por clave:
+--
+--   delete from pricehistory a
+--   using pricehistory b
+--   where a.ctid > b.ctid
+--     and a.source = b.source and a.platform = b.platform
+--     and a.rating = b.rating and a.timestamp = b.timestamp;
+do $$
+begin
+    if not exists (select 1 from pg_constraint where conname = 'pricehistory_key') then
+        alter table pricehistory add constraint pricehistory_key unique (source, platform, rating, timestamp);
+    end if;
+end
+$$;
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Copia local y columnar de pricehistory (arrays de NumPy en disco)
+
+sync_mirror trae del backend (get_price_histories) solo las filas nuevas desde
+la última sincronización y las agrega a la copia; load_mirror la abre con
+memory-map, sin red, así que cargar meses de precios de todos los ratings lleva
+milisegundos.
+
+Cada sincronización escribe una generación nueva (un directorio con un .npy por
+columna) y después cambia meta.json para apuntarla: una sincronización cortada
+a la mitad deja la copia anterior intacta.
+
+Uso:
+    python -m database.mirror sync
+    python -m database.mirror info
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+# Directorio de la copia local
+HISTORY_MIRROR_PATH = os.getenv("HISTORY_MIRROR_PATH", ".cache/mirror")
+
+# Horas antes de la última fila sincronizada que se vuelven a pedir: cubre lotes
+# que llegan tarde a la base (por ejemplo, desde el outbox)
+MIRROR_OVERLAP_HOURS = float(os.getenv("MIRROR_OVERLAP_HOURS", "24"))
+
+# Tipo de cada columna; source y platform se guardan como índices en las listas de meta.json
+COLUMN_DTYPES = {
+    "timestamp": "datetime64[us]",
+    "source": np.int16,
+    "platform": np.int16,
+    "rating": np.int16,
+    "price": np.int64,
+}
+
+def _read_meta(path):
+    """meta.json de la copia, o None si todavía no se sincronizó"""
+    try:
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _empty_columns():
+    return {column: np.empty(0, dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+
+def _load_columns(path, meta, mmap_mode="r"):
+    """Arrays de la generación actual"""
+    if meta is None:
+        return _empty_columns()
+    generation = os.path.join(path, meta["generation"])
+    return {
+        column: np.load(os.path.join(generation, f"{column}.npy"), mmap_mode=mmap_mode)
+        for column in COLUMN_DTYPES
+    }
+
+def _encode(values, categories):
+    """Convierte textos en índices de categories (agregando los nuevos al final)"""
+    index = {value: code for code, value in enumerate(categories)}
+    codes = np.empty(len(values), dtype=COLUMN_DTYPES["source"])
+    for position, value in enumerate(values):
+        if value not in index:
+            index[value] = len(categories)
+            categories.append(value)
+        codes[position] = index[value]
+    return codes
+
+def load_mirror(path=None):
+    """
+    Abre la copia local (memory-map, solo lectura)
+
+    Args:
+        path (str): Directorio de la copia (por defecto HISTORY_MIRROR_PATH)
+
+    Returns:
+        dict: {"timestamp", "source", "platform", "rating", "price"} como arrays ordenados
+            por timestamp (source y platform son índices), más "sources" y "platforms"
+            (las listas de nombres) y "last_timestamp"
+    """
+    path = path or HISTORY_MIRROR_PATH
+    meta = _read_meta(path)
+    mirror = _load_columns(path, meta)
+    mirror["sources"] = meta["sources"] if meta else []
+    mirror["platforms"] = meta["platforms"] if meta else []
+    mirror["last_timestamp"] = meta["last_timestamp"] if meta else None
+    return mirror
+
+def filter_mirror(mirror, ratings=None, platforms=None, sources=None, since=None, until=None):
+    """
+    Selecciona filas de la copia (por ventana de tiempo con búsqueda binaria y el resto con máscaras)
+
+    Args:
+        mirror (dict): Resultado de load_mirror
+        ratings (list): Ratings a incluir (None para todos)
+        platforms (list): Plataformas a incluir por nombre (None para todas)
+        sources (list): Páginas (targets) a incluir por nombre (None para todas)
+        since (datetime | timedelta): Inicio de la ventana; un timedelta cuenta hacia atrás desde ahora
+        until (datetime | timedelta): Fin de la ventana (excluido)
+
+    Returns:
+        dict: Las mismas columnas que load_mirror con solo las filas seleccionadas
+    """
+    timestamps = mirror["timestamp"]
+    start, end = 0, len(timestamps)
+    if since is not None:
+        since = datetime.now() - since if isinstance(since, timedelta) else since
+        start = int(np.searchsorted(timestamps, np.datetime64(since, "us"), side="left"))
+    if until is not None:
+        until = datetime.now() - until if isinstance(until, timedelta) else until
+        end = int(np.searchsorted(timestamps, np.datetime64(until, "us"), side="left"))
+
+    window = {column: mirror[column][start:end] for column in COLUMN_DTYPES}
+    mask = None
+    for column, values, names in (
+        ("rating", ratings, None),
+        ("platform", platforms, mirror["platforms"]),
+        ("source", sources, mirror["sources"]),
+    ):
+        if values is None:
+            continue
+        if names is not None:
+            values = [names.index(value) for value in values if value in names]
+        column_mask = np.isin(window[column], values)
+        mask = column_mask if mask is None else mask & column_mask
+
+    selected = window if mask is None else {column: values[mask] for column, values in window.items()}
+    selected.update({key: mirror[key] for key in ("sources", "platforms", "last_timestamp")})
+    return selected
+
+def sync_mirror(path=None, overlap_hours=None):
+    """
+    Agrega a la copia local las filas nuevas de pricehistory
+
+    Pide al backend las filas desde la última sincronizada menos overlap_hours,
+    descarta de la copia esas mismas horas y agrega lo recibido, así que un lote
+    que llegó tarde dentro de esa ventana también queda copiado.
+
+    Args:
+        path (str): Directorio de la copia (por defecto HISTORY_MIRROR_PATH)
+        overlap_hours (float): Horas que se vuelven a pedir (por defecto MIRROR_OVERLAP_HOURS)
+
+    Returns:
+        dict: {"fetched", "rows", "last_timestamp", "seconds"} o None si falló la consulta
+    """
+    from .database import get_price_histories
+
+    path = path or HISTORY_MIRROR_PATH
+    overlap_hours = MIRROR_OVERLAP_HOURS if overlap_hours is None else overlap_hours
+    start = time.perf_counter()
+
+    meta = _read_meta(path)
+    since = None
+    if meta is not None and meta["last_timestamp"]:
+        since = datetime.fromisoformat(meta["last_timestamp"]) - timedelta(hours=overlap_hours)
+
+    history = get_price_histories(since=since)
+    if history is None:
+        return None
+
+    columns = _load_columns(path, meta)
+    sources = list(meta["sources"]) if meta else []
+    platforms = list(meta["platforms"]) if meta else []
+
+    # Filas ya copiadas dentro de la ventana pedida: se reemplazan por las recibidas
+    keep = len(columns["timestamp"])
+    if since is not None:
+        keep = int(np.searchsorted(columns["timestamp"], np.datetime64(since, "us"), side="left"))
+
+    fetched = {
+        "timestamp": np.array(history["timestamp"], dtype=COLUMN_DTYPES["timestamp"]),
+        "source": _encode(history["source"], sources),
+        "platform": _encode(history["platform"], platforms),
+        "rating": np.array(history["rating"], dtype=COLUMN_DTYPES["rating"]),
+        "price": np.array(history["price"], dtype=COLUMN_DTYPES["price"]),
+    }
+
+    generation = f"gen-{time.time_ns()}"
+    generation_path = os.path.join(path, generation)
+    os.makedirs(generation_path)
+    rows = 0
+    for column in COLUMN_DTYPES:
+        values = np.concatenate([columns[column][:keep], fetched[column]])
+        np.save(os.path.join(generation_path, f"{column}.npy"), values)
+        rows = len(values)
+
+    last_timestamp = history["timestamp"][-1] if history["timestamp"] else (meta or {}).get("last_timestamp")
+    new_meta = {
+        "generation": generation,
+        "rows": rows,
+        "last_timestamp": last_timestamp,
+        "sources": sources,
+        "platforms": platforms,
+        "synced_at": datetime.now().isoformat(),
+    }
+    temp_path = os.path.join(path, "meta.json.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(new_meta, f, indent=2)
+    os.replace(temp_path, os.path.join(path, "meta.json"))
+
+    # Generaciones anteriores (en Windows pueden seguir abiertas por un memory-map: se reintenta en la próxima)
+    for entry in os.listdir(path):
+        if entry.startswith("gen-") and entry != generation:
+            shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+    return {
+        "fetched": len(history["timestamp"]),
+        "rows": rows,
+        "last_timestamp": last_timestamp,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+def main():
+    """Sincroniza la copia local o muestra su estado"""
+    command = sys.argv[1] if len(sys.argv) > 1 else "info"
+
+    if command == "sync":
+        result = sync_mirror()
+        if result is None:
+            print("[ERROR] No se pudo leer el historial")
+            return 1
+        print(f"[OK] Copia local sincronizada: {result['fetched']} filas recibidas, "
+              f"{result['rows']} en total, última {result['last_timestamp']} ({result['seconds']}s)")
+        return 0
+
+    if command == "info":
+        meta = _read_meta(HISTORY_MIRROR_PATH)
+        if meta is None:
+            print("[INFO] Todavía no hay copia local (python -m database.mirror sync)")
+        else:
+            print(json.dumps(meta, indent=2))
+        return 0
+
+    print("Uso: python -m database.mirror [sync|info]")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Outbox local (SQLite) para las escrituras de precios
+
+save_prices primero agrega el lote de precios al outbox, en disco, y después
+intenta enviarlo. Si Supabase está lento o caído, el lote queda pendiente y se
+envía en la siguiente ejecución: la ejecución no espera a la red más de lo
+necesario y no se pierde ningún precio.
+
+El envío es idempotente: cada fila se identifica por (source, platform, rating,
+timestamp), que se fija al encolar, así que reenviar un lote cuya confirmación
+se perdió no duplica filas.
+
+Uso:
+    python -m database.outbox status
+    python -m database.outbox flush
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+
+# Archivo SQLite del outbox
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", ".cache/outbox/outbox.sqlite3")
+
+# Filas máximas por envío (se juntan varios lotes pendientes en una sola petición)
+OUTBOX_FLUSH_ROWS = int(os.getenv("OUTBOX_FLUSH_ROWS", "500"))
+
+# Reintentos de cada envío y espera inicial entre ellos (se duplica en cada reintento)
+OUTBOX_RETRIES = int(os.getenv("OUTBOX_RETRIES", "3"))
+OUTBOX_RETRY_BASE_S = float(os.getenv("OUTBOX_RETRY_BASE_S", "1"))
+
+# Días que se conservan los lotes ya enviados
+OUTBOX_KEEP_DAYS = float(os.getenv("OUTBOX_KEEP_DAYS", "7"))
+
+SCHEMA = """
+create table if not exists outbox (
+    id integer primary key autoincrement,
+    batch_id text not null unique,
+    created_at real not null,
+    row_count integer not null,
+    records text not null,
+    attempts integer not null default 0,
+    last_error text,
+    sent_at real
+);
+create index if not exists outbox_pending_idx on outbox (sent_at, id);
+"""
+
+# Un solo envío a la vez por proceso
+_flush_lock = threading.Lock()
+
+
+def _connect(path):
+    """Abre el outbox creando el archivo y la tabla si no existen"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("pragma journal_mode=wal")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def enqueue(records, path=None):
+    """
+    Agrega un lote de filas al outbox
+
+    Args:
+        records (list): Filas de pricehistory (dicts con source, platform, rating, timestamp, price)
+        path (str): Archivo del outbox (por defecto OUTBOX_PATH)
+
+    Returns:
+        str: Identificador del lote
+    """
+    batch_id = uuid.uuid4().hex
+    conn = _connect(path or OUTBOX_PATH)
+    try:
+        with conn:
+            conn.execute(
+                "insert into outbox (batch_id, created_at, row_count, records) values (?, ?, ?, ?)",
+                (batch_id, time.time(), len(records), json.dumps(records)),
+            )
+    finally:
+        conn.close()
+    return batch_id
+
+
+def status(path=None):
+    """
+    Resume el estado del outbox
+
+    Args:
+        path (str): Archivo del outbox (por defecto OUTBOX_PATH)
+
+    Returns:
+        dict: {"pending_batches", "pending_rows", "sent_batches", "oldest_pending_s", "last_error"}
+    """
+    conn = _connect(path or OUTBOX_PATH)
+    try:
+        pending_batches, pending_rows, oldest = conn.execute(
+            "select count(*), coalesce(sum(row_count), 0), min(created_at) from outbox where sent_at is null"
+        ).fetchone()
+        sent_batches = conn.execute("select count(*) from outbox where sent_at is not null").fetchone()[0]
+        last_error = conn.execute(
+            "select last_error from outbox where sent_at is null and last_error is not null order by id desc limit 1"
+        ).fetchone()
+    finally:
+        conn.close()
+
+    return {
+        "pending_batches": pending_batches,
+        "pending_rows": pending_rows,
+        "sent_batches": sent_batches,
+        "oldest_pending_s": round(time.time() - oldest, 1) if oldest else None,
+        "last_error": last_error[0] if last_error else None,
+    }
+
+
+def _next_chunk(conn, max_rows):
+    """Lotes pendientes más antiguos hasta max_rows filas (al menos uno)"""
+    chunk = []
+    rows = 0
+    for batch in conn.execute("select id, row_count, records from outbox where sent_at is null order by id"):
+        if chunk and rows + batch[1] > max_rows:
+            break
+        chunk.append(batch)
+        rows += batch[1]
+    return chunk
+
+
+def flush(send, path=None, max_rows=None, retries=None, retry_base_s=None):
+    """
+    Envía los lotes pendientes en orden, juntando varios lotes por petición
+
+    Si un envío falla después de sus reintentos se detiene (los lotes siguientes
+    esperan, para no escribir precios nuevos antes que los viejos) y los pendientes
+    quedan para el próximo flush.
+
+    Args:
+        send (callable): Recibe la lista de filas y las escribe; debe lanzar una excepción si falla
+        path (str): Archivo del outbox (por defecto OUTBOX_PATH)
+        max_rows (int): Filas máximas por envío (por defecto OUTBOX_FLUSH_ROWS)
+        retries (int): Reintentos por envío (por defecto OUTBOX_RETRIES)
+        retry_base_s (float): Espera antes del primer reintento (por defecto OUTBOX_RETRY_BASE_S)
+
+    Returns:
+        dict: {"sent_batches", "sent_rows", "pending_batches", "error"}
+    """
+    max_rows = max_rows or OUTBOX_FLUSH_ROWS
+    retries = OUTBOX_RETRIES if retries is None else retries
+    retry_base_s = OUTBOX_RETRY_BASE_S if retry_base_s is None else retry_base_s
+
+    sent_batches = 0
+    sent_rows = 0
+    error = None
+
+    with _flush_lock:
+        conn = _connect(path or OUTBOX_PATH)
+        try:
+            while True:
+                chunk = _next_chunk(conn, max_rows)
+                if not chunk:
+                    break
+
+                ids = [batch[0] for batch in chunk]
+                records = [record for batch in chunk for record in json.loads(batch[2])]
+
+                for attempt in range(retries + 1):
+                    try:
+                        send(records)
+                        error = None
+                        break
+                    except Exception as e:
+                        error = str(e) or type(e).__name__
+                        if attempt < retries:
+                            time.sleep(retry_base_s * 2 ** attempt)
+
+                placeholders = ",".join("?" * len(ids))
+                with conn:
+                    if error:
+                        conn.execute(
+                            f"update outbox set attempts = attempts + 1, last_error = ? where id in ({placeholders})",
+                            [error, *ids],
+                        )
+                    else:
+                        conn.execute(f"update outbox set sent_at = ? where id in ({placeholders})", [time.time(), *ids])
+                if error:
+                    break
+
+                sent_batches += len(ids)
+                sent_rows += len(records)
+
+            # Compactar: los lotes enviados hace más de OUTBOX_KEEP_DAYS ya no hacen falta
+            with conn:
+                conn.execute(
+                    "delete from outbox where sent_at is not null and sent_at < ?",
+                    (time.time() - OUTBOX_KEEP_DAYS * 86400,),
+                )
+            pending_batches = conn.execute("select count(*) from outbox where sent_at is null").fetchone()[0]
+        finally:
+            conn.close()
+
+    return {
+        "sent_batches": sent_batches,
+        "sent_rows": sent_rows,
+        "pending_batches": pending_batches,
+        "error": error,
+    }
+
+
+def main():
+    """Muestra el estado del outbox o envía los lotes pendientes"""
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "flush":
+        from database.database import write_price_records
+
+        result = flush(write_price_records)
+        print(f"[INFO] Enviados {result['sent_batches']} lotes ({result['sent_rows']} filas), "
+              f"pendientes: {result['pending_batches']}")
+        if result["error"]:
+            print(f"[ERROR] {result['error']}")
+            return 1
+        return 0
+
+    if command == "status":
+        print(json.dumps(status(), indent=2))
+        return 0
+
+    print("Uso: python -m database.outbox [status|flush]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
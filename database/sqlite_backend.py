@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Backend de almacenamiento embebido en SQLite
+
+Mismas tablas que en Supabase (pricehistory y latest_prices) en un archivo local,
+o en memoria con STORAGE_SQLITE_PATH=":memory:". Sirve para ejecutar el pipeline
+y consultas pesadas de historial sin red, y para análisis locales.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+# Nombre para los mensajes
+LABEL = "SQLite"
+
+# Las escrituras son locales: no hace falta pasar por el outbox
+REMOTE = False
+
+# Archivo de la base de datos (":memory:" para una base en memoria por proceso)
+STORAGE_SQLITE_PATH = os.getenv("STORAGE_SQLITE_PATH", ".cache/prices.sqlite3")
+
+SCHEMA = """
+create table if not exists pricehistory (
+    source text not null default 'cheapest',
+    platform text not null,
+    rating integer not null,
+    timestamp text not null,
+    price integer not null,
+    unique (source, platform, rating, timestamp)
+);
+create index if not exists pricehistory_rating_timestamp_idx on pricehistory (rating, timestamp);
+create index if not exists pricehistory_timestamp_idx on pricehistory (timestamp);
+
+create table if not exists latest_prices (
+    source text not null default 'cheapest',
+    platform text not null,
+    rating integer not null,
+    price integer not null,
+    timestamp text not null,
+    primary key (source, platform, rating)
+);
+"""
+
+# Conexión compartida por el proceso (save_prices corre en otro hilo que la lectura)
+_conn = None
+_conn_lock = threading.Lock()
+
+def get_connection(path=None):
+    """
+    Obtiene la conexión compartida, creando el archivo y las tablas en la primera llamada
+
+    Args:
+        path (str): Archivo de la base (por defecto STORAGE_SQLITE_PATH)
+
+    Returns:
+        sqlite3.Connection: Conexión abierta
+    """
+    global _conn
+    if _conn is not None:
+        return _conn
+
+    with _conn_lock:
+        if _conn is None:
+            path = path or STORAGE_SQLITE_PATH
+            directory = os.path.dirname(path)
+            if path != ":memory:" and directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            if path != ":memory:":
+                conn.execute("pragma journal_mode=wal")
+                conn.execute("pragma synchronous=normal")
+            conn.executescript(SCHEMA)
+            _conn = conn
+
+    return _conn
+
+def reset_connection():
+    """
+    Cierra la conexión compartida (la próxima llamada abre STORAGE_SQLITE_PATH de nuevo)
+    """
+    global _conn
+    with _conn_lock:
+        if _conn is not None:
+            _conn.close()
+        _conn = None
+
+def check():
+    """
+    Abre la base y comprueba que responde
+
+    Returns:
+        bool: True (lanza sqlite3.Error si la base no se puede abrir)
+    """
+    conn = get_connection()
+    with _conn_lock:
+        conn.execute("select 1").fetchone()
+    return True
+
+def write_records(records, latest):
+    """
+    Inserta filas en pricehistory (ignorando las repetidas) y actualiza latest_prices
+
+    Args:
+        records (list): Filas con source, platform, rating, timestamp y price
+        latest (list): La fila más reciente de cada (source, platform, rating)
+    """
+    conn = get_connection()
+    with _conn_lock, conn:
+        conn.executemany(
+            "insert or ignore into pricehistory (source, platform, rating, timestamp, price) "
+            "values (:source, :platform, :rating, :timestamp, :price)",
+            records,
+        )
+        # Un lote reenviado (más viejo) no pisa un precio más reciente
+        conn.executemany(
+            "insert into latest_prices (source, platform, rating, price, timestamp) "
+            "values (:source, :platform, :rating, :price, :timestamp) "
+            "on conflict (source, platform, rating) do update set "
+            "price = excluded.price, timestamp = excluded.timestamp "
+            "where excluded.timestamp >= latest_prices.timestamp",
+            latest,
+        )
+
+def read_latest():
+    """
+    Lee latest_prices
+
+    Returns:
+        list: Filas {"source", "platform", "rating", "price"}
+    """
+    conn = get_connection()
+    with _conn_lock:
+        rows = conn.execute("select source, platform, rating, price from latest_prices").fetchall()
+    return [dict(row) for row in rows]
+
+def read_history(source, platform, rating, limit):
+    """
+    Lee los últimos precios de una clave, del más reciente al más antiguo
+
+    Returns:
+        list: Filas {"timestamp", "price"}
+    """
+    conn = get_connection()
+    with _conn_lock:
+        rows = conn.execute(
+            "select timestamp, price from pricehistory "
+            "where source = ? and platform = ? and rating = ? order by timestamp desc limit ?",
+            (source, platform, rating, limit),
+        ).fetchall()
+    return [dict(row) for row in rows]
+
+def read_histories(ratings, platforms, sources, since, until, page_size=None):
+    """
+    Lee el historial filtrado en una sola consulta (page_size no se usa: no hay límite por petición)
+
+    Args:
+        ratings, platforms, sources (list): Valores a incluir (None para todos)
+        since, until (str): Ventana de tiempo [since, until) en formato ISO (None sin límite)
+
+    Returns:
+        dict: Columnas {"timestamp", "source", "platform", "rating", "price"} ordenadas por timestamp
+    """
+    conditions = []
+    params = []
+    for column, values in (("rating", ratings), ("platform", platforms), ("source", sources)):
+        if values is not None:
+            values = list(values)
+            conditions.append(f"{column} in ({','.join('?' * len(values))})")
+            params.extend(values)
+    if since is not None:
+        conditions.append("timestamp >= ?")
+        params.append(since)
+    if until is not None:
+        conditions.append("timestamp < ?")
+        params.append(until)
+
+    where = f"where {' and '.join(conditions)}" if conditions else ""
+    conn = get_connection()
+    with _conn_lock:
+        rows = conn.execute(
+            f"select timestamp, source, platform, rating, price from pricehistory {where} "
+            "order by timestamp, source, platform, rating",
+            params,
+        ).fetchall()
+
+    # Filas a columnas en una pasada
+    columns = ("timestamp", "source", "platform", "rating", "price")
+    values = list(zip(*rows)) if rows else [() for _ in columns]
+    return {column: list(column_values) for column, column_values in zip(columns, values)}
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Backend de almacenamiento en Supabase (PostgREST)
+
+Implementa las funciones que database.py espera de un backend: check,
+write_records, read_latest, read_history y read_histories.
+"""
+
+import os
+import threading
+from httpx import Timeout
+from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
+
+
+# Nombre para los mensajes
+LABEL = "Supabase"
+
+# Las escrituras van por red: save_prices las encola primero en el outbox local
+REMOTE = True
+
+# Timeouts de las peticiones a Supabase (segundos)
+SUPABASE_TIMEOUT_S = float(os.getenv("SUPABASE_TIMEOUT_S", "10"))
+SUPABASE_CONNECT_TIMEOUT_S = float(os.getenv("SUPABASE_CONNECT_TIMEOUT_S", "5"))
+
+# Cliente compartido por todo el proceso: sus conexiones HTTP (keep-alive) se reutilizan
+_client = None
+_client_lock = threading.Lock()
+_health_checked = False
+
+def get_supabase_client() -> Client:
+    """
+    Obtiene el cliente de Supabase compartido por el proceso
+
+    Se crea en la primera llamada; las siguientes devuelven el mismo cliente, que
+    mantiene abiertas sus conexiones y no repite el TLS ni la configuración.
+
+    Returns:
+        Client: Cliente de Supabase configurado
+    """
+    global _client
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            supabase_url = os.getenv("SUPABASE_URL")
+            supabase_key = os.getenv("SUPABASE_KEY")
+
+            if not supabase_url or not supabase_key:
+                raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar configurados")
+
+            options = ClientOptions(
+                postgrest_client_timeout=Timeout(SUPABASE_TIMEOUT_S, connect=SUPABASE_CONNECT_TIMEOUT_S)
+            )
+            _client = create_client(supabase_url, supabase_key, options=options)
+
+    return _client
+
+def reset_supabase_client():
+    """
+    Descarta el cliente compartido (por ejemplo, después de cambiar las credenciales)
+    """
+    global _client, _health_checked
+    with _client_lock:
+        _client = None
+        _health_checked = False
+
+def check():
+    """
+    Comprueba una vez por proceso que Supabase responde y que la tabla existe
+
+    Hace una consulta mínima a pricehistory; si ya se comprobó, no repite la petición.
+
+    Returns:
+        bool: True si la base de datos responde (lanza la excepción del cliente si no)
+    """
+    global _health_checked
+    if _health_checked:
+        return True
+
+    client = get_supabase_client()
+    client.table("pricehistory").select("rating").limit(1).execute()
+    _health_checked = True
+    return True
+
+def write_records(records, latest):
+    """
+    Inserta filas en pricehistory (ignorando las repetidas) y actualiza latest_prices
+
+    latest_prices se actualiza con la función upsert_latest_prices
+    (database/migrations/003_latest_prices.sql), que no pisa un precio más reciente.
+
+    Args:
+        records (list): Filas con source, platform, rating, timestamp y price
+        latest (list): La fila más reciente de cada (source, platform, rating)
+
+    Raises:
+        Exception: Si Supabase rechaza o no responde alguna de las dos escrituras
+            (el lote queda pendiente en el outbox y se reenvía entero)
+    """
+    client = get_supabase_client()
+
+    client.table("pricehistory").upsert(
+        records,
+        on_conflict="source,platform,rating,timestamp",
+        ignore_duplicates=True,
+        returning="minimal",
+    ).execute()
+
+    # Un lote reenviado (más viejo) no pisa un precio más reciente
+    client.rpc("upsert_latest_prices", {"records": latest}).execute()
+
+def read_latest():
+    """
+    Lee latest_prices con una sola consulta
+
+    Returns:
+        list: Filas {"source", "platform", "rating", "price"}
+    """
+    client = get_supabase_client()
+    return client.table("latest_prices").select("source,platform,rating,price").execute().data
+
+def read_history(source, platform, rating, limit):
+    """
+    Lee los últimos precios de una clave, del más reciente al más antiguo
+
+    Returns:
+        list: Filas {"timestamp", "price"}
+    """
+    client = get_supabase_client()
+    response = client.table("pricehistory").select("timestamp,price").eq("source", source).eq("platform", platform).eq("rating", rating).order("timestamp", desc=True).limit(limit).execute()
+    return response.data
+
+def read_histories(ratings, platforms, sources, since, until, page_size):
+    """
+    Lee el historial filtrado, paginando de a page_size filas
+
+    Args:
+        ratings, platforms, sources (list): Valores a incluir (None para todos)
+        since, until (str): Ventana de tiempo [since, until) en formato ISO (None sin límite)
+        page_size (int): Filas por petición
+
+    Returns:
+        dict: Columnas {"timestamp", "source", "platform", "rating", "price"} ordenadas por timestamp
+    """
+    client = get_supabase_client()
+
+    history = {"timestamp": [], "source": [], "platform": [], "rating": [], "price": []}
+    offset = 0
+    while True:
+        query = client.table("pricehistory").select("timestamp,source,platform,rating,price")
+        if ratings is not None:
+            query = query.in_("rating", list(ratings))
+        if platforms is not None:
+            query = query.in_("platform", list(platforms))
+        if sources is not None:
+            query = query.in_("source", list(sources))
+        if since is not None:
+            query = query.gte("timestamp", since)
+        if until is not None:
+            query = query.lt("timestamp", until)
+
+        # Orden total (en un solo parámetro "order") para que la paginación no repita ni salte
+        # filas: todas las filas de una ejecución comparten timestamp
+        response = (query.order("timestamp,source,platform,rating")
+                    .limit(page_size).offset(offset).execute())
+
+        for row in response.data:
+            for column, values in history.items():
+                values.append(row[column])
+
+        if len(response.data) < page_size:
+            break
+        offset += page_size
+
+    return history
@@ -0,0 +1,5 @@
+"""
+Monitoring module para medir el pipeline de FUTBIN
+"""
+
+__version__ = "1.0.0"
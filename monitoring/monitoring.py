@@ -0,0 +1,233 @@
+"""
+Módulo para configurar el logging y medir la duración de las fases del scraper y del pipeline
+"""
+
+import datetime
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+# Nivel por defecto: INFO es el modo silencioso de producción (solo mensajes por fase);
+# DEBUG muestra el detalle por elemento, precio y regla
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+
+# Formato de salida: "text" (legible) o "json" (una línea JSON por mensaje)
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+
+# Campos estándar de LogRecord que no se copian como campos extra en JSON
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON (incluye los campos pasados en extra=)"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level=None, fmt=None, stream=None):
+    """
+    Configura el logging de todo el proyecto
+
+    Args:
+        level (str): Nivel mínimo (DEBUG, INFO, WARNING...). Por defecto LOG_LEVEL
+        fmt (str): "text" o "json". Por defecto LOG_FORMAT
+        stream: Flujo de salida (por defecto stdout, para mantener el orden con los print)
+    """
+    handler = logging.StreamHandler(stream or sys.stdout)
+    if (fmt or LOG_FORMAT) == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("[%(levelname)s] %(name)s: %(message)s"))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel((level or LOG_LEVEL).upper())
+
+
+def record_phase(stats, name, seconds):
+    """
+    Acumula la duración de una fase en stats["phases"]
+
+    Args:
+        stats (dict): Diccionario de métricas (si es None no se registra nada)
+        name (str): Nombre de la fase
+        seconds (float): Duración en segundos
+    """
+    if stats is None:
+        return
+    phases = stats.setdefault("phases", {})
+    phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(stats, name):
+    """
+    Mide el bloque como una fase y la acumula en stats["phases"]
+
+    Se puede usar alrededor de código asíncrono: mide tiempo de reloj.
+
+    Args:
+        stats (dict): Diccionario de métricas (si es None no se registra nada)
+        name (str): Nombre de la fase
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(stats, name, time.perf_counter() - start)
+
+
+class PhaseTimer:
+    """
+    Registra la duración de cada fase del pipeline y genera un resumen en JSON
+
+    Uso:
+        timer = PhaseTimer()
+        with timer.span("scrape"):
+            ...
+        timer.emit_summary(status="ok")
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+
+    @contextmanager
+    def span(self, name):
+        """
+        Mide un bloque como una fase del pipeline
+
+        Si el bloque lanza una excepción la fase queda marcada con ok=False.
+
+        Args:
+            name (str): Nombre de la fase
+        """
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, ok)
+
+    def record(self, name, seconds, ok=True, **fields):
+        """
+        Registra una fase medida por fuera de span (por ejemplo, en otro hilo)
+
+        Args:
+            name (str): Nombre de la fase
+            seconds (float): Duración en segundos
+            ok (bool): Si la fase terminó bien
+            **fields: Campos adicionales de la fase (ej: timed_out=True)
+        """
+        self.spans.append({"name": name, "seconds": round(seconds, 3), "ok": ok, **fields})
+        logger.info("Fase '%s': %.2fs", name, seconds, extra={"phase": name, "seconds": round(seconds, 3)})
+
+    def summary(self, **fields):
+        """
+        Devuelve el resumen de la ejecución
+
+        Args:
+            **fields: Campos adicionales a incluir (ej: status, path)
+
+        Returns:
+            dict: {"total_seconds": float, "phases": [...], **fields}
+        """
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 3),
+            "phases": list(self.spans),
+            **fields,
+        }
+
+    def emit_summary(self, summary_path=None, **fields):
+        """
+        Escribe el resumen como una única línea JSON en stdout y opcionalmente en un archivo
+
+        Se escribe directamente (no por logging) para que aparezca aunque el nivel
+        de log sea WARNING y se pueda extraer de los logs de CI con un grep.
+
+        Args:
+            summary_path (str): Archivo donde guardar el resumen (por defecto PIPELINE_SUMMARY_PATH si está definida)
+            **fields: Campos adicionales a incluir (ej: status, path)
+
+        Returns:
+            dict: Resumen emitido
+        """
+        summary = self.summary(**fields)
+        print(f"PIPELINE_SUMMARY {json.dumps(summary, ensure_ascii=False, default=str)}", flush=True)
+
+        summary_path = summary_path or os.getenv("PIPELINE_SUMMARY_PATH")
+        if summary_path:
+            with open(summary_path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False, default=str)
+
+        return summary
+
+
+def process_tree_rss_mb(pid=None, include_self=True):
+    """
+    RSS de un proceso y de todos sus descendientes, leyendo /proc (Linux)
+
+    Chromium y el driver de Playwright son procesos hijos, así que su memoria no
+    aparece en el RSS del proceso de Python.
+
+    Args:
+        pid (int): Proceso raíz (por defecto el actual)
+        include_self (bool): Si sumar el propio proceso raíz o solo sus descendientes
+
+    Returns:
+        float: Memoria residente en MB, o None si no hay /proc
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    root = os.getpid() if pid is None else pid
+
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # El nombre del proceso va entre paréntesis y puede contener espacios
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb = 0
+    pending = [root] if include_self else list(children.get(root, []))
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            pass
+        pending.extend(children.get(current, []))
+    return round(total_kb / 1024, 1)
@@ -0,0 +1,147 @@
+"""
+Arranque de los comandos: carga de .env y perfil de importación
+
+Cada comando de run_pipeline.py importa solo los módulos que usa (Playwright, el
+cliente de Supabase o NumPy cuestan más que muchos comandos enteros). Este módulo
+no importa nada del proyecto, así que se puede cargar antes que cualquier otro:
+load_env() lee .env antes de que los módulos lean sus variables con os.getenv, e
+import_profile() mide en un intérprete nuevo (python -X importtime) cuánto tarda en
+importarse cada módulo.
+"""
+
+import os
+import re
+import sys
+import time
+
+
+# .env del proyecto (en CI las variables vienen del entorno y el archivo no existe)
+ENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+
+# Línea de python -X importtime: "import time:  self [us] | cumulative | módulo"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+_env_loaded = False
+
+
+def load_env(path=None):
+    """
+    Carga las variables de .env una vez por proceso, sin pisar las del entorno
+
+    Si no se indica path y ENV_PATH no existe, busca un .env desde el directorio
+    de trabajo hacia arriba (find_dotenv), como hacía load_dotenv() sin argumentos.
+    python-dotenv solo se importa si hay que buscar o leer un archivo. Hay que
+    llamarla antes de importar los módulos que leen variables al importarse.
+
+    Args:
+        path (str): Archivo a leer (por defecto ENV_PATH o el que encuentre find_dotenv)
+
+    Returns:
+        bool: True si se leyó un archivo
+    """
+    global _env_loaded
+    if _env_loaded:
+        return False
+    _env_loaded = True
+
+    if path is None and os.path.exists(ENV_PATH):
+        path = ENV_PATH
+    elif path is None:
+        from dotenv import find_dotenv
+
+        path = find_dotenv(usecwd=True)
+    if not path or not os.path.exists(path):
+        return False
+
+    from dotenv import load_dotenv
+
+    load_dotenv(path)
+    return True
+
+
+def import_profile(code, cwd=None):
+    """
+    Ejecuta código en un intérprete nuevo con -X importtime
+
+    Args:
+        code (str): Código a ejecutar (python -c)
+        cwd (str): Directorio de trabajo (por defecto la raíz del proyecto)
+
+    Returns:
+        dict: {"wall_ms": duración del proceso, "import_ms": suma de los imports,
+            "modules": [{"module", "self_ms", "cumulative_ms", "depth"}] en orden de
+            importación, "returncode", "error": stderr sin las líneas de importtime}
+    """
+    import subprocess
+
+    cwd = cwd or os.path.dirname(ENV_PATH)
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                             cwd=cwd, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    modules, other = [], []
+    for line in process.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append({
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+        elif not line.startswith("import time:"):
+            other.append(line)
+
+    return {
+        "wall_ms": wall_ms,
+        "import_ms": sum(module["self_ms"] for module in modules),
+        "modules": modules,
+        "returncode": process.returncode,
+        "error": "\n".join(other) if process.returncode else None,
+    }
+
+
+def _loaded_by(baseline):
+    return {module["module"] for module in baseline["modules"]} if baseline else set()
+
+
+def top_imports(profile, top=15, baseline=None):
+    """
+    Módulos que más tardaron en importarse, con lo que importaron ellos
+
+    Args:
+        profile (dict): Resultado de import_profile
+        top (int): Cantidad de módulos
+        baseline (dict): Perfil del intérprete solo (import_profile("pass")); sus
+            módulos (site, encodings...) no se muestran
+
+    Returns:
+        list: [(módulo, ms acumulados)] de los imports de primer nivel, de mayor a menor
+    """
+    skip = _loaded_by(baseline)
+    roots = [module for module in profile["modules"] if module["depth"] == 0 and module["module"] not in skip]
+    roots.sort(key=lambda module: module["cumulative_ms"], reverse=True)
+    return [(module["module"], module["cumulative_ms"]) for module in roots[:top]]
+
+
+def imported_packages(profile, baseline=None):
+    """
+    Tiempo de importación por paquete de primer nivel (suma del tiempo propio de sus módulos)
+
+    Args:
+        profile (dict): Resultado de import_profile
+        baseline (dict): Perfil del intérprete solo; sus módulos no se cuentan
+
+    Returns:
+        dict: {paquete: ms}, de mayor a menor
+    """
+    skip = _loaded_by(baseline)
+    packages = {}
+    for module in profile["modules"]:
+        if module["module"] in skip:
+            continue
+        package = module["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + module["self_ms"]
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Envío de un mismo mensaje a varios destinos (sinks) a la vez
+
+Destinos (NOTIFY_SINKS, separados por comas):
+    ntfy:<tópico>                  tópico en NTFY_SERVER (https://ntfy.sh)
+    ntfy:https://servidor/<tópico> tópico en otro servidor de ntfy
+    webhook:<url>                  POST con JSON {"title", "message", "timestamp"}
+    file:<ruta>                    agrega una línea JSON por mensaje
+
+Sin NOTIFY_SINKS se usa NTFY_TOPIC (uno o varios tópicos separados por comas).
+
+Cada destino se envía en su propio hilo, con timeouts, reintentos con espera
+exponencial y una sesión HTTP por servidor que mantiene las conexiones abiertas
+(keep-alive) entre envíos. El envío completo tiene un plazo (NOTIFY_DEADLINE_S):
+un destino colgado se da por fallido y no frena al pipeline.
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+# Servidor de ntfy para los destinos "ntfy:<tópico>"
+NTFY_SERVER = os.getenv("NTFY_SERVER", "https://ntfy.sh")
+
+# Timeouts de cada petición (segundos)
+NOTIFY_CONNECT_TIMEOUT_S = float(os.getenv("NOTIFY_CONNECT_TIMEOUT_S", "5"))
+NOTIFY_TIMEOUT_S = float(os.getenv("NOTIFY_TIMEOUT_S", "10"))
+
+# Reintentos por destino y espera antes del primero (se duplica en cada reintento)
+NOTIFY_RETRIES = int(os.getenv("NOTIFY_RETRIES", "2"))
+NOTIFY_RETRY_BASE_S = float(os.getenv("NOTIFY_RETRY_BASE_S", "0.5"))
+
+# Tiempo máximo de un envío a todos los destinos (segundos)
+NOTIFY_DEADLINE_S = float(os.getenv("NOTIFY_DEADLINE_S", "20"))
+
+# Conexiones abiertas por servidor
+NOTIFY_POOL_SIZE = int(os.getenv("NOTIFY_POOL_SIZE", "4"))
+
+# Respuestas que vale la pena reintentar
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Sesiones HTTP compartidas por el proceso, una por servidor (esquema + host)
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# Escrituras de los destinos "file"
+_file_lock = threading.Lock()
+
+
+def parse_sinks(value=None):
+    """
+    Interpreta la lista de destinos
+
+    Args:
+        value (str): Destinos separados por comas; por defecto NOTIFY_SINKS o, si no
+            está, un destino ntfy por cada tópico de NTFY_TOPIC
+
+    Returns:
+        list: Destinos {"name", "kind", "target"}
+    """
+    if value is None:
+        value = os.getenv("NOTIFY_SINKS", "")
+        if not value.strip():
+            topics = os.getenv("NTFY_TOPIC", "")
+            value = ",".join(f"ntfy:{topic.strip()}" for topic in topics.split(",") if topic.strip())
+
+    sinks = []
+    for spec in value.split(","):
+        spec = spec.strip()
+        if not spec:
+            continue
+        kind, _, target = spec.partition(":")
+        if kind not in SENDERS or not target:
+            raise ValueError(f"Destino de notificación inválido: {spec}")
+        sinks.append({"name": spec, "kind": kind, "target": target})
+    return sinks
+
+
+def get_session(url):
+    """
+    Sesión HTTP compartida para el servidor de url (conexiones keep-alive reutilizadas)
+
+    Args:
+        url (str): URL de destino
+
+    Returns:
+        requests.Session: Sesión con un pool de NOTIFY_POOL_SIZE conexiones
+    """
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    session = _sessions.get(origin)
+    if session is not None:
+        return session
+
+    # Importación diferida: formatear o validar destinos no necesita requests
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _sessions_lock:
+        if origin not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=NOTIFY_POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[origin] = session
+    return _sessions[origin]
+
+
+def close_sessions():
+    """
+    Cierra las sesiones HTTP compartidas
+    """
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _timeout(remaining):
+    """Timeouts de una petición, sin pasar del tiempo que queda del plazo"""
+    return (min(NOTIFY_CONNECT_TIMEOUT_S, remaining), min(NOTIFY_TIMEOUT_S, remaining))
+
+
+def _send_ntfy(target, title, message, remaining):
+    """Publica en un tópico de ntfy; devuelve el status HTTP"""
+    url = target if "://" in target else f"{NTFY_SERVER.rstrip('/')}/{target}"
+    headers = {
+        "Title": title,
+        "Priority": "default",
+        "Tags": "soccer,soccer_ball",
+        "Content-Type": "text/plain; charset=utf-8",
+    }
+    response = get_session(url).post(url, data=message.encode("utf-8"), headers=headers,
+                                     timeout=_timeout(remaining))
+    return response.status_code
+
+
+def _send_webhook(target, title, message, remaining):
+    """POST con el mensaje en JSON; devuelve el status HTTP"""
+    payload = {"title": title, "message": message, "timestamp": datetime.datetime.now().isoformat()}
+    response = get_session(target).post(target, json=payload, timeout=_timeout(remaining))
+    return response.status_code
+
+
+def _send_file(target, title, message, remaining):
+    """Agrega el mensaje como una línea JSON; devuelve 200"""
+    directory = os.path.dirname(target)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    line = json.dumps({"timestamp": datetime.datetime.now().isoformat(), "title": title, "message": message},
+                      ensure_ascii=False)
+    with _file_lock, open(target, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+    return 200
+
+
+# Función de envío de cada tipo de destino
+SENDERS = {
+    "ntfy": _send_ntfy,
+    "webhook": _send_webhook,
+    "file": _send_file,
+}
+
+
+def send_to_sink(sink, title, message, deadline):
+    """
+    Envía a un destino con reintentos y espera exponencial, sin pasar de deadline
+
+    Args:
+        sink (dict): Destino {"name", "kind", "target"}
+        title (str): Título
+        message (str): Texto
+        deadline (float): Momento límite (time.monotonic())
+
+    Returns:
+        dict: {"ok", "status", "attempts", "seconds", "error", "timed_out"}
+    """
+    sender = SENDERS[sink["kind"]]
+    start = time.perf_counter()
+    status = None
+    error = None
+    attempts = 0
+    timed_out = False
+
+    for attempt in range(NOTIFY_RETRIES + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            error = error or "plazo agotado"
+            timed_out = True
+            break
+
+        attempts += 1
+        try:
+            status = sender(sink["target"], title, message, remaining)
+            error = None if 200 <= status < 300 else f"status {status}"
+        except Exception as e:
+            status = None
+            error = str(e) or type(e).__name__
+
+        if error is None or (status is not None and status not in RETRY_STATUSES):
+            break
+        if attempt < NOTIFY_RETRIES:
+            time.sleep(max(0.0, min(NOTIFY_RETRY_BASE_S * 2 ** attempt, deadline - time.monotonic())))
+
+    return {
+        "ok": error is None,
+        "status": status,
+        "attempts": attempts,
+        "seconds": round(time.perf_counter() - start, 3),
+        "error": error,
+        "timed_out": timed_out,
+    }
+
+
+def dispatch(title, message, sinks=None, deadline_s=None, stats=None):
+    """
+    Envía el mismo mensaje a todos los destinos a la vez
+
+    Cada destino corre en un hilo daemon; los que no terminan antes del plazo se
+    dan por fallidos (timed_out) y se abandonan.
+
+    Args:
+        title (str): Título
+        message (str): Texto
+        sinks (list): Destinos (por defecto parse_sinks())
+        deadline_s (float): Plazo total en segundos (por defecto NOTIFY_DEADLINE_S)
+        stats (dict): Diccionario donde guardar las métricas por destino en stats["sinks"]
+
+    Returns:
+        dict: {nombre del destino: {"ok", "status", "attempts", "seconds", "error", "timed_out"}}
+    """
+    sinks = parse_sinks() if sinks is None else sinks
+    deadline_s = NOTIFY_DEADLINE_S if deadline_s is None else deadline_s
+    start = time.perf_counter()
+    deadline = time.monotonic() + deadline_s
+    outcomes = {}
+
+    def run(sink):
+        outcomes[sink["name"]] = send_to_sink(sink, title, message, deadline)
+
+    threads = []
+    for sink in sinks:
+        thread = threading.Thread(target=run, args=(sink,), name=f"notify-{sink['kind']}", daemon=True)
+        thread.start()
+        threads.append((sink, thread))
+
+    results = {}
+    for sink, thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+        outcome = outcomes.get(sink["name"])
+        if outcome is None:
+            # Sigue colgado: se abandona (el hilo es daemon)
+            outcome = {"ok": False, "status": None, "attempts": None,
+                       "seconds": round(time.perf_counter() - start, 3),
+                       "error": f"plazo de {deadline_s:g}s agotado", "timed_out": True}
+        results[sink["name"]] = result = outcome
+
+        if result["ok"]:
+            print(f"[OK] Notificación enviada a {sink['name']} ({result['seconds'] * 1000:.0f}ms, "
+                  f"{result['attempts']} intento{'s' if result['attempts'] != 1 else ''})")
+        else:
+            print(f"[ERROR] No se pudo notificar a {sink['name']}: {result['error']}")
+
+    if stats is not None:
+        stats["sinks"] = results
+    return results
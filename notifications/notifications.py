@@ -7,89 +7,290 @@ import os
 import json
 import sys
 import datetime
-import requests
+from scraping.platforms import DEFAULT_SOURCE, split_source_key
+from .dispatcher import dispatch, parse_sinks
 
-def format_prices(prices_dict):
+# Horas hacia atrás contra las que se muestra el cambio de cada precio (0 para no mostrarlo)
+NOTIFY_CHANGE_HOURS = float(os.getenv("NOTIFY_CHANGE_HOURS", "0"))
+
+# "always": enviar todos los precios en cada ejecución; "changes": solo cuando alguno cambia
+NOTIFY_MODE = os.getenv("NOTIFY_MODE", "always")
+
+# Cambio mínimo para avisar en modo "changes" (en % y en coins; 0 desactiva cada umbral)
+NOTIFY_MIN_CHANGE_PCT = float(os.getenv("NOTIFY_MIN_CHANGE_PCT", "5"))
+NOTIFY_MIN_CHANGE_COINS = float(os.getenv("NOTIFY_MIN_CHANGE_COINS", "0"))
+
+# Últimos precios notificados, para comparar sin consultar la base de datos
+NOTIFY_SNAPSHOT_PATH = os.getenv("NOTIFY_SNAPSHOT_PATH", ".cache/notify/snapshot.json")
+
+def load_snapshot(path=None):
     """
-    Formatea los precios para mostrar en la notificación
+    Lee los últimos precios notificados
     
     Args:
-        prices_dict (dict): Diccionario con {rating: precio}
+        path (str): Archivo del snapshot (por defecto NOTIFY_SNAPSHOT_PATH)
+    
+    Returns:
+        dict: {(origen, plataforma, rating): precio} o None si no hay snapshot válido
+    """
+    path = path or NOTIFY_SNAPSHOT_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)["prices"]
+        return {(source, platform, rating): price for source, platform, rating, price in rows}
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[ADVERTENCIA] Snapshot de notificaciones inválido, se ignora: {e}")
+        return None
+
+def save_snapshot(snapshot, path=None):
+    """
+    Guarda los últimos precios notificados (escritura atómica)
+    
+    Args:
+        snapshot (dict): {(origen, plataforma, rating): precio}
+        path (str): Archivo del snapshot (por defecto NOTIFY_SNAPSHOT_PATH)
+    """
+    path = path or NOTIFY_SNAPSHOT_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    rows = [[source, platform, rating, price] for (source, platform, rating), price in sorted(snapshot.items())]
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"saved_at": datetime.datetime.now().isoformat(), "prices": rows}, f)
+    os.replace(tmp_path, path)
+
+def diff_prices(previous, prices_dict, min_pct=None, min_coins=None):
+    """
+    Compara los precios nuevos con el snapshot y devuelve los cambios que superan algún umbral
+    
+    Un precio que aparece o desaparece (None) siempre cuenta como cambio, y con los dos
+    umbrales en 0 también cualquier diferencia de precio.
+    
+    Args:
+        previous (dict): Snapshot {(origen, plataforma, rating): precio}
+        prices_dict (dict): Precios nuevos con las claves del scraper
+        min_pct (float): Cambio mínimo en % (por defecto NOTIFY_MIN_CHANGE_PCT; 0 lo desactiva)
+        min_coins (float): Cambio mínimo en coins (por defecto NOTIFY_MIN_CHANGE_COINS; 0 lo desactiva)
+    
+    Returns:
+        dict: {(origen, plataforma, rating): (anterior, nuevo)} de los cambios a notificar
+    """
+    min_pct = NOTIFY_MIN_CHANGE_PCT if min_pct is None else min_pct
+    min_coins = NOTIFY_MIN_CHANGE_COINS if min_coins is None else min_coins
+    
+    changes = {}
+    for key, price in prices_dict.items():
+        key = tuple(split_source_key(key))
+        old = previous.get(key)
+        if old == price:
+            continue
+        if old is None or price is None:
+            changes[key] = (old, price)
+            continue
         
+        # Con los dos umbrales desactivados cuenta cualquier cambio
+        if min_pct <= 0 and min_coins <= 0:
+            changes[key] = (old, price)
+            continue
+        
+        delta = abs(price - old)
+        crossed_pct = min_pct > 0 and old and delta / old * 100 >= min_pct
+        crossed_coins = min_coins > 0 and delta >= min_coins
+        if crossed_pct or crossed_coins:
+            changes[key] = (old, price)
+    return changes
+
+def format_changes(changes):
+    """
+    Formatea los cambios de precio agrupados por plataforma, con la diferencia en coins y en %
+    
+    Args:
+        changes (dict): {(origen, plataforma, rating): (anterior, nuevo)} (ver diff_prices)
+    
     Returns:
-        str: Texto formateado con los precios
+        str: Texto formateado con los cambios
     """
-    if not prices_dict:
-        return "[ERROR] No se pudieron obtener precios"
+    text = "CAMBIOS DE PRECIO FUTBIN:\n"
     
-    text = "PRECIOS FUTBIN:\n\n"
+    groups = {}
+    for (source, platform, rating), change in changes.items():
+        label = platform.upper() if source == DEFAULT_SOURCE else f"{source} {platform.upper()}"
+        groups.setdefault(label, {})[rating] = change
     
-    for rating in [83, 84, 85, 86, 87, 88, 89, 90]:
-        price = prices_dict.get(rating)
-        if price is not None:
-            # Formatear con separadores de miles
-            formatted_price = f"{price:,}".replace(",", ".")
-            text += f"- Rating {rating}: {formatted_price} coins\n"
-        else:
-            text += f"- Rating {rating}: N/A\n"
+    for label, ratings in groups.items():
+        text += f"\n{label}:\n"
+        for rating in sorted(ratings):
+            old, new = ratings[rating]
+            old_text = f"{old:,}".replace(",", ".") if old is not None else "N/A"
+            new_text = f"{new:,}".replace(",", ".") if new is not None else "N/A"
+            text += f"- Rating {rating}: {old_text} -> {new_text}"
+            if old and new is not None:
+                delta = f"{new - old:+,}".replace(",", ".")
+                text += f" ({delta}, {(new - old) / old * 100:+.1f}%)"
+            text += "\n"
     
     return text
 
-def send_scraper_notification(prices_dict):
+def load_price_changes(prices_dict, hours=None):
     """
-    Envía una notificación con los resultados del scraper
+    Calcula el cambio porcentual de cada precio frente al historial de hace hours horas
     
     Args:
-        prices_dict (dict): Diccionario con los precios por rating
+        prices_dict (dict): Precios actuales con las claves del scraper
+        hours (float): Horas hacia atrás (por defecto NOTIFY_CHANGE_HOURS)
+    
+    Returns:
+        dict: {clave: cambio en %} o None si está desactivado o no se pudo leer el historial
     """
+    hours = NOTIFY_CHANGE_HOURS if hours is None else hours
+    if not hours:
+        return None
     
-    # Obtener variables de entorno
-    ntfy_topic = os.getenv('NTFY_TOPIC')
+    try:
+        # Importación diferida: NumPy y la base de datos solo hacen falta con los cambios activados
+        from analytics.analytics import price_changes, price_matrix
+        from database.database import get_price_histories
+        
+        # Margen para encontrar un precio aunque falte alguna ejecución cerca de hace hours horas
+        history = get_price_histories(since=datetime.timedelta(hours=hours * 2))
+        if not history or not history["price"]:
+            return None
+        return price_changes(price_matrix(history), prices_dict, hours)
+    except Exception as e:
+        print(f"[ADVERTENCIA] No se pudieron calcular los cambios de precio: {e}")
+        return None
+
+def format_prices(prices_dict, changes=None, changes_label=None):
+    """
+    Formatea los precios para mostrar en la notificación, agrupados por plataforma
     
-    # Verificar que el tópico esté configurado
-    if not ntfy_topic:
-        print("[ADVERTENCIA] NTFY_TOPIC no está configurado, no se enviará notificación")
-        return False
+    Args:
+        prices_dict (dict): Diccionario con {(plataforma, rating): precio},
+            {(target, plataforma, rating): precio} o {rating: precio}
+        changes (dict): Cambio en % de cada clave de prices_dict (ver load_price_changes)
+        changes_label (str): Período de los cambios (ej: "24h")
+        
+    Returns:
+        str: Texto formateado con los precios
+    """
+    if not prices_dict:
+        return "[ERROR] No se pudieron obtener precios"
+    
+    text = "PRECIOS FUTBIN:\n"
+    
+    # Agrupar por página y plataforma; los ratings vienen del scraper (tabla de reglas), incluidos los que no tienen precio
+    groups = {}
+    for key, price in prices_dict.items():
+        source, platform, rating = split_source_key(key)
+        label = platform.upper() if source == DEFAULT_SOURCE else f"{source} {platform.upper()}"
+        change = changes.get(key) if changes else None
+        groups.setdefault(label, {})[rating] = (price, change)
     
+    for label, prices in groups.items():
+        text += f"\n{label}:\n"
+        for rating in sorted(prices):
+            price, change = prices[rating]
+            if price is not None:
+                # Formatear con separadores de miles
+                formatted_price = f"{price:,}".replace(",", ".")
+                text += f"- Rating {rating}: {formatted_price} coins"
+                if change is not None:
+                    period = f" {changes_label}" if changes_label else ""
+                    text += f" ({change:+.1f}%{period})"
+                text += "\n"
+            else:
+                text += f"- Rating {rating}: N/A\n"
+    
+    return text
+
+def build_message(prices_dict, changes=None):
+    """
+    Arma el título y el texto de la notificación
+    
+    Args:
+        prices_dict (dict): Diccionario con los precios por (plataforma, rating)
+        changes (dict): Cambios frente al snapshot (diff_prices); si hay, se envían solo esos
+    
+    Returns:
+        tuple: (título, mensaje)
+    """
     # Información de la ejecución
     timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')
     
-    # Contenido de la notificación
-    title = "FUTBIN - Precios Actualizados"
+    if changes:
+        title = "FUTBIN - Cambios de precio"
+        body = format_changes(changes)
+    else:
+        title = "FUTBIN - Precios Actualizados"
+        # Cambio frente a hace NOTIFY_CHANGE_HOURS horas (si está activado)
+        body = format_prices(prices_dict, load_price_changes(prices_dict), f"{NOTIFY_CHANGE_HOURS:g}h")
     
     message = f"""[{timestamp}]
 
-{format_prices(prices_dict)}
+{body}
 
 Scraper completado exitosamente"""
+    return title, message
+
+def send_scraper_notification(prices_dict, stats=None):
+    """
+    Envía una notificación con los resultados del scraper a todos los destinos
+    configurados (NOTIFY_SINKS o NTFY_TOPIC, ver dispatcher.py)
     
+    Con NOTIFY_MODE=changes solo se envía si algún precio cambió más que los umbrales
+    (NOTIFY_MIN_CHANGE_PCT / NOTIFY_MIN_CHANGE_COINS) frente al último notificado.
+    
+    Args:
+        prices_dict (dict): Diccionario con los precios por (plataforma, rating)
+        stats (dict): Diccionario donde guardar las métricas de cada destino (stats["sinks"])
+    
+    Returns:
+        bool: True si algún destino recibió el mensaje o no hacía falta enviar,
+            False si fallaron todos
+    """
+    
+    # Destinos configurados
     try:
-        # URL de la API de ntfy
-        url = f"https://ntfy.sh/{ntfy_topic}"
-        
-        # Headers para la notificación
-        headers = {
-            "Title": title,
-            "Priority": "default",
-            "Tags": "soccer,soccer_ball",
-            "Content-Type": "text/plain; charset=utf-8"
-        }
-        
-        # Enviar la notificación
-        # Codificar el mensaje explícitamente como UTF-8
-        response = requests.post(url, data=message.encode('utf-8'), headers=headers)
-        
-        if response.status_code == 200:
-            print(f"[OK] Notificación enviada exitosamente")
-            print(f"Topico: {ntfy_topic}")
-            return True
-        else:
-            print(f"[ERROR] Error al enviar notificación: Status {response.status_code}")
-            return False
-        
-    except Exception as e:
-        print(f"[ERROR] Error al enviar notificación: {str(e)}")
+        sinks = parse_sinks()
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return False
+    
+    if not sinks:
+        print("[ADVERTENCIA] Ni NOTIFY_SINKS ni NTFY_TOPIC están configurados, no se enviará notificación")
+        return False
+    
+    # En modo "changes": comparar con los últimos precios notificados (snapshot local,
+    # sin consultar la base). Sin snapshot (primera ejecución) se envía la lista completa
+    previous = load_snapshot() if NOTIFY_MODE == "changes" else None
+    changes = diff_prices(previous, prices_dict) if previous is not None else None
+    if changes is not None and not changes:
+        print("[INFO] Sin cambios de precio que superen el umbral, no se envía notificación")
+        return True
+    
+    title, message = build_message(prices_dict, changes)
+    results = dispatch(title, message, sinks, stats=stats)
+    if not any(result["ok"] for result in results.values()):
         return False
+    
+    if NOTIFY_MODE == "changes":
+        # Solo avanzan las claves notificadas: un cambio lento se sigue acumulando
+        # contra el último precio avisado hasta superar el umbral
+        snapshot = dict(previous or {})
+        if changes:
+            snapshot.update({key: new for key, (_, new) in changes.items()})
+        else:
+            snapshot.update({tuple(split_source_key(key)): price for key, price in prices_dict.items()})
+        try:
+            save_snapshot(snapshot)
+        except Exception as e:
+            print(f"[ADVERTENCIA] No se pudo guardar el snapshot de notificaciones: {e}")
+    
+    return True
 
 def main():
     """Función principal"""
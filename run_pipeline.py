@@ -2,14 +2,138 @@
 """
 Pipeline completo del scraper de FUTBIN
 Ejecuta el scraper y envía las notificaciones
+
+Sin subcomando ejecuta el pipeline completo (o el modo daemon con --daemon). Los
+subcomandos ejecutan un paso suelto y cada uno importa solo los módulos que usa
+(COMMANDS): guardar o notificar no cargan Playwright ni el scraper.
+
+Uso:
+    python run_pipeline.py [--daemon ...]
+    python run_pipeline.py scrape [--output precios.json]
+    python run_pipeline.py save|notify [precios.json]
+    python run_pipeline.py history --rating 84 [--platform ps] [--limit 10]
+    python run_pipeline.py report [--days 30 ...]
+    python run_pipeline.py dry-run [--input precios.json]
+    python run_pipeline.py profile [save notify ...] [--top 15]
 """
 
+import os
 import sys
-import asyncio
+import json
+import time
+import argparse
+import threading
+from monitoring.startup import load_env
+
+# Antes de cualquier otro import del proyecto: los módulos leen sus variables al importarse
+load_env()
+
+from scraping.platforms import DEFAULT_PLATFORM, DEFAULT_SOURCE, split_source_key
+
+# Tiempo máximo de cada etapa posterior al scraping (segundos)
+STAGE_TIMEOUTS = {
+    "save_prices": float(os.getenv("PIPELINE_SAVE_TIMEOUT_S", "60")),
+    "notify": float(os.getenv("PIPELINE_NOTIFY_TIMEOUT_S", "30")),
+}
+
+# Archivo de precios que escribe el subcomando scrape y leen save, notify y dry-run
+PRICES_PATH = os.getenv("PIPELINE_PRICES_PATH", ".cache/pipeline/prices.json")
 
-def run_complete_pipeline():
+def run_complete_pipeline(scrape=None, summary_fields=None):
     """
     Ejecuta el pipeline completo: scraper + guardar en BD + notificaciones
+
+    Al terminar emite una línea PIPELINE_SUMMARY con la duración de cada fase en JSON.
+
+    Args:
+        scrape (callable): Función (stats) -> precios que ejecuta el scraper; por defecto
+            asyncio.run(scraping.main.main(stats)). El modo daemon pasa una que usa su
+            navegador y su event loop
+        summary_fields (dict): Campos adicionales del resumen
+    """
+    from monitoring.monitoring import configure_logging, PhaseTimer
+
+    configure_logging()
+    timer = PhaseTimer()
+    scraper_stats = {}
+    notify_stats = {}
+    exit_code = 1
+
+    try:
+        exit_code = _run_steps(timer, scraper_stats, notify_stats, scrape)
+        return exit_code
+    finally:
+        timer.emit_summary(
+            status="ok" if exit_code == 0 else "error",
+            path=scraper_stats.get("path"),
+            workers=scraper_stats.get("workers"),
+            scraper_phases={name: round(seconds, 3) for name, seconds in scraper_stats.get("phases", {}).items()},
+            notify_sinks=notify_stats.get("sinks"),
+            **(summary_fields or {}),
+        )
+
+def run_stages(timer, stages, timeouts=None):
+    """
+    Ejecuta etapas independientes a la vez, cada una en su hilo y con su timeout
+
+    Los hilos son daemon: una etapa que supera su timeout se da por fallida y no
+    impide que el pipeline termine.
+
+    Args:
+        timer (PhaseTimer): Medidor donde se registra cada etapa como una fase
+        stages (dict): {nombre: (función, argumentos)}
+        timeouts (dict): {nombre: segundos} (por defecto STAGE_TIMEOUTS)
+
+    Returns:
+        dict: {nombre: {"result": valor devuelto, "error": str o None, "timed_out": bool}}
+    """
+    timeouts = timeouts or STAGE_TIMEOUTS
+    outcomes = {}
+
+    def run(name, func, args):
+        start = time.perf_counter()
+        try:
+            outcomes[name] = {"result": func(*args), "error": None}
+        except Exception as e:
+            outcomes[name] = {"result": None, "error": str(e) or type(e).__name__}
+        outcomes[name]["seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    threads = {}
+    for name, (func, args) in stages.items():
+        threads[name] = threading.Thread(target=run, args=(name, func, args), name=f"stage-{name}", daemon=True)
+        threads[name].start()
+
+    results = {}
+    for name, thread in threads.items():
+        thread.join(max(0.0, timeouts[name] - (time.perf_counter() - start)))
+        outcome = outcomes.get(name)
+        if outcome is None:
+            # Sigue corriendo: se abandona (el hilo es daemon)
+            results[name] = {"result": None, "error": f"timeout ({timeouts[name]:.0f}s)", "timed_out": True}
+            timer.record(name, time.perf_counter() - start, ok=False, timed_out=True)
+            print(f"[ERROR] La etapa {name} superó su timeout de {timeouts[name]:.0f}s")
+            continue
+
+        results[name] = {"result": outcome["result"], "error": outcome["error"], "timed_out": False}
+        timer.record(name, outcome["seconds"], ok=outcome["error"] is None)
+        if outcome["error"]:
+            print(f"[ERROR] Error en la etapa {name}: {outcome['error']}")
+
+    return results
+
+def _run_steps(timer, scraper_stats, notify_stats, scrape=None):
+    """
+    Ejecuta los pasos del pipeline midiendo cada uno como una fase
+
+    Args:
+        timer (PhaseTimer): Medidor de fases del pipeline
+        scraper_stats (dict): Métricas del scraper (ruta usada, fases internas)
+        notify_stats (dict): Métricas del envío de notificaciones (resultado por destino)
+        scrape (callable): Función (stats) -> precios (por defecto el scraper en un event loop nuevo)
+
+    Returns:
+        int: Código de salida (0 si todo fue bien)
     """
     print("=" * 60)
     print("INICIANDO PIPELINE COMPLETO")
@@ -19,17 +143,20 @@ def run_complete_pipeline():
     try:
         # Paso 1: Inicializar base de datos
         from database.database import init_database
-        init_database()
+        with timer.span("init_database"):
+            init_database()
         print("[INFO] Base de datos inicializada")
         print()
         
         # Paso 2: Ejecutar el scraper
-        from scraping.main import main as scraper_main
+        if scrape is None:
+            scrape = _run_scraper
         
         print("[INFO] Ejecutando scraper...")
         print()
         
-        result = asyncio.run(scraper_main())
+        with timer.span("scrape"):
+            result = scrape(scraper_stats)
         
         # Verificar si el scraper fue exitoso
         if not result:
@@ -41,28 +168,30 @@ def run_complete_pipeline():
         print()
         print("=" * 60)
         print("[OK] SCRAPER COMPLETADO")
+        print(f"[INFO] Precios obtenidos por: {scraper_stats.get('path', 'desconocido')}")
         print("=" * 60)
         print()
         
-        # Paso 3: Guardar en base de datos
-        print("[INFO] Guardando precios en base de datos...")
+        # Pasos 3 y 4: guardar en base de datos y enviar notificaciones a la vez
+        # (una escritura lenta en Supabase no retrasa el aviso de precios)
+        print("[INFO] Guardando precios en base de datos y enviando notificaciones...")
         print()
         
         from database.database import save_prices
-        db_success = save_prices(result)
+        from notifications.notifications import send_scraper_notification
         
-        if not db_success:
-            print("[ADVERTENCIA] No se pudieron guardar los precios en la base de datos")
+        # Usar los resultados directamente del scraper (sin JSON)
+        stages = run_stages(timer, {
+            "save_prices": (save_prices, (result,)),
+            "notify": (send_scraper_notification, (result, notify_stats)),
+        })
         
-        print()
+        if not stages["save_prices"]["result"]:
+            print("[ADVERTENCIA] No se pudieron guardar los precios en la base de datos")
         
-        # Paso 4: Enviar notificaciones
-        print("[INFO] Enviando notificaciones...")
         print()
         
-        # Usar los resultados directamente del scraper (sin JSON)
-        from notifications.notifications import send_scraper_notification
-        success = send_scraper_notification(result)
+        success = stages["notify"]["result"]
         
         if success:
             print()
@@ -86,5 +215,254 @@ def run_complete_pipeline():
         traceback.print_exc()
         return 1
 
+def _run_scraper(stats):
+    """Ejecuta el scraper en un event loop nuevo y devuelve los precios"""
+    import asyncio
+    from scraping.main import main as scraper_main
+
+    return asyncio.run(scraper_main(stats))
+
+def write_prices(prices_dict, path):
+    """
+    Guarda los precios del scraper en JSON para los subcomandos save y notify (escritura atómica)
+
+    Args:
+        prices_dict (dict): {(plataforma, rating): precio} o {(target, plataforma, rating): precio}
+        path (str): Archivo de salida ("-" para stdout)
+    """
+    rows = [list(split_source_key(key)) + [price] for key, price in prices_dict.items()]
+    text = json.dumps({"saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "prices": rows})
+    if path == "-":
+        print(text)
+        return
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def read_prices(path):
+    """
+    Lee los precios guardados por write_prices
+
+    Args:
+        path (str): Archivo ("-" para stdin)
+
+    Returns:
+        dict: {(target, plataforma, rating): precio} o None si no se pudo leer
+    """
+    try:
+        if path == "-":
+            rows = json.load(sys.stdin)["prices"]
+        else:
+            with open(path, encoding="utf-8") as f:
+                rows = json.load(f)["prices"]
+        return {(source, platform, rating): price for source, platform, rating, price in rows}
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"[ERROR] No se pudieron leer los precios de {path}: {e}")
+        return None
+
+def _command_scrape(args, scraping_main):
+    import asyncio
+    import contextlib
+    from monitoring.monitoring import configure_logging
+
+    # Con --output - stdout queda solo para el JSON (scrape --output - | ... save -)
+    progress = sys.stderr if args.output == "-" else sys.stdout
+    configure_logging(stream=progress)
+    stats = {}
+    with contextlib.redirect_stdout(progress):
+        prices = asyncio.run(scraping_main.main(stats))
+    if not prices:
+        return 1
+    write_prices(prices, args.output)
+    if args.output != "-":
+        print(f"[OK] {len(prices)} precios ({stats.get('path', 'desconocido')}) guardados en {args.output}")
+    return 0
+
+def _command_save(args, database):
+    prices = read_prices(args.input)
+    if prices is None:
+        return 1
+    if not database.init_database():
+        return 1
+    return 0 if database.save_prices(prices) else 1
+
+def _command_notify(args, notifications):
+    prices = read_prices(args.input)
+    if prices is None:
+        return 1
+    return 0 if notifications.send_scraper_notification(prices) else 1
+
+def _command_history(args, database):
+    history = database.get_price_history(args.rating, args.limit, args.platform, args.source)
+    if history is None:
+        return 1
+    if args.json:
+        print(json.dumps([{"timestamp": timestamp, "price": price} for timestamp, price in history], indent=2))
+        return 0
+    if not history:
+        print(f"[ADVERTENCIA] Sin precios para {args.source} {args.platform} rating {args.rating}")
+        return 1
+    print(f"[INFO] Últimos {len(history)} precios de {args.source} {args.platform.upper()} rating {args.rating}")
+    for timestamp, price in history:
+        print(f"{timestamp}  {price:>12,}".replace(",", "."))
+    return 0
+
+def _command_report(args, report):
+    return report.main(args.report_args)
+
+def _command_dry_run(args, notifications, database):
+    if args.input:
+        prices = read_prices(args.input)
+    else:
+        prices = _run_scraper({})
+    if not prices:
+        return 1
+
+    records = sum(price is not None for price in prices.values())
+    print(f"[INFO] Se guardarían {records} precios en {database.STORAGE_BACKEND} (no se guarda nada)")
+
+    try:
+        sinks = notifications.parse_sinks()
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    print(f"[INFO] Destinos: {', '.join(sink['name'] for sink in sinks) or 'ninguno'}")
+
+    previous = notifications.load_snapshot() if notifications.NOTIFY_MODE == "changes" else None
+    changes = notifications.diff_prices(previous, prices) if previous is not None else None
+    if changes is not None and not changes:
+        print("[INFO] Sin cambios de precio que superen el umbral, no se enviaría notificación")
+        return 0
+
+    title, message = notifications.build_message(prices, changes)
+    print("[INFO] Notificación que se enviaría (no se envía nada):")
+    print()
+    print(title)
+    print(message)
+    return 0
+
+def _command_profile(args):
+    from monitoring.startup import import_profile, imported_packages, top_imports
+
+    names = args.commands or [name for name in COMMANDS if name != "scrape"]
+    unknown = [name for name in names if name not in COMMANDS]
+    if unknown:
+        print(f"[ERROR] Subcomandos desconocidos: {', '.join(unknown)}")
+        return 1
+
+    interpreter = import_profile("pass")
+    print(f"[INFO] Intérprete sin imports: {interpreter['wall_ms']:.0f}ms")
+    for name in names:
+        profile = import_profile(PROFILE_CODE.format(command=name))
+        print()
+        if profile["error"]:
+            print(f"{name}: [ERROR] no se pudo cargar\n{profile['error']}")
+            continue
+        print(f"{name}: arranque {profile['wall_ms']:.0f}ms "
+              f"(+{profile['wall_ms'] - interpreter['wall_ms']:.0f}ms sobre el intérprete), "
+              f"{len(profile['modules']) - len(interpreter['modules'])} módulos importados")
+        for module, ms in top_imports(profile, args.top, interpreter):
+            print(f"  {ms:>8.1f}ms  {module}")
+        packages = list(imported_packages(profile, interpreter).items())[:args.top]
+        print("  por paquete: " + ", ".join(f"{package} {ms:.0f}ms" for package, ms in packages))
+    return 0
+
+# Subcomando -> (función, módulos que importa). Los módulos se importan al elegir el
+# subcomando y se pasan a la función en este orden: es todo lo que carga al arrancar
+COMMANDS = {
+    "scrape": (_command_scrape, ("scraping.main",)),
+    "save": (_command_save, ("database.database",)),
+    "notify": (_command_notify, ("notifications.notifications",)),
+    "history": (_command_history, ("database.database",)),
+    "report": (_command_report, ("analytics.report",)),
+    "dry-run": (_command_dry_run, ("notifications.notifications", "database.database")),
+}
+
+# Código que mide profile: el arranque de main() hasta tener el subcomando listo
+PROFILE_CODE = "import run_pipeline; run_pipeline.load_command({command!r})"
+
+def load_command(name):
+    """
+    Importa los módulos de un subcomando
+
+    Args:
+        name (str): Nombre del subcomando (clave de COMMANDS)
+
+    Returns:
+        tuple: (función, módulos importados)
+    """
+    import importlib
+
+    func, modules = COMMANDS[name]
+    return func, [importlib.import_module(module) for module in modules]
+
+def main(argv=None):
+    """Ejecuta el pipeline una vez, un subcomando o, con --daemon, el pipeline según un cron"""
+    parser = argparse.ArgumentParser(description="Pipeline del scraper de FUTBIN")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Quedar corriendo y ejecutar el pipeline según SCHEDULER_CRON")
+    parser.add_argument("--schedule", help="Expresión cron del modo daemon (por defecto SCHEDULER_CRON)")
+    parser.add_argument("--cadence", choices=["cron", "adaptive"],
+                        help="En modo daemon, horas fijas del cron o intervalo según la volatilidad "
+                             "(por defecto SCHEDULER_CADENCE)")
+    parser.add_argument("--now", action="store_true", help="En modo daemon, ejecutar una vez al arrancar")
+    parser.add_argument("--max-runs", type=int, help="En modo daemon, terminar después de N ejecuciones")
+
+    commands = parser.add_subparsers(dest="command", metavar="subcomando")
+    scrape = commands.add_parser("scrape", help="Ejecutar solo el scraper y guardar los precios en JSON")
+    scrape.add_argument("--output", default=PRICES_PATH,
+                        help=f"Archivo de salida, - para stdout (por defecto {PRICES_PATH})")
+    for name, help_text in [("save", "Guardar en la base de datos los precios de un JSON"),
+                            ("notify", "Enviar la notificación con los precios de un JSON")]:
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("input", nargs="?", default=PRICES_PATH,
+                             help=f"Archivo de precios, - para stdin (por defecto {PRICES_PATH})")
+    history = commands.add_parser("history", help="Mostrar los últimos precios guardados de un rating")
+    history.add_argument("--rating", type=int, required=True, help="Rating")
+    history.add_argument("--platform", default=DEFAULT_PLATFORM, help=f"Plataforma (por defecto {DEFAULT_PLATFORM})")
+    history.add_argument("--source", default=DEFAULT_SOURCE,
+                         help=f"Página (target) de los precios (por defecto {DEFAULT_SOURCE})")
+    history.add_argument("--limit", type=int, default=10, help="Cantidad de precios (por defecto 10)")
+    history.add_argument("--json", action="store_true", help="Imprimir en JSON")
+    commands.add_parser("report", help="Reporte de precios (mismas opciones que python -m analytics.report)",
+                        add_help=False)
+    dry_run = commands.add_parser("dry-run", help="Mostrar qué se guardaría y notificaría, sin guardar ni enviar")
+    dry_run.add_argument("--input", help="Archivo de precios (por defecto ejecuta el scraper)")
+    profile = commands.add_parser("profile", help="Medir el tiempo de importación de cada subcomando")
+    profile.add_argument("commands", nargs="*", help="Subcomandos a medir (por defecto todos salvo scrape)")
+    profile.add_argument("--top", type=int, default=15, help="Módulos a mostrar por subcomando")
+
+    # Las opciones de report se pasan tal cual a analytics.report
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "report":
+        args.report_args = extra
+    elif extra:
+        parser.error(f"argumentos no reconocidos: {' '.join(extra)}")
+
+    if args.command == "profile":
+        return _command_profile(args)
+    if args.command:
+        if args.daemon:
+            parser.error("--daemon no se combina con un subcomando")
+        func, modules = load_command(args.command)
+        return func(args, *modules)
+
+    if args.daemon:
+        from scheduler.daemon import run_daemon
+        return run_daemon(run_complete_pipeline, args.schedule, max_runs=args.max_runs, run_now=args.now,
+                          cadence=args.cadence)
+
+    from scheduler.lock import pipeline_lock
+    with pipeline_lock() as acquired:
+        if not acquired:
+            print("[ERROR] Hay otra ejecución del pipeline en curso")
+            return 1
+        return run_complete_pipeline()
+
 if __name__ == "__main__":
-    sys.exit(run_complete_pipeline())
+    sys.exit(main())
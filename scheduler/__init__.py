@@ -0,0 +1,8 @@
+"""
+Scheduler module para FUTBIN
+"""
+
+from .cron import parse_cron, next_run
+from .lock import pipeline_lock
+
+__version__ = "1.0.0"
@@ -0,0 +1,188 @@
+"""
+Cadencia adaptativa del daemon según cuánto se mueven los precios
+
+Después de cada ejecución se mira el historial guardado de las últimas
+SCHEDULER_CADENCE_WINDOW_H horas y se mide la actividad del mercado: el rango de
+cada serie ((máximo - mínimo) / mínimo, en %) y, entre todas las series, el
+percentil ACTIVITY_PERCENTILE (un movimiento amplio pesa más que un rating suelto).
+
+    actividad >= SCHEDULER_BUSY_PCT  -> SCHEDULER_MIN_INTERVAL_MIN
+    actividad <= SCHEDULER_CALM_PCT  -> SCHEDULER_MAX_INTERVAL_MIN
+    en el medio                      -> interpolación geométrica entre los dos
+
+El intervalo baja de golpe cuando el mercado se mueve, pero sube como mucho
+MAX_BACKOFF_FACTOR veces por decisión. Cada decisión se registra en el log y como
+una línea JSON en SCHEDULER_DECISIONS_PATH para poder ajustar los umbrales.
+"""
+
+import json
+import logging
+import math
+import os
+import warnings
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+# Límites del intervalo entre ejecuciones (minutos)
+SCHEDULER_MIN_INTERVAL_MIN = float(os.getenv("SCHEDULER_MIN_INTERVAL_MIN", "10"))
+SCHEDULER_MAX_INTERVAL_MIN = float(os.getenv("SCHEDULER_MAX_INTERVAL_MIN", "90"))
+
+# Horas de historial con las que se mide la actividad
+SCHEDULER_CADENCE_WINDOW_H = float(os.getenv("SCHEDULER_CADENCE_WINDOW_H", "6"))
+
+# Actividad (rango en %) a partir de la cual se usa el intervalo mínimo / hasta la cual el máximo
+SCHEDULER_BUSY_PCT = float(os.getenv("SCHEDULER_BUSY_PCT", "5"))
+SCHEDULER_CALM_PCT = float(os.getenv("SCHEDULER_CALM_PCT", "1"))
+
+# Decisiones registradas (una línea JSON por decisión; vacío para no guardarlas)
+SCHEDULER_DECISIONS_PATH = os.getenv("SCHEDULER_DECISIONS_PATH", ".cache/scheduler/decisions.jsonl")
+
+# Percentil entre series que se toma como actividad del mercado
+ACTIVITY_PERCENTILE = 75
+
+# Cuánto puede crecer el intervalo en una decisión
+MAX_BACKOFF_FACTOR = 2.0
+
+# Intervalo de la matriz de precios con la que se mide el rango
+ACTIVITY_STEP = timedelta(minutes=5)
+
+
+def price_activity(history, percentile=ACTIVITY_PERCENTILE):
+    """
+    Actividad del mercado en el historial: percentil entre series del rango de cada una
+
+    Args:
+        history (dict): Historial columnar (get_price_histories o load_mirror)
+        percentile (float): Percentil entre series
+
+    Returns:
+        dict: {"activity": % o None si ninguna serie tiene dos precios, "series": series
+            con al menos dos precios, "top": (clave, rango %) de la serie más movida}
+    """
+    # Importación diferida: analytics solo hace falta con la cadencia adaptativa
+    from analytics.analytics import price_matrix
+
+    empty = {"activity": None, "series": 0, "top": None}
+    if history is None or len(history["price"]) == 0:
+        return empty
+
+    matrix = price_matrix(history, ACTIVITY_STEP)
+    prices = matrix["prices"]
+    usable = np.count_nonzero(np.isfinite(prices), axis=0) >= 2
+    if not usable.any():
+        return empty
+
+    with warnings.catch_warnings():
+        # Columnas sin precios: ya quedan fuera por usable
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low = np.nanmin(prices[:, usable], axis=0)
+        high = np.nanmax(prices[:, usable], axis=0)
+    ranges = np.where(low > 0, (high - low) / np.where(low > 0, low, 1) * 100, 0.0)
+
+    keys = [key for key, keep in zip(matrix["keys"], usable) if keep]
+    top = int(np.argmax(ranges))
+    return {
+        "activity": round(float(np.percentile(ranges, percentile)), 3),
+        "series": len(keys),
+        "top": (keys[top], round(float(ranges[top]), 3)),
+    }
+
+
+def choose_interval(activity, previous_s=None, min_s=None, max_s=None, calm_pct=None, busy_pct=None):
+    """
+    Intervalo hasta la próxima ejecución según la actividad
+
+    Args:
+        activity (float): Actividad en % (ver price_activity); None si no hay datos
+        previous_s (float): Intervalo anterior en segundos (None en la primera decisión)
+        min_s (float): Intervalo mínimo (por defecto SCHEDULER_MIN_INTERVAL_MIN)
+        max_s (float): Intervalo máximo (por defecto SCHEDULER_MAX_INTERVAL_MIN)
+        calm_pct (float): Actividad hasta la cual se usa el máximo (por defecto SCHEDULER_CALM_PCT)
+        busy_pct (float): Actividad desde la cual se usa el mínimo (por defecto SCHEDULER_BUSY_PCT)
+
+    Returns:
+        tuple: (segundos, motivo)
+    """
+    min_s = SCHEDULER_MIN_INTERVAL_MIN * 60 if min_s is None else min_s
+    max_s = SCHEDULER_MAX_INTERVAL_MIN * 60 if max_s is None else max_s
+    calm_pct = SCHEDULER_CALM_PCT if calm_pct is None else calm_pct
+    busy_pct = SCHEDULER_BUSY_PCT if busy_pct is None else busy_pct
+
+    if activity is None:
+        target = previous_s or max_s
+        reason = "sin precios suficientes en la ventana, se mantiene el intervalo"
+    elif activity >= busy_pct:
+        target = min_s
+        reason = f"actividad {activity:.2f}% >= {busy_pct:g}%: intervalo mínimo"
+    elif activity <= calm_pct:
+        target = max_s
+        reason = f"actividad {activity:.2f}% <= {calm_pct:g}%: intervalo máximo"
+    else:
+        # Entre los umbrales: geométrico, así cada duplicación de la actividad acorta lo mismo
+        fraction = math.log(activity / calm_pct) / math.log(busy_pct / calm_pct)
+        target = max_s * (min_s / max_s) ** fraction
+        reason = f"actividad {activity:.2f}% entre {calm_pct:g}% y {busy_pct:g}%"
+
+    if previous_s and target > previous_s * MAX_BACKOFF_FACTOR:
+        target = previous_s * MAX_BACKOFF_FACTOR
+        reason += f" (subida limitada a x{MAX_BACKOFF_FACTOR:g})"
+
+    return min(max(target, min_s), max_s), reason
+
+
+def _record_decision(decision, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(decision, ensure_ascii=False, default=str) + "\n")
+
+
+def decide_interval(previous_s=None, window_h=None, decisions_path=None):
+    """
+    Decide el intervalo hasta la próxima ejecución con el historial guardado y lo registra
+
+    Args:
+        previous_s (float): Intervalo anterior en segundos
+        window_h (float): Horas de historial (por defecto SCHEDULER_CADENCE_WINDOW_H)
+        decisions_path (str): Archivo de decisiones (por defecto SCHEDULER_DECISIONS_PATH)
+
+    Returns:
+        tuple: (segundos, decisión {"at", "interval_s", "previous_s", "activity",
+            "series", "top", "reason"})
+    """
+    from database.database import get_price_histories
+
+    window_h = SCHEDULER_CADENCE_WINDOW_H if window_h is None else window_h
+    decisions_path = SCHEDULER_DECISIONS_PATH if decisions_path is None else decisions_path
+
+    history = get_price_histories(since=timedelta(hours=window_h))
+    measured = price_activity(history)
+    interval_s, reason = choose_interval(measured["activity"], previous_s)
+
+    top = None
+    if measured["top"] is not None:
+        (source, platform, rating), top_range = measured["top"]
+        top = {"source": source, "platform": platform, "rating": rating, "range_pct": top_range}
+    decision = {
+        "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "interval_s": round(interval_s),
+        "previous_s": round(previous_s) if previous_s else None,
+        "activity": measured["activity"],
+        "series": measured["series"],
+        "top": top,
+        "reason": reason,
+    }
+    logger.info("Próximo intervalo: %.1f min (%s)", interval_s / 60, reason, extra={"cadence": decision})
+
+    if decisions_path:
+        try:
+            _record_decision(decision, decisions_path)
+        except OSError as e:
+            logger.warning("No se pudo registrar la decisión de cadencia: %s", e)
+    return interval_s, decision
@@ -0,0 +1,112 @@
+"""
+Expresiones cron de 5 campos (minuto hora día-del-mes mes día-de-la-semana)
+
+Acepta lo mismo que el schedule de GitHub Actions: *, números, listas (1,15),
+rangos (1-5) y pasos (*/15, 0-30/10). El día de la semana va de 0 (domingo) a 6
+(7 también es domingo). Como en cron, si se restringen el día del mes y el de la
+semana a la vez, alcanza con que coincida uno de los dos.
+"""
+
+from datetime import timedelta
+
+
+# (mínimo, máximo) de cada campo
+FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+def _parse_field(text, low, high):
+    """Valores permitidos de un campo, como conjunto"""
+    values = set()
+    for part in text.split(","):
+        base, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start, end = (int(value) for value in base.split("-", 1))
+        else:
+            start = int(base)
+            end = high if step > 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Campo cron fuera de rango: {part}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(expression):
+    """
+    Interpreta una expresión cron
+
+    Args:
+        expression (str): Expresión de 5 campos (ej: "*/15 * * * *")
+
+    Returns:
+        dict: {"minutes", "hours", "days", "months", "weekdays"} con los valores
+            permitidos y "any_day"/"any_weekday" si el campo era "*"
+
+    Raises:
+        ValueError: Si la expresión no es válida
+    """
+    fields = expression.split()
+    if len(fields) != 5:
+        raise ValueError(f"La expresión cron debe tener 5 campos: {expression!r}")
+    try:
+        minutes, hours, days, months, weekdays = (
+            _parse_field(field, low, high) for field, (low, high) in zip(fields, FIELD_RANGES)
+        )
+    except ValueError as e:
+        raise ValueError(f"Expresión cron inválida {expression!r}: {e}") from None
+
+    return {
+        "minutes": minutes,
+        "hours": hours,
+        "days": days,
+        "months": months,
+        "weekdays": {day % 7 for day in weekdays},
+        "any_day": fields[2] == "*",
+        "any_weekday": fields[4] == "*",
+    }
+
+
+def _day_matches(cron, moment):
+    in_month = moment.day in cron["days"]
+    in_week = (moment.weekday() + 1) % 7 in cron["weekdays"]
+    if cron["any_day"] or cron["any_weekday"]:
+        return in_month and in_week
+    return in_month or in_week
+
+
+def next_run(cron, after):
+    """
+    Próximo momento que cumple la expresión, estrictamente después de after
+
+    Args:
+        cron (dict|str): Expresión cron o el resultado de parse_cron
+        after (datetime): Momento de referencia
+
+    Returns:
+        datetime: Próxima ejecución (minuto exacto, con la zona horaria de after)
+
+    Raises:
+        ValueError: Si la expresión no tiene ninguna fecha posible (ej: 31 de febrero)
+    """
+    if isinstance(cron, str):
+        cron = parse_cron(cron)
+
+    moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    # Se avanza de a mes, día, hora o minuto según el primer campo que no coincide;
+    # cinco años alcanzan para cualquier expresión con alguna fecha posible
+    limit = moment + timedelta(days=5 * 366)
+    while moment <= limit:
+        if moment.month not in cron["months"]:
+            year, month = divmod(moment.month, 12)
+            moment = moment.replace(year=moment.year + year, month=month + 1, day=1, hour=0, minute=0)
+        elif not _day_matches(cron, moment):
+            moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+        elif moment.hour not in cron["hours"]:
+            moment = (moment + timedelta(hours=1)).replace(minute=0)
+        elif moment.minute not in cron["minutes"]:
+            moment += timedelta(minutes=1)
+        else:
+            return moment
+    raise ValueError("La expresión cron no tiene ninguna fecha posible")
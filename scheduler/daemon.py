@@ -0,0 +1,175 @@
+"""
+Modo daemon del pipeline: un proceso que queda corriendo y ejecuta el pipeline
+según una expresión cron
+
+El intérprete, los módulos importados, el cliente de la base de datos, las
+sesiones HTTP de las notificaciones y el navegador (scraping/warm_browser.py)
+quedan cargados entre ejecuciones, así que cada ejecución cuesta solo el scraping.
+
+Cada ejecución espera un tiempo al azar de hasta SCHEDULER_JITTER_S después de la
+hora del cron, para no pedir la página siempre en el mismo segundo. Con
+SCHEDULER_CADENCE=adaptive el cron se ignora y el intervalo entre ejecuciones se
+ajusta según cuánto se mueven los precios (cadence.py).
+
+Las ejecuciones nunca se superponen: corren una detrás de otra, las que se pierden
+por una ejecución larga se saltan, y un lock de archivo (lock.py) evita chocar con
+otro proceso.
+
+Uso:
+    python run_pipeline.py --daemon [--schedule "*/15 * * * *"] [--cadence adaptive] [--now] [--max-runs N]
+"""
+
+import asyncio
+import logging
+import os
+import random
+import signal
+import threading
+from datetime import datetime, timedelta, timezone
+
+from .cadence import decide_interval
+from .cron import next_run, parse_cron
+from .lock import pipeline_lock
+
+
+logger = logging.getLogger(__name__)
+
+
+# Expresión cron de las ejecuciones (en UTC, como el schedule de GitHub Actions)
+SCHEDULER_CRON = os.getenv("SCHEDULER_CRON", "0 * * * *")
+
+# Espera al azar máxima después de cada hora del cron (segundos)
+SCHEDULER_JITTER_S = float(os.getenv("SCHEDULER_JITTER_S", "60"))
+
+# "cron": horas fijas de SCHEDULER_CRON; "adaptive": intervalo según la volatilidad
+SCHEDULER_CADENCE = os.getenv("SCHEDULER_CADENCE", "cron")
+
+
+def next_run_time(cron, now, jitter_s):
+    """
+    Momento de la próxima ejecución: la próxima hora del cron más una espera al azar
+
+    Args:
+        cron (dict): Expresión interpretada por parse_cron
+        now (datetime): Momento actual (con zona horaria)
+        jitter_s (float): Espera al azar máxima en segundos
+
+    Returns:
+        datetime: Momento de la próxima ejecución
+    """
+    return next_run(cron, now) + timedelta(seconds=random.uniform(0, jitter_s) if jitter_s > 0 else 0)
+
+
+def run_once(pipeline, loop, warm, run_number):
+    """
+    Ejecuta el pipeline una vez con el navegador compartido
+
+    Args:
+        pipeline (callable): run_complete_pipeline de run_pipeline.py
+        loop: Event loop donde vive el navegador
+        warm (WarmBrowser): Navegador compartido
+        run_number (int): Número de ejecución del daemon (para el resumen)
+
+    Returns:
+        int: Código de salida del pipeline, o None si se saltó porque había otra en curso
+    """
+    from scraping.main import main as scraper_main
+
+    with pipeline_lock() as acquired:
+        if not acquired:
+            logger.warning("Hay otra ejecución del pipeline en curso, se salta esta")
+            return None
+
+        scraped = {"ok": False}
+
+        async def scrape_with_warm_browser(stats):
+            # El navegador se lanza (o se toma el abierto) solo si la ruta HTTP no sirvió
+            result = await scraper_main(stats, get_browser=lambda: warm.get(stats))
+            scraped["ok"] = bool(result)
+            return result
+
+        summary_fields = {"daemon_run": run_number, "browser_runs": warm.runs}
+        exit_code = pipeline(
+            scrape=lambda stats: loop.run_until_complete(scrape_with_warm_browser(stats)),
+            summary_fields=summary_fields,
+        )
+
+        # Un scraping fallido puede dejar el navegador en mal estado: se recicla
+        loop.run_until_complete(warm.release(ok=scraped["ok"]))
+        return exit_code
+
+
+def run_daemon(pipeline, schedule=None, jitter_s=None, max_runs=None, run_now=False, cadence=None):
+    """
+    Ejecuta el pipeline según el cron (o con cadencia adaptativa) hasta recibir SIGINT o SIGTERM
+
+    La señal no corta una ejecución en curso: el daemon termina al acabar esa ejecución.
+
+    Args:
+        pipeline (callable): run_complete_pipeline de run_pipeline.py
+        schedule (str): Expresión cron (por defecto SCHEDULER_CRON)
+        jitter_s (float): Espera al azar máxima (por defecto SCHEDULER_JITTER_S)
+        max_runs (int): Terminar después de esta cantidad de ejecuciones (None: sin límite)
+        run_now (bool): Hacer la primera ejecución al arrancar, sin esperar al cron
+        cadence (str): "cron" o "adaptive" (por defecto SCHEDULER_CADENCE)
+
+    Returns:
+        int: 0 al terminar, 1 si la expresión cron o la cadencia no son válidas
+    """
+    from monitoring.monitoring import configure_logging
+    from scraping.warm_browser import WarmBrowser
+
+    schedule = schedule or SCHEDULER_CRON
+    jitter_s = SCHEDULER_JITTER_S if jitter_s is None else jitter_s
+    cadence = cadence or SCHEDULER_CADENCE
+    if cadence not in ("cron", "adaptive"):
+        print(f"[ERROR] Cadencia desconocida: {cadence} (usar cron o adaptive)")
+        return 1
+    try:
+        cron = parse_cron(schedule)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    warm = WarmBrowser()
+    runs = 0
+    interval_s = None
+    configure_logging()
+    if cadence == "adaptive":
+        print(f"[INFO] Daemon iniciado: cadencia adaptativa, espera al azar de hasta {jitter_s:g}s")
+    else:
+        print(f"[INFO] Daemon iniciado: cron '{schedule}' (UTC), espera al azar de hasta {jitter_s:g}s")
+
+    try:
+        while not stop.is_set() and (max_runs is None or runs < max_runs):
+            if not (run_now and runs == 0):
+                now = datetime.now(timezone.utc)
+                if cadence == "adaptive":
+                    # El historial ya incluye los precios de la ejecución que acaba de terminar
+                    interval_s, decision = decide_interval(interval_s)
+                    at = now + timedelta(seconds=interval_s + random.uniform(0, min(jitter_s, interval_s / 10)))
+                    print(f"[INFO] Próxima ejecución: {at.isoformat(timespec='seconds')} "
+                          f"(intervalo {interval_s / 60:.0f} min: {decision['reason']})")
+                else:
+                    at = next_run_time(cron, now, jitter_s)
+                    print(f"[INFO] Próxima ejecución: {at.isoformat(timespec='seconds')}")
+                if stop.wait(max(0.0, (at - now).total_seconds())):
+                    break
+
+            runs += 1
+            exit_code = run_once(pipeline, loop, warm, runs)
+            print(f"[INFO] Ejecución {runs} terminada "
+                  f"({'saltada' if exit_code is None else f'código {exit_code}'}; "
+                  f"navegador: {warm.launches} lanzamientos, {warm.runs} ejecuciones con el actual)")
+    finally:
+        loop.run_until_complete(warm.close())
+        loop.close()
+
+    print(f"[INFO] Daemon detenido después de {runs} ejecuciones")
+    return 0
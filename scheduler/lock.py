@@ -0,0 +1,44 @@
+"""
+Lock entre procesos para que no corran dos ejecuciones del pipeline a la vez
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+
+
+# Archivo del lock (flock: se libera solo si el proceso muere)
+SCHEDULER_LOCK_PATH = os.getenv("SCHEDULER_LOCK_PATH", ".cache/scheduler/pipeline.lock")
+
+
+@contextmanager
+def pipeline_lock(path=None):
+    """
+    Toma el lock del pipeline sin esperar
+
+    Uso:
+        with pipeline_lock() as acquired:
+            if not acquired:
+                ...  # hay otra ejecución en curso
+
+    Args:
+        path (str): Archivo del lock (por defecto SCHEDULER_LOCK_PATH)
+
+    Yields:
+        bool: True si se tomó el lock, False si lo tiene otro proceso
+    """
+    path = path or SCHEDULER_LOCK_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
@@ -0,0 +1,382 @@
+"""
+Motor de scraping de varias páginas de FUTBIN con un único navegador
+
+Lanza un solo Chromium con un solo contexto (cookies, sesión y bloqueo de recursos
+compartidos) y un pool acotado de pestañas. Cada target toma una pestaña libre,
+navega, espera la tabla de precios y extrae las columnas de rating. Mientras una
+pestaña espera la red, las otras avanzan, así que agregar targets aumenta el
+tiempo total mucho menos que linealmente.
+
+Cada target tiene su propio timeout y un fallo en uno no afecta al resto: el
+resultado indica por target si se obtuvieron precios y, si no, por qué.
+
+Uso:
+    python -m scraping.engine [targets.json]
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+
+from playwright.async_api import async_playwright
+
+from .platforms import DEFAULT_SOURCE, get_platforms
+from .ratings_processor import get_ratings
+from .resource_policy import format_resource_stats
+from .scraper import (
+    FUTBIN_URL,
+    CHEAPEST_PATH,
+    READY_TIMEOUT_MS,
+    warm_up,
+    goto_path,
+    wait_for_price_table,
+    extract_prices,
+    launch_browser,
+    new_scraper_context,
+    new_scraper_page,
+    log_missing_columns,
+)
+from .session_state import SESSION_STATE_PATH, load_session_state, save_session_state, discard_session_state
+
+
+logger = logging.getLogger(__name__)
+
+
+# Pestañas abiertas a la vez
+SCRAPER_CONCURRENCY = int(os.getenv("SCRAPER_CONCURRENCY", "3"))
+
+# Tiempo máximo por target, desde que tiene pestaña hasta que termina la extracción (segundos)
+TARGET_TIMEOUT_S = float(os.getenv("SCRAPER_TARGET_TIMEOUT_S", "120"))
+
+# Página de jugadores más baratos (el target por defecto)
+CHEAPEST_TARGET = {"name": DEFAULT_SOURCE, "path": CHEAPEST_PATH}
+
+
+def load_targets(path=None):
+    """
+    Carga la lista de páginas a scrapear
+
+    El JSON es una lista de {"name": str, "path": str}, con rutas relativas a FUTBIN_URL
+    y todas con la estructura de columnas de rating de la página de más baratos.
+
+    Args:
+        path (str): Ruta del JSON; por defecto SCRAPER_TARGETS_PATH
+
+    Returns:
+        list: Targets {"name", "path"}; solo CHEAPEST_TARGET si no hay archivo configurado
+    """
+    path = path or os.getenv("SCRAPER_TARGETS_PATH")
+    if not path:
+        return [dict(CHEAPEST_TARGET)]
+
+    with open(path, "r", encoding="utf-8") as f:
+        targets = json.load(f)
+
+    names = set()
+    for target in targets:
+        if not target.get("name") or not str(target.get("path", "")).startswith("/"):
+            raise ValueError(f"Target inválido (requiere 'name' y 'path' que empiece con '/'): {target}")
+        if target["name"] in names:
+            raise ValueError(f"Target duplicado: {target['name']}")
+        names.add(target["name"])
+
+    return targets
+
+
+class PagePool:
+    """
+    Pool acotado de pestañas de un mismo contexto
+
+    Las pestañas se abren a medida que se necesitan, hasta size a la vez. Una
+    pestaña que terminó con error (por ejemplo un timeout a mitad de navegación)
+    se cierra y el siguiente target abre una nueva.
+    """
+
+    def __init__(self, context, size):
+        self.context = context
+        self.size = max(1, size)
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle = []
+
+    async def acquire(self):
+        await self._slots.acquire()
+        if self._idle:
+            return self._idle.pop()
+        try:
+            return await new_scraper_page(self.context)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, page):
+        self._idle.append(page)
+        self._slots.release()
+
+    async def discard(self, page):
+        try:
+            await page.close()
+        except Exception:
+            pass
+        finally:
+            self._slots.release()
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        """Presta una pestaña; si el bloque falla, la pestaña se descarta"""
+        page = await self.acquire()
+        try:
+            yield page
+        except BaseException:
+            await self.discard(page)
+            raise
+        self.release(page)
+
+
+async def scrape_target(page, target, platforms, ratings, extraction="evaluate",
+                        ready_timeout_ms=READY_TIMEOUT_MS, base_url=FUTBIN_URL, stats=None):
+    """
+    Scrapea una página con columnas de rating en una pestaña ya abierta
+
+    Args:
+        page: Página de Playwright
+        target (dict): Target {"name", "path"}
+        platforms (list): Plataformas a leer
+        ratings (list): Ratings a procesar
+        extraction (str): Modo de extracción, "evaluate" o "handles"
+        ready_timeout_ms (int): Tiempo máximo de espera de la tabla en milisegundos
+        base_url (str): URL base de FUTBIN
+        stats (dict): Diccionario donde registrar la duración de cada fase
+
+    Returns:
+        tuple: ({(plataforma, rating): precio} o None, True si la tabla quedó lista)
+    """
+    await goto_path(page, target["path"], base_url, stats)
+    ready = await wait_for_price_table(page, platforms, timeout_ms=ready_timeout_ms, stats=stats)
+    prices = await extract_prices(page, platforms, ratings, extraction, stats)
+    if prices is None:
+        logger.error("No se encontró ninguna columna de rating en %s", target["path"])
+        await log_missing_columns(page)
+    return prices, ready
+
+
+async def _run_target(pool, target, timeout_s, on_finished=None, **kwargs):
+    """Scrapea un target con su timeout y devuelve su resultado, sin propagar errores"""
+    start = time.perf_counter()
+    prices, ready, error = None, False, None
+    try:
+        async with pool.page() as page:
+            prices, ready = await asyncio.wait_for(scrape_target(page, target, **kwargs), timeout_s)
+        if prices is None:
+            error = "no se encontraron columnas de rating"
+    except asyncio.TimeoutError:
+        error = f"timeout ({timeout_s:.0f}s)"
+    except Exception as e:
+        error = str(e) or type(e).__name__
+
+    seconds = time.perf_counter() - start
+    if error:
+        logger.warning("Target '%s' falló en %.2fs: %s", target["name"], seconds, error)
+    else:
+        logger.info("Target '%s' listo en %.2fs", target["name"], seconds)
+
+    result = {
+        "name": target["name"],
+        "path": target["path"],
+        "prices": prices,
+        "ready": ready,
+        "error": error,
+        "seconds": round(seconds, 3),
+    }
+    if on_finished is not None:
+        on_finished(result)
+    return result
+
+
+def merge_target_prices(results):
+    """
+    Junta los precios de todos los targets en un único diccionario
+
+    Args:
+        results (dict): Resultados por target (los de scrape_targets)
+
+    Returns:
+        dict: {(target, plataforma, rating): precio}; los targets que fallaron no aportan claves
+    """
+    merged = {}
+    for name, result in results.items():
+        for (platform, rating), price in (result["prices"] or {}).items():
+            merged[(name, platform, rating)] = price
+    return merged
+
+
+def _failed_results(targets, error):
+    return {
+        target["name"]: {
+            "name": target["name"], "path": target["path"], "prices": None,
+            "ready": False, "error": error, "seconds": 0.0,
+        }
+        for target in targets
+    }
+
+
+@contextlib.asynccontextmanager
+async def _scraper_context(browser, headless, session_state, resource_policy, stats):
+    """
+    Contexto del scraper sobre el navegador recibido o sobre uno lanzado para esta ejecución
+
+    Al salir se cierra el contexto (un navegador compartido sigue abierto) y, si se
+    lanzó aquí, también el navegador.
+    """
+    async with contextlib.AsyncExitStack() as stack:
+        if browser is None:
+            p = await stack.enter_async_context(async_playwright())
+            browser = await launch_browser(p, headless, stats)
+            stack.push_async_callback(browser.close)
+
+        context, resource_counters = await new_scraper_context(browser, session_state, resource_policy, stats)
+        stack.push_async_callback(context.close)
+        yield context, resource_counters
+
+
+async def scrape_targets(targets=None, concurrency=SCRAPER_CONCURRENCY, target_timeout_s=TARGET_TIMEOUT_S,
+                         headless=True, extraction="evaluate", ready_timeout_ms=READY_TIMEOUT_MS,
+                         resource_policy="env", session_state_path=SESSION_STATE_PATH, base_url=FUTBIN_URL,
+                         platforms=None, stats=None, on_result=None, browser=None):
+    """
+    Scrapea varias páginas compartiendo un navegador y un pool acotado de pestañas
+
+    Con un estado de sesión guardado se va directo a los targets; si alguna tabla no
+    carga con ese estado, se descarta, se pasa por la portada y se reintentan esos
+    targets una vez.
+
+    Args:
+        targets (list): Targets {"name", "path"} (por defecto load_targets())
+        concurrency (int): Cantidad máxima de pestañas abiertas a la vez
+        target_timeout_s (float): Tiempo máximo de cada target en segundos
+        headless (bool): Si ejecutar el navegador sin ventana visible
+        extraction (str): Modo de extracción, "evaluate" (por defecto) o "handles"
+        ready_timeout_ms (int): Tiempo máximo de cada espera de carga en milisegundos
+        resource_policy (dict): Política de bloqueo de recursos; "env" la carga de
+            SCRAPER_RESOURCE_POLICY y None desactiva el bloqueo
+        session_state_path (str): Archivo del estado de sesión; None desactiva la reutilización
+        base_url (str): URL base de FUTBIN (se puede apuntar a un servidor local)
+        platforms (list): Plataformas a leer (por defecto get_platforms())
+        stats (dict): Diccionario opcional donde se registran las esperas ("waits"), los
+            recursos ("resources"), la sesión ("session"), el resultado de cada target
+            ("targets") y la duración de cada fase ("phases"). Las fases de pestañas que
+            corren a la vez se suman, así que pueden superar el tiempo total.
+        on_result (callable): Se llama con el resultado de cada target apenas termina
+            (los que se reintentan, después del reintento)
+        browser: Navegador ya lanzado (ver warm_browser.py); se usa sin cerrarlo. Por
+            defecto se lanza uno para esta ejecución y se cierra al terminar
+
+    Returns:
+        dict: {nombre: {"name", "path", "prices", "ready", "error", "seconds"}} en el
+            orden de los targets; "prices" es {(plataforma, rating): precio} o None si falló
+    """
+    if targets is None:
+        targets = load_targets()
+    if platforms is None:
+        platforms = get_platforms()
+    ratings = get_ratings()
+    target_kwargs = {
+        "platforms": platforms,
+        "ratings": ratings,
+        "extraction": extraction,
+        "ready_timeout_ms": ready_timeout_ms,
+        "base_url": base_url,
+        "stats": stats,
+    }
+
+    try:
+        # Reutilizar cookies y local storage de la ejecución anterior si siguen vigentes
+        session_state = load_session_state(session_state_path) if session_state_path else None
+        async with _scraper_context(browser, headless, session_state, resource_policy, stats) as (
+            context, resource_counters
+        ):
+            pool = PagePool(context, min(concurrency, len(targets)))
+
+            def finished(result):
+                # Con un estado reutilizado, las páginas que no cargaron se reintentan: se informan después
+                if on_result is not None and (result["ready"] or session_state is None):
+                    on_result(result)
+
+            # Las cookies son del contexto: basta con pasar una vez por la portada
+            if session_state is None:
+                async with pool.page() as page:
+                    await warm_up(page, base_url, ready_timeout_ms, stats)
+
+            logger.info("Scrapeando %d targets con %d pestañas", len(targets), pool.size)
+            results = await asyncio.gather(
+                *(_run_target(pool, target, target_timeout_s, finished, **target_kwargs) for target in targets)
+            )
+            results = {result["name"]: result for result in results}
+
+            # Si alguna página no cargó con el estado guardado, el sitio lo rechazó: volver a calentar
+            rejected = [target for target in targets if not results[target["name"]]["ready"]]
+            if rejected and session_state is not None:
+                logger.info("%d targets no cargaron con el estado guardado, se vuelve a pasar por la portada",
+                            len(rejected))
+                discard_session_state(session_state_path)
+                session_state = None
+                async with pool.page() as page:
+                    await warm_up(page, base_url, ready_timeout_ms, stats)
+                retried = await asyncio.gather(
+                    *(_run_target(pool, target, target_timeout_s, finished, **target_kwargs) for target in rejected)
+                )
+                results.update((result["name"], result) for result in retried)
+
+            if stats is not None:
+                stats["session"] = "reused" if session_state is not None else "warmed"
+
+            if resource_counters is not None:
+                logger.info("Recursos: %s", format_resource_stats(resource_counters))
+
+            # Guardar la sesión para que la próxima ejecución no pase por la portada
+            if session_state_path and any(result["prices"] is not None for result in results.values()):
+                await save_session_state(context, session_state_path)
+
+    except Exception as e:
+        logger.error("Error general: %s", e)
+        results = _failed_results(targets, str(e) or type(e).__name__)
+
+    results = {target["name"]: results[target["name"]] for target in targets}
+    failed = [name for name, result in results.items() if result["error"]]
+    logger.info("Targets: %d/%d ok", len(results) - len(failed), len(results))
+    if failed:
+        logger.warning("Targets con error: %s", ", ".join(f"{name} ({results[name]['error']})" for name in failed))
+
+    if stats is not None:
+        stats["targets"] = {
+            name: {"ok": result["error"] is None, "seconds": result["seconds"], "error": result["error"]}
+            for name, result in results.items()
+        }
+
+    return results
+
+
+def main():
+    """Scrapea los targets de un JSON (o SCRAPER_TARGETS_PATH) y muestra el resultado de cada uno"""
+    from monitoring.monitoring import configure_logging
+
+    configure_logging()
+    targets = load_targets(sys.argv[1] if len(sys.argv) > 1 else None)
+    results = asyncio.run(scrape_targets(targets))
+
+    for name, result in results.items():
+        if result["error"]:
+            print(f"[ERROR] {name}: {result['error']}")
+            continue
+        print(f"[OK] {name} ({result['seconds']:.2f}s)")
+        for (platform, rating), price in result["prices"].items():
+            print(f"  {platform.upper()} rating {rating}: {price}")
+
+    return 0 if all(result["error"] is None for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
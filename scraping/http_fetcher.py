@@ -0,0 +1,274 @@
+"""
+Módulo para obtener los precios por HTTP sin lanzar el navegador
+
+Descarga la página de jugadores más baratos con una petición normal y lee las
+columnas de rating de todas las plataformas con el parser HTML de la librería
+estándar. Si la respuesta está bloqueada o el HTML no tiene la estructura
+esperada, devuelve None para que se use el scraper con Playwright.
+"""
+
+import logging
+import re
+import sys
+from html.parser import HTMLParser
+
+import requests
+
+from .platforms import PLATFORM_COLUMN_CLASSES, get_platforms
+from .ratings_processor import process_platform_rows, get_ratings, max_prices_needed
+from .scraper import FUTBIN_URL, CHEAPEST_PATH
+from monitoring.monitoring import phase
+
+
+logger = logging.getLogger(__name__)
+
+
+# Mismo selector de precios que el scraper con Playwright
+PRICE_WRAPPER_CLASS = "platform-price-wrapper-small"
+
+# Cabeceras de un navegador normal
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Códigos de estado que indican bloqueo o límite de peticiones
+BLOCKED_STATUS_CODES = (401, 403, 429, 503)
+
+# Títulos de las páginas de challenge/bloqueo. Solo se mira el <title>: las páginas
+# normales también cargan scripts de Cloudflare (/cdn-cgi/challenge-platform/...)
+BLOCKED_TITLES = (
+    "Just a moment...",
+    "Attention Required!",
+)
+
+TITLE_PATTERN = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+# Elementos HTML sin etiqueta de cierre
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+
+class RatingColumnParser(HTMLParser):
+    """
+    Parser que reúne el texto de cada columna de rating y de sus precios
+
+    Produce las mismas filas que extract_rating_rows en el navegador:
+    {"platform": plataforma, "text": textContent de la columna,
+     "prices": [textContent de cada precio]}
+    """
+
+    def __init__(self, platforms=None, wrapper_class=PRICE_WRAPPER_CLASS, max_prices=None):
+        super().__init__()
+        platforms = platforms if platforms is not None else get_platforms()
+        self.platform_classes = {platform: set(PLATFORM_COLUMN_CLASSES[platform]) for platform in platforms}
+        self.wrapper_class = wrapper_class
+        self.max_prices = max_prices if max_prices is not None else max_prices_needed()
+        self.rows = []
+        self._stack = []
+        self._column = None
+        self._column_depth = None
+        self._wrapper = None
+        self._wrapper_depth = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+
+        self._stack.append(tag)
+        classes = set((dict(attrs).get("class") or "").split())
+
+        if self._column is None:
+            platform = self._column_platform(classes)
+            if platform is not None:
+                self._column = {"platform": platform, "text": [], "prices": []}
+                self._column_depth = len(self._stack)
+        elif self._column is not None and self._wrapper is None and self.wrapper_class in classes:
+            self._wrapper = []
+            self._wrapper_depth = len(self._stack)
+
+    def _column_platform(self, classes):
+        for platform, column_classes in self.platform_classes.items():
+            if column_classes <= classes:
+                return platform
+        return None
+
+    def handle_startendtag(self, tag, attrs):
+        # Como el navegador, "<div/>" abre el elemento igual que "<div>"
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag not in self._stack:
+            return
+
+        # Cerrar también las etiquetas que quedaron abiertas dentro
+        while self._stack:
+            closed = self._stack.pop()
+            self._close_depth(len(self._stack) + 1)
+            if closed == tag:
+                break
+
+    def handle_data(self, data):
+        if self._column is not None:
+            self._column["text"].append(data)
+        if self._wrapper is not None:
+            self._wrapper.append(data)
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._stack.pop()
+            self._close_depth(len(self._stack) + 1)
+
+    def _close_depth(self, depth):
+        if self._wrapper is not None and depth == self._wrapper_depth:
+            self._column["prices"].append("".join(self._wrapper))
+            self._wrapper = None
+            self._wrapper_depth = None
+        if self._column is not None and depth == self._column_depth:
+            self.rows.append({
+                "platform": self._column["platform"],
+                "text": "".join(self._column["text"]),
+                "prices": self._column["prices"][:self.max_prices],
+            })
+            self._column = None
+            self._column_depth = None
+
+
+def parse_rating_rows(html, platforms=None):
+    """
+    Extrae las columnas de rating y sus precios de un HTML
+
+    Args:
+        html (str): HTML de la página de jugadores más baratos
+        platforms (list): Plataformas a leer (por defecto get_platforms())
+
+    Returns:
+        list: Lista de filas {"platform": str, "text": str, "prices": [str, ...]} en orden del documento
+    """
+    parser = RatingColumnParser(platforms)
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+
+def is_blocked_response(status_code, html):
+    """
+    Indica si la respuesta es un bloqueo o un challenge en lugar de la página real
+
+    Se usa después de parsear, cuando el HTML no tiene las columnas de rating: una
+    página con la tabla nunca se considera bloqueada por su contenido.
+
+    Args:
+        status_code (int): Código de estado HTTP
+        html (str): Cuerpo de la respuesta
+
+    Returns:
+        bool: True si la respuesta está bloqueada
+    """
+    if status_code in BLOCKED_STATUS_CODES:
+        return True
+    title = TITLE_PATTERN.search(html)
+    return bool(title) and any(marker in title.group(1) for marker in BLOCKED_TITLES)
+
+
+def parse_cheapest_html(html, ratings, platforms=None, stats=None):
+    """
+    Calcula los precios por plataforma y rating a partir del HTML de la página
+
+    Args:
+        html (str): HTML de la página de jugadores más baratos
+        ratings (list): Ratings a procesar
+        platforms (list): Plataformas a procesar (por defecto get_platforms())
+        stats (dict): Diccionario donde registrar la duración de extracción y parseo
+
+    Returns:
+        dict: {(plataforma, rating): precio}, None si el HTML no tiene la estructura esperada
+    """
+    if platforms is None:
+        platforms = get_platforms()
+
+    with phase(stats, "extraction"):
+        rows = parse_rating_rows(html, platforms)
+    if not rows:
+        return None
+
+    with phase(stats, "parsing"):
+        results = process_platform_rows(rows, platforms, ratings)
+    if all(price is None for price in results.values()):
+        return None
+
+    return results
+
+
+def fetch_cheapest_http(ratings, platforms=None, timeout=15, base_url=FUTBIN_URL, stats=None):
+    """
+    Obtiene los precios por HTTP, sin navegador
+
+    Args:
+        ratings (list): Ratings a procesar
+        platforms (list): Plataformas a procesar (por defecto get_platforms())
+        timeout (float): Timeout de la petición en segundos
+        base_url (str): URL base de FUTBIN (se puede apuntar a un servidor local)
+        stats (dict): Diccionario donde registrar la duración de cada fase ("phases")
+            y el motivo si no se pudo usar ("http_fallback_reason")
+
+    Returns:
+        dict: {(plataforma, rating): precio}, None si hay que usar Playwright
+    """
+    def fallback(reason):
+        logger.warning("Ruta HTTP no disponible: %s", reason)
+        if stats is not None:
+            stats["http_fallback_reason"] = reason
+        return None
+
+    logger.info("Descargando la página por HTTP")
+    try:
+        with phase(stats, "navigation"):
+            response = requests.get(base_url + CHEAPEST_PATH, headers=HTTP_HEADERS, timeout=timeout)
+    except Exception as e:
+        return fallback(f"error de red ({e})")
+
+    if response.status_code in BLOCKED_STATUS_CODES:
+        return fallback(f"respuesta bloqueada (status {response.status_code})")
+
+    if response.status_code != 200:
+        return fallback(f"status {response.status_code}")
+
+    results = parse_cheapest_html(response.text, ratings, platforms, stats)
+    if results is None:
+        if is_blocked_response(response.status_code, response.text):
+            return fallback(f"respuesta bloqueada (status {response.status_code})")
+        return fallback("el HTML no tiene la estructura esperada")
+
+    return results
+
+
+def main():
+    """Parsea un HTML guardado y muestra los precios (para probar sin red)"""
+    if len(sys.argv) < 2:
+        print("Uso: python -m scraping.http_fetcher pagina.html")
+        return 1
+
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        html = f.read()
+
+    ratings = get_ratings()
+    results = parse_cheapest_html(html, ratings)
+    if results is None:
+        if is_blocked_response(200, html):
+            print("[ERROR] El HTML es una página de bloqueo")
+        else:
+            print("[ERROR] El HTML no tiene la estructura esperada")
+        return 1
+
+    for (platform, rating), price in results.items():
+        print(f"{platform.upper()} rating {rating}: {price}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,47 +4,129 @@
 Script principal para ejecutar el scraper de FUTBIN
 """
 
+import os
 import sys
 import json
 import asyncio
+import logging
+from .engine import CHEAPEST_TARGET, load_targets, merge_target_prices
+from .http_fetcher import fetch_cheapest_http
+from .platforms import DEFAULT_SOURCE, get_platforms, split_source_key
+from .ratings_processor import get_ratings
 from .scraper import scrape_futbin_cheapest
+from .sharding import SCRAPER_WORKERS, scrape_sharded
 
 
-async def main():
+logger = logging.getLogger(__name__)
+
+
+async def fetch_prices(ratings, platforms, stats=None, get_browser=None):
+    """
+    Obtiene los precios por HTTP y, si no es posible, con Playwright
+
+    Args:
+        ratings (list): Ratings a procesar
+        platforms (list): Plataformas a procesar
+        stats (dict): Diccionario donde registrar la ruta usada ("path")
+        get_browser (callable): Corrutina que devuelve el navegador a reutilizar; se llama
+            solo si hace falta Playwright (por defecto se lanza uno)
+
+    Returns:
+        dict: {(plataforma, rating): precio}, None si ninguna ruta funcionó
+    """
+    if stats is None:
+        stats = {}
+
+    results = None
+    if os.getenv("SCRAPER_HTTP_FAST_PATH", "1") != "0":
+        results = await asyncio.to_thread(fetch_cheapest_http, ratings, platforms, stats=stats)
+        if results is not None:
+            stats["path"] = "http"
+
+    if results is None:
+        logger.info("Usando Playwright")
+        browser = await get_browser() if get_browser is not None else None
+        results = await scrape_futbin_cheapest(platforms=platforms, stats=stats, browser=browser)
+        stats["path"] = "playwright"
+
+    logger.info("Ruta usada: %s", stats["path"])
+    return results
+
+
+async def fetch_target_prices(targets, platforms, stats=None, get_browser=None):
+    """
+    Obtiene los precios de varias páginas con Playwright, repartidas entre SCRAPER_WORKERS procesos
+
+    Args:
+        targets (list): Targets {"name", "path"}
+        platforms (list): Plataformas a procesar
+        stats (dict): Diccionario donde registrar la ruta usada y las métricas de los workers
+        get_browser (callable): Corrutina que devuelve el navegador a reutilizar; solo se
+            llama con un único worker (con varios, cada uno lanza el suyo)
+
+    Returns:
+        dict: {(target, plataforma, rating): precio}, None si ningún target funcionó
+    """
+    if stats is None:
+        stats = {}
+
+    browser = None
+    if get_browser is not None and min(SCRAPER_WORKERS, len(targets)) <= 1:
+        browser = await get_browser()
+    results = await scrape_sharded(targets, SCRAPER_WORKERS, stats=stats, platforms=platforms, browser=browser)
+    stats["path"] = "playwright"
+    return merge_target_prices(results) or None
+
+
+async def main(stats=None, get_browser=None):
     """
     Función principal asíncrona
+
+    Con SCRAPER_TARGETS_PATH se scrapean todas las páginas configuradas y las claves
+    incluyen el target: (target, plataforma, rating).
+
+    Args:
+        stats (dict): Diccionario opcional donde se registra la ruta usada y las métricas del scraper
+        get_browser (callable): Corrutina que devuelve un navegador ya lanzado a reutilizar
+            (modo daemon); se llama solo si la ejecución necesita Playwright. Por defecto
+            cada ejecución lanza el suyo
+
+    Returns:
+        dict: Precios obtenidos, None si el scraping no pudo completarse
     """
-    print("🚀 Iniciando scraper de FUTBIN con Playwright")
+    print("🚀 Iniciando scraper de FUTBIN")
     print("=" * 50)
     
-    results = await scrape_futbin_cheapest()
+    ratings = get_ratings()
+    platforms = get_platforms()
+    targets = load_targets()
+    if targets == [CHEAPEST_TARGET]:
+        results = await fetch_prices(ratings, platforms, stats, get_browser)
+    else:
+        results = await fetch_target_prices(targets, platforms, stats, get_browser)
     
     if results:
         print("\n✅ Scraping completado exitosamente")
         
         # Mostrar resumen de lo obtenido
-        if isinstance(results, list):
-            print("\n📊 RESUMEN FINAL:")
-            print("=" * 50)
-            ratings = [83, 84, 85, 86, 87, 88, 89, 90]
-            
-            # Preparar diccionario para guardar
-            results_dict = {}
-            for rating, price in zip(ratings, results):
-                if price is not None:
-                    print(f"Rating {rating}: Precio = {price} monedas")
-                    results_dict[rating] = price
-                else:
-                    print(f"Rating {rating}: Sin datos disponibles")
-                    results_dict[rating] = None
-            
-            # Retornar los resultados directamente (sin guardar en archivo)
-            return results_dict
+        print("\n📊 RESUMEN FINAL:")
+        print("=" * 50)
+        
+        for key, price in results.items():
+            source, platform, rating = split_source_key(key)
+            label = platform.upper() if source == DEFAULT_SOURCE else f"{source} {platform.upper()}"
+            if price is not None:
+                print(f"{label} rating {rating}: Precio = {price} monedas")
+            else:
+                print(f"{label} rating {rating}: Sin datos disponibles")
+        
+        # Retornar los resultados directamente (sin guardar en archivo): {(plataforma, rating): precio}
+        return results
     else:
         print("\n❌ El scraping no pudo completarse")
-        sys.exit(1)
+        return None
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    sys.exit(0 if asyncio.run(main()) else 1)
 
@@ -0,0 +1,94 @@
+"""
+Plataformas cuyas columnas de precios se leen de la página de jugadores más baratos
+
+FUTBIN muestra en la misma página una columna por rating y plataforma; las de
+otra plataforma solo se ocultan con CSS (clases hide-not-ps / hide-not-pc), así
+que todas se pueden leer en una sola visita. PlayStation y Xbox comparten el
+mercado de consola y por eso tienen una única columna ("ps").
+"""
+
+import os
+
+
+# Clases de la columna de rating de cada plataforma
+PLATFORM_COLUMN_CLASSES = {
+    "ps": ("stc-player-column", "xs-column", "hide-not-ps"),
+    "pc": ("stc-player-column", "xs-column", "hide-not-pc"),
+}
+
+# Plataforma por defecto, y la de los datos guardados antes de separar por plataforma
+DEFAULT_PLATFORM = "ps"
+
+# Origen de los precios de la página de jugadores más baratos (nombre de su target)
+DEFAULT_SOURCE = "cheapest"
+
+
+def column_selector(platform):
+    """
+    Selector CSS de las columnas de rating de una plataforma
+
+    Args:
+        platform (str): Nombre de la plataforma ("ps", "pc")
+
+    Returns:
+        str: Selector CSS (ej: ".stc-player-column.xs-column.hide-not-ps")
+    """
+    return "".join(f".{css_class}" for css_class in PLATFORM_COLUMN_CLASSES[platform])
+
+
+def get_platforms(value=None):
+    """
+    Devuelve las plataformas a scrapear
+
+    Args:
+        value (str): Lista separada por comas; por defecto SCRAPER_PLATFORMS o solo
+            DEFAULT_PLATFORM (leer varias plataformas es opcional)
+
+    Returns:
+        list: Plataformas en el orden indicado
+    """
+    value = value if value is not None else os.getenv("SCRAPER_PLATFORMS", "")
+    platforms = [platform.strip().lower() for platform in value.split(",") if platform.strip()]
+    if not platforms:
+        return [DEFAULT_PLATFORM]
+
+    unknown = [platform for platform in platforms if platform not in PLATFORM_COLUMN_CLASSES]
+    if unknown:
+        raise ValueError(f"Plataformas desconocidas: {', '.join(unknown)}")
+    return platforms
+
+
+def split_price_key(key):
+    """
+    Separa una clave de precios en (plataforma, rating)
+
+    Las claves son (plataforma, rating), o (origen, plataforma, rating) con varios
+    targets; un rating solo (datos anteriores a la separación por plataforma) se
+    asigna a DEFAULT_PLATFORM.
+
+    Args:
+        key: Tupla (plataforma, rating), (origen, plataforma, rating) o rating
+
+    Returns:
+        tuple: (plataforma, rating)
+    """
+    return split_source_key(key)[1:]
+
+
+def split_source_key(key):
+    """
+    Separa una clave de precios en (origen, plataforma, rating)
+
+    Las claves sin origen son de la página de jugadores más baratos (DEFAULT_SOURCE).
+
+    Args:
+        key: Tupla (origen, plataforma, rating), (plataforma, rating) o rating
+
+    Returns:
+        tuple: (origen, plataforma, rating)
+    """
+    if isinstance(key, (tuple, list)):
+        if len(key) == 3:
+            return key[0], key[1], key[2]
+        return DEFAULT_SOURCE, key[0], key[1]
+    return DEFAULT_SOURCE, DEFAULT_PLATFORM, key
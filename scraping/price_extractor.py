@@ -2,63 +2,154 @@
 Módulo para extraer valores numéricos de precios en diferentes formatos
 """
 
+import logging
 import re
+from decimal import Decimal
+from functools import lru_cache
 
 
-def extract_price_value(text):
+logger = logging.getLogger(__name__)
+
+# Número (con todos sus separadores) seguido de un sufijo multiplicador: 15k, 15.5K, 1,234.5K, 1,2M
+# La "m" no puede ir seguida de otra letra para no confundirla con palabras ("15 min")
+SUFFIX_PATTERN = re.compile(r'(\d[\d.,]*)\s*(?:([kK])|([mM])(?![a-zA-Z]))')
+
+# Número con separadores en cualquier posición
+NUMBER_PATTERN = re.compile(r'\d[\d.,]*')
+
+# Multiplicador de cada sufijo
+SUFFIX_MULTIPLIERS = {"k": 1000, "m": 1000000}
+
+# Reglas de separadores por locale. "auto" deduce los separadores de cada texto:
+# con sufijo, el último separador es el decimal (15.5K, 1.234,5K); sin sufijo, "." o
+# "," separan miles (1,500, 1.500.000) porque un precio sin sufijo es entero.
+PRICE_LOCALES = {
+    "auto": None,
+    "en": {"thousands": ",", "decimal": "."},
+    "es": {"thousands": ".", "decimal": ","},
+    "de": {"thousands": ".", "decimal": ","},
+}
+
+# Reglas del modo automático para números sin sufijo, según su separador
+AUTO_INTEGER_RULES = {
+    ",": {"thousands": ",", "decimal": None},
+    ".": {"thousands": ".", "decimal": None},
+}
+
+
+@lru_cache(maxsize=None)
+def _number_format(thousands, decimal):
+    """Expresión de un número válido: miles agrupados de a tres o sin agrupar, y decimales opcionales"""
+    fraction = f"(?:{re.escape(decimal)}\\d+)?" if decimal else ""
+    return re.compile(f"\\d{{1,3}}(?:{re.escape(thousands)}\\d{{3}})+{fraction}|\\d+{fraction}")
+
+
+def _auto_rules(value_str, multiplier):
+    """Separadores del modo automático para un número"""
+    if multiplier == 1:
+        # Con los dos separadores ninguna de las dos reglas lo acepta
+        return AUTO_INTEGER_RULES["." if "." in value_str else ","]
+    return PRICE_LOCALES["es" if value_str.rfind(",") > value_str.rfind(".") else "en"]
+
+
+def _to_number(value_str, rules):
+    """
+    Convierte un número con separadores según las reglas del locale
+
+    Returns:
+        int | Decimal: Valor (Decimal si tiene decimales), None si el texto no respeta las reglas
+    """
+    if not _number_format(rules["thousands"], rules["decimal"]).fullmatch(value_str):
+        return None
+    digits = value_str.replace(rules["thousands"], "")
+    if rules["decimal"] and rules["decimal"] in digits:
+        return Decimal(digits.replace(rules["decimal"], "."))
+    return int(digits)
+
+
+def _parse_price(text, rules):
+    """
+    Interpreta un texto de precio
+
+    Args:
+        text (str): Texto que contiene el precio
+        rules (dict): Separadores del locale, None para el modo automático
+
+    Returns:
+        tuple: (valor, None) si se pudo extraer, (None, motivo) si no
+    """
+    if not text or not isinstance(text, str):
+        return None, "texto vacío o inválido"
+
+    # Primero buscar si hay un número seguido de 'k' o 'M'
+    match = SUFFIX_PATTERN.search(text)
+    if match:
+        value_str = match.group(1)
+        multiplier = SUFFIX_MULTIPLIERS["k" if match.group(2) else "m"]
+    else:
+        match = NUMBER_PATTERN.search(text)
+        if not match:
+            return None, "no contiene números"
+        value_str = match.group(0)
+        multiplier = 1
+
+    # Quitar separadores finales ("1.500," en una lista) antes de convertir
+    value_str = value_str.rstrip(".,")
+    value = _to_number(value_str, rules or _auto_rules(value_str, multiplier))
+    if value is None:
+        return None, f"número inválido para el locale: '{value_str}'"
+
+    value *= multiplier
+    if isinstance(value, Decimal):
+        if value != value.to_integral_value():
+            return None, f"no es un precio entero: '{match.group(0).strip()}'"
+        value = int(value)
+    return value, None
+
+
+def _locale_rules(locale):
+    if locale not in PRICE_LOCALES:
+        raise ValueError(f"Locale de precios desconocido: {locale}")
+    return PRICE_LOCALES[locale]
+
+
+def extract_price_value(text, locale="auto"):
     """
     Extrae un valor numérico del texto (típicamente un precio en coins)
-    Maneja valores con 'k' (ej: 15k = 15000, 15.5k = 15500)
-    
+    Maneja valores con 'k' y 'M' (ej: 15k = 15000, 15.5k = 15500, 1.2M = 1200000)
+
     Args:
         text (str): Texto que contiene el precio
-        
+        locale (str): Reglas de separadores ("auto", "en", "es", "de")
+
     Returns:
         int: Valor numérico extraído, None si no se puede extraer
     """
-    if not text or not isinstance(text, str):
-        print(f"    ⚠️ Texto inválido para extraer: {text}")
-        return None
-    
-    # Primero buscar si hay un número seguido de 'k' o 'K'
-    k_pattern = re.search(r'(\d+(?:[.,]\d+)?)\s*[kK]', text)
-    if k_pattern:
-        value_str = k_pattern.group(1)
-        try:
-            # Si tiene punto o coma, es decimal: 15.5k = 15500
-            if '.' in value_str or ',' in value_str:
-                value_float = float(value_str.replace(',', '.'))
-                result = int(value_float * 1000)
-                print(f"    ✓ Extraído con formato 'k' decimal: {value_str}k = {result}")
-                return result
-            else:
-                # Si es entero: 15k = 15000
-                result = int(value_str) * 1000
-                print(f"    ✓ Extraído con formato 'k' entero: {value_str}k = {result}")
-                return result
-        except Exception as e:
-            print(f"    ⚠️ Error al convertir valor con 'k': {e}")
-            return None
-    
-    # Si no hay 'k', buscar números normales
-    # Buscar números con formato de miles (ej: 1,500, 1.500, 1500)
-    numbers = re.findall(r'(\d{1,3}(?:[.,]\d{3})+)', text)
-    if not numbers:
-        # Si no encuentra formato de miles, buscar cualquier número
-        numbers = re.findall(r'\d+', text)
-    
-    if numbers:
-        # Tomar el primer número encontrado y limpiar separadores de miles
-        original_number = numbers[0]
-        value = original_number.replace(',', '').replace('.', '')
-        try:
-            result = int(value)
-            print(f"    ✓ Extraído como número normal: '{original_number}' = {result}")
-            return result
-        except Exception as e:
-            print(f"    ⚠️ Error al convertir número: {e}")
-            return None
-    
-    print(f"    ❌ No se pudo extraer ningún valor de: '{text}'")
-    return None
+    value, reason = _parse_price(text, _locale_rules(locale))
+    if reason:
+        logger.debug("No se pudo extraer ningún valor de %r: %s", text, reason)
+    return value
+
+
+def extract_price_values(texts, locale="auto"):
+    """
+    Extrae los valores numéricos de una lista de textos de precios
 
+    No escribe en el log: el motivo de cada fallo se devuelve al llamador.
+
+    Args:
+        texts (list): Textos que contienen precios
+        locale (str): Reglas de separadores ("auto", "en", "es", "de")
+
+    Returns:
+        tuple: (values, reasons), una entrada por texto: el valor (None si falló) y
+            el motivo del fallo (None si se pudo extraer)
+    """
+    rules = _locale_rules(locale)
+    values = []
+    reasons = []
+    for text in texts:
+        value, reason = _parse_price(text, rules)
+        values.append(value)
+        reasons.append(reason)
+    return values, reasons
@@ -1,59 +1,258 @@
 """
 Módulo para procesar los valores extraídos según el rating
+
+Qué precio de cada columna se toma para cada rating se define en una tabla de
+reglas (scraping/rating_rules.json, o el JSON indicado en RATING_RULES_PATH):
+
+    {
+      "ratings": {"from": 83, "to": 90},          # o una lista: [83, 84, 90]
+      "default": {"rule": "index", "index": 4},
+      "rules": {"90": {"rule": "index", "index": 0}}
+    }
+
+Reglas disponibles:
+    {"rule": "index", "index": N}   -> el precio en la posición N
+    {"rule": "min", "first": N}     -> el mínimo de los primeros N precios
+    {"rule": "median", "first": N}  -> la mediana (baja) de los primeros N precios
 """
 
+import json
+import logging
+import os
+import re
+import statistics
+from functools import lru_cache
+from .price_extractor import extract_price_values
+
+
+logger = logging.getLogger(__name__)
+
+# Tabla de reglas por defecto
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rating_rules.json")
+
+# Números sueltos en el texto de una columna (mismo criterio que \b{rating}\b)
+RATING_TOKEN_PATTERN = re.compile(r'\b\d+\b')
+
+
+def _validate_rule(rule):
+    """Comprueba que una regla tenga un tipo conocido y sus parámetros"""
+    kind = rule.get("rule")
+    if kind == "index":
+        if not isinstance(rule.get("index"), int) or rule["index"] < 0:
+            raise ValueError(f"Regla 'index' sin un índice válido: {rule}")
+    elif kind in ("min", "median"):
+        if not isinstance(rule.get("first"), int) or rule["first"] < 1:
+            raise ValueError(f"Regla '{kind}' sin un 'first' válido: {rule}")
+    else:
+        raise ValueError(f"Regla desconocida: {rule}")
+    return rule
+
+
+def load_rating_rules(path=None):
+    """
+    Carga la tabla de reglas por rating
+
+    RATING_RULES_PATH se lee en cada llamada; la tabla se lee del disco una vez por ruta.
+
+    Args:
+        path (str): Ruta del JSON; por defecto RATING_RULES_PATH o scraping/rating_rules.json
+
+    Returns:
+        dict: {"ratings": [int, ...], "rules": {rating: regla}}
+    """
+    return _load_rules_file(path or os.getenv("RATING_RULES_PATH") or DEFAULT_RULES_PATH)
+
+
+@lru_cache(maxsize=None)
+def _load_rules_file(path):
+    """Lee y valida la tabla de reglas de un archivo"""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    ratings = config["ratings"]
+    if isinstance(ratings, dict):
+        ratings = list(range(ratings["from"], ratings["to"] + 1))
+    ratings = sorted(int(rating) for rating in ratings)
+
+    default = _validate_rule(config["default"])
+    overrides = {int(rating): _validate_rule(rule) for rating, rule in config.get("rules", {}).items()}
+
+    return {
+        "ratings": ratings,
+        "rules": {rating: overrides.get(rating, default) for rating in ratings},
+    }
+
+
+def get_ratings(rules=None):
+    """
+    Devuelve los ratings configurados
+
+    Args:
+        rules (dict): Tabla de reglas (por defecto la configurada)
+
+    Returns:
+        list: Ratings en orden ascendente
+    """
+    return list((rules or load_rating_rules())["ratings"])
+
+
+def max_prices_needed(rules=None):
+    """
+    Cantidad de precios por columna que necesitan las reglas
+
+    Args:
+        rules (dict): Tabla de reglas (por defecto la configurada)
+
+    Returns:
+        int: Máximo de precios que hay que leer de una columna
+    """
+    rules = rules or load_rating_rules()
+    return max(
+        (rule["index"] + 1 if rule["rule"] == "index" else rule["first"])
+        for rule in rules["rules"].values()
+    )
+
+
+def apply_rule(rule, all_prices_values):
+    """
+    Aplica una regla a los valores de una columna
+
+    Args:
+        rule (dict): Regla de selección
+        all_prices_values (list): Valores extraídos (None donde no se pudo)
+
+    Returns:
+        int: Precio seleccionado, None si no hay valores suficientes
+    """
+    if rule["rule"] == "index":
+        index = rule["index"]
+        if len(all_prices_values) > index:
+            return all_prices_values[index]
+        return None
+
+    values = [value for value in all_prices_values[:rule["first"]] if value is not None]
+    if not values:
+        return None
+    if rule["rule"] == "min":
+        return min(values)
+    # Mediana baja: siempre es uno de los precios publicados
+    return statistics.median_low(values)
 
-def calculate_price_for_rating(rating, all_prices_values):
+
+def calculate_price_for_rating(rating, all_prices_values, rules=None):
     """
     Calcula el precio resultante según las reglas específicas del rating
-    
+
     Args:
         rating (int): El rating a procesar
         all_prices_values (list): Lista de valores extraídos
-        
+        rules (dict): Tabla de reglas (por defecto la configurada)
+
     Returns:
         int: Precio calculado, None si no se pudo calcular
     """
-    print(f"  🧮 Calculando precio para rating {rating}...")
-    print(f"  📥 Valores recibidos: {all_prices_values}")
-    
-    if rating == 90:
-        # Para rating 90: primer elemento (índice 0)
-        print(f"  ⚙️ Regla para rating 90: usar el primer elemento (índice 0)")
-        if len(all_prices_values) > 0 and all_prices_values[0] is not None:
-            print(f"  ✅ Valor encontrado: {all_prices_values[0]}")
-            return all_prices_values[0]
-        else:
-            print(f"  ❌ Primer elemento no disponible")
-            return None
-            
-    elif rating == 89:
-        # Para rating 89: tercer elemento (índice 2)
-        print(f"  ⚙️ Regla para rating 89: usar el tercer elemento (índice 2)")
-        if len(all_prices_values) > 2 and all_prices_values[2] is not None:
-            print(f"  ✅ Valor encontrado: {all_prices_values[2]}")
-            return all_prices_values[2]
-        else:
-            print(f"  ❌ Tercer elemento no disponible")
-            return None
-            
-    elif rating == 88:
-        # Para rating 88: cuarto elemento (índice 3)
-        print(f"  ⚙️ Regla para rating 88: usar el cuarto elemento (índice 3)")
-        if len(all_prices_values) > 3 and all_prices_values[3] is not None:
-            print(f"  ✅ Valor encontrado: {all_prices_values[3]}")
-            return all_prices_values[3]
-        else:
-            print(f"  ❌ Cuarto elemento no disponible")
-            return None
-            
-    else:
-        # Para el resto (83-87): quinto elemento (índice 4)
-        print(f"  ⚙️ Regla para rating {rating}: usar el quinto elemento (índice 4)")
-        if len(all_prices_values) > 4 and all_prices_values[4] is not None:
-            print(f"  ✅ Valor encontrado: {all_prices_values[4]}")
-            return all_prices_values[4]
-        else:
-            print(f"  ❌ Quinto elemento no disponible")
-            return None
+    rules = rules or load_rating_rules()
+    rule = rules["rules"].get(rating)
+    if rule is None:
+        logger.warning("No hay regla configurada para el rating %d", rating)
+        return None
+
+    price = apply_rule(rule, all_prices_values)
+    logger.debug("Rating %d: regla %s sobre %s -> %s", rating, rule, all_prices_values, price)
+    return price
+
+
+def process_rating_rows(rows, ratings=None, rules=None):
+    """
+    Calcula el precio de cada rating a partir de las filas extraídas, en una sola pasada
+
+    Para cada rating se toma la columna cuyo primer número (el título de la columna)
+    es el rating. Si ninguna columna tiene un rating como título, se usa la regla
+    del recorrido elemento por elemento: la primera columna cuyo texto contiene el
+    rating como palabra completa. Así, con rangos amplios, un precio como "1.75K"
+    no hace coincidir el rating 75.
+
+    Args:
+        rows (list): Filas {"text": str, "prices": [str, ...]} en orden del documento
+        ratings (list): Ratings a procesar (por defecto los de la tabla de reglas)
+        rules (dict): Tabla de reglas (por defecto la configurada)
+
+    Returns:
+        list: Lista de precios en el mismo orden que ratings (None si no hay datos)
+    """
+    rules = rules or load_rating_rules()
+    if ratings is None:
+        ratings = rules["ratings"]
+    wanted = {str(rating): rating for rating in ratings}
+    limit = max_prices_needed(rules)
+
+    # Columna cuyo título es el rating y, para los ratings sin título, primera columna que lo contiene
+    rows_by_title = {}
+    rows_by_text = {}
+    for row in rows:
+        text = row.get("text")
+        if not text:
+            continue
+        tokens = RATING_TOKEN_PATTERN.findall(text.strip())
+        if tokens and tokens[0] in wanted:
+            rows_by_title.setdefault(wanted[tokens[0]], row)
+        for token in tokens:
+            rating = wanted.get(token)
+            if rating is not None and rating not in rows_by_text:
+                rows_by_text[rating] = row
+
+    rows_by_rating = {**rows_by_text, **rows_by_title}
+
+    all_results = []
+    for rating in ratings:
+        target_row = rows_by_rating.get(rating)
+        if target_row is None:
+            logger.warning("No se encontró ningún elemento con rating %d", rating)
+            all_results.append(None)
+            continue
+
+        prices_text = target_row.get("prices") or []
+        if not prices_text:
+            logger.warning("No se encontró ningún elemento 'platform-price-wrapper-small' para rating %d", rating)
+            all_results.append(None)
+            continue
+
+        all_prices_values, reasons = extract_price_values(prices_text[:limit])
+        failures = {index: reason for index, reason in enumerate(reasons) if reason}
+        if failures:
+            logger.debug("Rating %d: precios sin interpretar %s", rating, failures)
+        all_results.append(calculate_price_for_rating(rating, all_prices_values, rules))
+
+    return all_results
+
+
+def process_platform_rows(rows, platforms, ratings=None, rules=None):
+    """
+    Calcula el precio de cada (plataforma, rating) a partir de las filas de todas las plataformas
+
+    Args:
+        rows (list): Filas {"platform": str, "text": str, "prices": [str, ...]} en orden del documento
+        platforms (list): Plataformas a procesar
+        ratings (list): Ratings a procesar (por defecto los de la tabla de reglas)
+        rules (dict): Tabla de reglas (por defecto la configurada)
+
+    Returns:
+        dict: {(plataforma, rating): precio} con None donde no hay datos
+    """
+    rules = rules or load_rating_rules()
+    if ratings is None:
+        ratings = rules["ratings"]
+
+    rows_by_platform = {platform: [] for platform in platforms}
+    for row in rows:
+        if row.get("platform") in rows_by_platform:
+            rows_by_platform[row["platform"]].append(row)
 
+    results = {}
+    for platform, platform_rows in rows_by_platform.items():
+        if not platform_rows:
+            logger.warning("No se encontraron columnas de la plataforma %s", platform)
+        prices = process_rating_rows(platform_rows, ratings, rules) if platform_rows else [None] * len(ratings)
+        for rating, price in zip(ratings, prices):
+            results[(platform, rating)] = price
+    return results
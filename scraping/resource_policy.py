@@ -0,0 +1,180 @@
+"""
+Módulo para bloquear recursos pesados (imágenes, fuentes, anuncios, analítica) durante el scraping
+"""
+
+import json
+import os
+from urllib.parse import urlparse
+
+
+# Política por defecto: solo se lee texto de una tabla, así que no hace falta
+# descargar imágenes, vídeos, fuentes ni scripts de anuncios o analítica.
+DEFAULT_RESOURCE_POLICY = {
+    # Tipos que nunca se bloquean (el documento principal siempre debe cargar)
+    "allow_types": ["document"],
+    # Dominios que nunca se bloquean (ej: el challenge de Cloudflare)
+    "allow_domains": ["challenges.cloudflare.com"],
+    # Tipos de recurso que se bloquean
+    "block_types": ["image", "media", "font"],
+    # Dominios que se bloquean (incluye sus subdominios)
+    "block_domains": [
+        "doubleclick.net",
+        "googlesyndication.com",
+        "googletagservices.com",
+        "googletagmanager.com",
+        "google-analytics.com",
+        "adservice.google.com",
+        "amazon-adsystem.com",
+        "adnxs.com",
+        "criteo.com",
+        "criteo.net",
+        "pubmatic.com",
+        "rubiconproject.com",
+        "taboola.com",
+        "outbrain.com",
+        "scorecardresearch.com",
+        "quantserve.com",
+        "facebook.net",
+        "hotjar.com",
+        "cloudflareinsights.com",
+    ],
+}
+
+
+def load_resource_policy(value=None):
+    """
+    Carga la política de recursos a usar
+
+    Args:
+        value (str): "default", "off" o ruta a un JSON con las claves de
+            DEFAULT_RESOURCE_POLICY. Si es None se lee SCRAPER_RESOURCE_POLICY.
+
+    Returns:
+        dict: Política de recursos, None si el bloqueo está desactivado
+    """
+    if value is None:
+        value = os.getenv("SCRAPER_RESOURCE_POLICY", "default")
+
+    if value == "off":
+        return None
+
+    policy = {key: list(items) for key, items in DEFAULT_RESOURCE_POLICY.items()}
+
+    if value != "default":
+        with open(value, "r", encoding="utf-8") as f:
+            policy.update(json.load(f))
+
+    return policy
+
+
+def _matches_domain(host, domains):
+    """Indica si el host es alguno de los dominios o un subdominio de ellos"""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+def classify_request(url, resource_type, policy):
+    """
+    Decide si una petición se bloquea según la política
+
+    Las listas de permitidos tienen prioridad sobre las de bloqueados.
+
+    Args:
+        url (str): URL de la petición
+        resource_type (str): Tipo de recurso de Playwright (image, script, font, ...)
+        policy (dict): Política de recursos
+
+    Returns:
+        str: Motivo del bloqueo ("type:image", "domain:doubleclick.net"), None si se permite
+    """
+    host = (urlparse(url).hostname or "").lower()
+
+    if resource_type in policy.get("allow_types", []):
+        return None
+    if _matches_domain(host, policy.get("allow_domains", [])):
+        return None
+
+    if resource_type in policy.get("block_types", []):
+        return f"type:{resource_type}"
+
+    for domain in policy.get("block_domains", []):
+        if host == domain or host.endswith("." + domain):
+            return f"domain:{domain}"
+
+    return None
+
+
+def new_resource_stats():
+    """Crea el diccionario de contadores de recursos de una ejecución"""
+    return {
+        "blocked_requests": 0,
+        "blocked_by_reason": {},
+        "allowed_requests": 0,
+        "loaded_bytes": 0,
+    }
+
+
+async def install_resource_policy(context, policy, stats=None):
+    """
+    Instala la política de recursos en un contexto de Playwright
+
+    Las peticiones bloqueadas se abortan antes de salir del navegador, por lo que
+    su tamaño no se puede conocer: se cuentan por motivo, y de las permitidas se
+    suman los bytes realmente descargados.
+
+    Args:
+        context: BrowserContext de Playwright
+        policy (dict): Política de recursos
+        stats (dict): Diccionario donde guardar los contadores en stats["resources"]
+
+    Returns:
+        dict: Contadores de la ejecución (se actualizan mientras se navega)
+    """
+    counters = new_resource_stats()
+    if stats is not None:
+        stats["resources"] = counters
+
+    async def handle_route(route):
+        request = route.request
+        reason = classify_request(request.url, request.resource_type, policy)
+        if reason:
+            counters["blocked_requests"] += 1
+            counters["blocked_by_reason"][reason] = counters["blocked_by_reason"].get(reason, 0) + 1
+            await route.abort()
+        else:
+            counters["allowed_requests"] += 1
+            await route.continue_()
+
+    async def handle_request_finished(request):
+        try:
+            sizes = await request.sizes()
+            counters["loaded_bytes"] += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+        except Exception:
+            # La página pudo cerrarse antes de leer los tamaños
+            pass
+
+    await context.route("**/*", handle_route)
+    context.on("requestfinished", handle_request_finished)
+
+    return counters
+
+
+def format_resource_stats(counters):
+    """
+    Formatea los contadores de recursos para el log
+
+    Args:
+        counters (dict): Contadores devueltos por install_resource_policy
+
+    Returns:
+        str: Resumen legible de peticiones bloqueadas y bytes descargados
+    """
+    reasons = ", ".join(
+        f"{reason}: {count}"
+        for reason, count in sorted(counters["blocked_by_reason"].items(), key=lambda item: -item[1])
+    )
+    loaded_kb = counters["loaded_bytes"] / 1024
+    text = (f"{counters['blocked_requests']} peticiones bloqueadas, "
+            f"{counters['allowed_requests']} permitidas ({loaded_kb:.1f} KB descargados)")
+    if reasons:
+        text += f" [{reasons}]"
+    return text
@@ -2,234 +2,524 @@
 Módulo principal de scraping para FUTBIN
 """
 
-from playwright.async_api import async_playwright
-import asyncio
+import logging
+import os
 import re
+import time
 from .price_extractor import extract_price_value
-from .ratings_processor import calculate_price_for_rating
+from .platforms import column_selector
+from .ratings_processor import calculate_price_for_rating, process_platform_rows, max_prices_needed
+from .resource_policy import load_resource_policy, install_resource_policy
+from .session_state import SESSION_STATE_PATH
+from monitoring.monitoring import phase, record_phase
 
 
-async def scrape_futbin_cheapest(headless=True):
+logger = logging.getLogger(__name__)
+
+
+# URLs de FUTBIN
+FUTBIN_URL = "https://www.futbin.com"
+CHEAPEST_PATH = "/squad-building-challenges/cheapest"
+
+# Selector de los precios dentro de cada columna de rating
+PRICE_WRAPPER_SELECTOR = ".platform-price-wrapper-small"
+
+# Tiempo máximo de espera a que la tabla de precios esté lista (milisegundos)
+READY_TIMEOUT_MS = int(os.getenv("SCRAPER_READY_TIMEOUT_MS", "15000"))
+
+# Tiempo que la tabla debe permanecer sin cambios para considerarse estable (milisegundos)
+READY_STABLE_MS = int(os.getenv("SCRAPER_READY_STABLE_MS", "500"))
+
+# Script que indica si las columnas y sus precios están cargados y estables.
+# Guarda en window la última firma vista y desde cuándo no cambia.
+READY_SCRIPT = """
+([selector, wrapperSelector, stableMs]) => {
+    const columns = document.querySelectorAll(selector);
+    if (!columns.length) {
+        return false;
+    }
+    let wrappers = 0;
+    let filled = 0;
+    let length = 0;
+    for (const column of columns) {
+        for (const wrapper of column.querySelectorAll(wrapperSelector)) {
+            const text = wrapper.textContent || "";
+            wrappers += 1;
+            length += text.length;
+            if (/\\d/.test(text)) {
+                filled += 1;
+            }
+        }
+    }
+    if (!filled) {
+        return false;
+    }
+    const signature = `${columns.length}:${wrappers}:${filled}:${length}`;
+    const now = performance.now();
+    const state = window.__futbinReady;
+    if (!state || state.signature !== signature) {
+        window.__futbinReady = { signature, since: now };
+        return false;
+    }
+    return now - state.since >= stableMs;
+}
+"""
+
+# Script que devuelve las columnas de todas las plataformas y sus precios en una sola llamada
+EXTRACT_ROWS_SCRIPT = """
+([platformSelectors, wrapperSelector, maxPrices]) => platformSelectors.flatMap(
+    ([platform, selector]) => Array.from(
+        document.querySelectorAll(selector),
+        (column) => ({
+            platform,
+            text: column.textContent,
+            prices: Array.from(column.querySelectorAll(wrapperSelector))
+                .slice(0, maxPrices)
+                .map((wrapper) => wrapper.textContent),
+        })
+    )
+)
+"""
+
+
+async def timed_wait(name, awaitable, stats=None):
     """
-    Scrapea la página de jugadores más baratos de FUTBIN usando Playwright
-    
+    Espera una condición de carga y registra cuánto tardó
+
+    Un timeout no se considera error: se registra y el scraping continúa con
+    lo que haya en la página.
+
     Args:
-        headless (bool): Si ejecutar el navegador en modo headless (sin ventana visible)
-    
+        name (str): Nombre de la espera (para el registro)
+        awaitable: Corrutina de Playwright que espera la condición
+        stats (dict): Diccionario donde acumular las esperas en stats["waits"]
+
     Returns:
-        list: Lista de 8 valores de precios [rating83, rating84, ..., rating90]
+        bool: True si la condición se cumplió, False si se agotó el tiempo
     """
+    start = time.perf_counter()
+    ready = True
     try:
-        print("🔄 Iniciando navegador...")
-        async with async_playwright() as p:
-            # Configuración más robusta del navegador
-            browser = await p.chromium.launch(
-                headless=headless,
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor'
-                ]
-            )
-            
-            # Crear contexto con configuración de timeout más larga
-            context = await browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            )
-            
-            page = await context.new_page()
-            
-            # Configurar timeouts más largos
-            page.set_default_timeout(60000)  # 60 segundos
-            page.set_default_navigation_timeout(60000)  # 60 segundos
-            
-            print("🌐 Navegando a futbin.com...")
-            try:
-                await page.goto("https://www.futbin.com", wait_until="domcontentloaded", timeout=60000)
-                await asyncio.sleep(3)
-            except Exception as e:
-                print(f"⚠️ Error al cargar futbin.com: {e}")
-                print("🔄 Intentando con timeout más corto...")
-                await page.goto("https://www.futbin.com", timeout=30000)
-                await asyncio.sleep(2)
-            
-            # Navegar a la página específica
-            print("🔗 Navegando a la página de jugadores más baratos...")
-            try:
-                await page.goto("https://www.futbin.com/squad-building-challenges/cheapest", wait_until="domcontentloaded", timeout=60000)
-                await asyncio.sleep(5)  # Esperar más tiempo para que cargue completamente
-            except Exception as e:
-                print(f"⚠️ Error al cargar la página de cheapest: {e}")
-                print("🔄 Intentando con timeout más corto...")
-                await page.goto("https://www.futbin.com/squad-building-challenges/cheapest", timeout=30000)
-                await asyncio.sleep(3)
-            
-            # Selector específico para el player column not ps
-            selector = ".stc-player-column.xs-column.hide-not-ps"
-            
-            # Ratings a buscar: 83, 84, 85, 86, 87, 88, 89, 90
-            ratings = [83, 84, 85, 86, 87, 88, 89, 90]
-            
-            print(f"🔍 Buscando player column not ps para ratings {ratings}...")
-            print(f"Selector: {selector}")
-            
-            # Verificar que la página cargó correctamente
+        await awaitable
+    except Exception as e:
+        ready = False
+        logger.warning("Espera '%s' sin completar: %s", name, e)
+
+    elapsed = time.perf_counter() - start
+    logger.info("Espera '%s': %.2fs (%s)", name, elapsed, "lista" if ready else "timeout")
+    record_phase(stats, "wait", elapsed)
+
+    if stats is not None:
+        stats.setdefault("waits", []).append({
+            "name": name,
+            "seconds": round(elapsed, 3),
+            "ready": ready,
+        })
+
+    return ready
+
+
+async def wait_for_price_table(page, platforms, timeout_ms=READY_TIMEOUT_MS, stable_ms=READY_STABLE_MS, stats=None):
+    """
+    Espera a que las columnas de rating tengan precios cargados y estables
+
+    Args:
+        page: Página de Playwright
+        platforms (list): Plataformas cuyas columnas se esperan
+        timeout_ms (int): Tiempo máximo de espera en milisegundos
+        stable_ms (int): Tiempo sin cambios necesario para considerar la tabla estable
+        stats (dict): Diccionario donde registrar la duración de la espera
+
+    Returns:
+        bool: True si la tabla quedó lista, False si se agotó el tiempo
+    """
+    selector = ", ".join(column_selector(platform) for platform in platforms)
+    return await timed_wait(
+        "price_table",
+        page.wait_for_function(
+            READY_SCRIPT,
+            arg=[selector, PRICE_WRAPPER_SELECTOR, stable_ms],
+            polling=100,
+            timeout=timeout_ms,
+        ),
+        stats,
+    )
+
+
+async def warm_up(page, base_url=FUTBIN_URL, ready_timeout_ms=READY_TIMEOUT_MS, stats=None):
+    """
+    Visita la portada de FUTBIN para obtener las cookies iniciales
+
+    Args:
+        page: Página de Playwright
+        base_url (str): URL de la portada
+        ready_timeout_ms (int): Tiempo máximo de espera de la carga en milisegundos
+        stats (dict): Diccionario donde registrar la duración de la navegación y la espera
+    """
+    logger.info("Navegando a futbin.com")
+    with phase(stats, "navigation"):
+        try:
+            await page.goto(base_url, wait_until="domcontentloaded", timeout=60000)
+        except Exception as e:
+            logger.warning("Error al cargar futbin.com, reintentando con timeout más corto: %s", e)
+            await page.goto(base_url, timeout=30000)
+
+    # Esperar a que termine la carga (cookies y scripts iniciales), sin pausa fija
+    await timed_wait("homepage", page.wait_for_load_state("load", timeout=ready_timeout_ms), stats)
+
+
+async def goto_path(page, path, base_url=FUTBIN_URL, stats=None):
+    """
+    Navega a una página de FUTBIN
+
+    Args:
+        page: Página de Playwright
+        path (str): Ruta de la página (ej: CHEAPEST_PATH)
+        base_url (str): URL base de FUTBIN
+        stats (dict): Diccionario donde registrar la duración de la navegación
+    """
+    url = base_url + path
+    logger.info("Navegando a %s", path)
+    with phase(stats, "navigation"):
+        try:
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        except Exception as e:
+            logger.warning("Error al cargar %s, reintentando con timeout más corto: %s", path, e)
+            await page.goto(url, timeout=30000)
+
+
+async def goto_cheapest(page, base_url=FUTBIN_URL, stats=None):
+    """
+    Navega a la página de jugadores más baratos
+
+    Args:
+        page: Página de Playwright
+        base_url (str): URL base de FUTBIN
+        stats (dict): Diccionario donde registrar la duración de la navegación
+    """
+    await goto_path(page, CHEAPEST_PATH, base_url, stats)
+
+
+async def extract_rating_rows(page, platforms, max_prices=None):
+    """
+    Extrae las columnas de rating de todas las plataformas y sus precios con un único page.evaluate
+
+    Args:
+        page: Página de Playwright ya cargada
+        platforms (list): Plataformas cuyas columnas se leen
+        max_prices (int): Cantidad máxima de precios a leer por columna (por defecto
+            la que necesitan las reglas de rating)
+
+    Returns:
+        list: Lista de filas {"platform": str, "text": str, "prices": [str, ...]},
+            por plataforma y en orden del DOM
+    """
+    if max_prices is None:
+        max_prices = max_prices_needed()
+    platform_selectors = [[platform, column_selector(platform)] for platform in platforms]
+    return await page.evaluate(EXTRACT_ROWS_SCRIPT, [platform_selectors, PRICE_WRAPPER_SELECTOR, max_prices])
+
+
+async def _extract_prices_with_evaluate(page, platforms, ratings, stats=None):
+    """
+    Extrae los precios de todas las plataformas y ratings con un único viaje al navegador
+
+    Returns:
+        dict: {(plataforma, rating): precio}, None si no se encontraron columnas
+    """
+    logger.debug("Extrayendo columnas y precios en una sola llamada")
+    with phase(stats, "extraction"):
+        rows = await extract_rating_rows(page, platforms)
+
+    if not rows:
+        return None
+
+    logger.info("Se encontraron %d columnas de rating", len(rows))
+    with phase(stats, "parsing"):
+        return process_platform_rows(rows, platforms, ratings)
+
+
+async def _extract_prices_with_handles(page, platforms, ratings, stats=None):
+    """
+    Extrae los precios recorriendo los elementos uno por uno (una llamada por elemento)
+
+    Lectura y parseo van intercalados, por lo que todo se mide como "extraction".
+
+    Returns:
+        dict: {(plataforma, rating): precio}, None si no se encontraron columnas
+    """
+    results = {}
+    found = False
+    with phase(stats, "extraction"):
+        for platform in platforms:
+            prices = await _read_prices_with_handles(page, column_selector(platform), ratings)
+            if prices is None:
+                logger.warning("No se encontraron columnas de la plataforma %s", platform)
+                prices = [None] * len(ratings)
+            else:
+                found = True
+            for rating, price in zip(ratings, prices):
+                results[(platform, rating)] = price
+    return results if found else None
+
+
+async def _read_prices_with_handles(page, selector, ratings):
+    """Recorrido elemento por elemento: text_content por columna y por precio"""
+    # Buscar todos los elementos con ese selector
+    logger.debug("Buscando elementos con el selector específico")
+    elements = await page.query_selector_all(selector)
+
+    if not elements:
+        return None
+
+    logger.info("Se encontraron %d columnas de rating", len(elements))
+
+    # Lista para almacenar resultados (8 valores)
+    all_results = []
+
+    # Iterar sobre cada rating
+    for rating in ratings:
+        logger.debug("Procesando rating %d", rating)
+
+        # Buscar el elemento que contiene el texto del rating
+        target_element = None
+        for idx, element in enumerate(elements):
             try:
-                page_title = await page.title()
-                print(f"📄 Título de la página: {page_title}")
-                
-                # Esperar un poco más para asegurar que el contenido dinámico se carga
-                await asyncio.sleep(2)
-                
+                text = await element.text_content()
+                if text:
+                    # Usar word boundary para buscar rating exacto, no parcial
+                    # Buscar el rating como palabra completa o como inicio de línea
+                    text_cleaned = text.strip()
+
+                    # Patrón para encontrar el rating exacto: "\b83\b" o "83 " o "83\n"
+                    # pero no "835" o "183"
+                    rating_pattern = rf'\b{rating}\b'
+
+                    if re.search(rating_pattern, text_cleaned):
+                        target_element = element
+                        logger.debug("Elemento #%d con rating %d: %s", idx + 1, rating, text_cleaned[:200])
+                        break
             except Exception as e:
-                print(f"⚠️ Error al verificar la página: {e}")
-            
-            try:
-                # Buscar todos los elementos con ese selector
-                print("🔍 Buscando elementos con el selector específico...")
-                elements = await page.query_selector_all(selector)
-                
-                if elements and len(elements) > 0:
-                    print(f"✅ Se encontraron {len(elements)} elementos con ese selector")
-                    
-                    # Lista para almacenar resultados (8 valores)
-                    all_results = []
-                    
-                    # Iterar sobre cada rating
-                    for rating in ratings:
-                        print(f"\n{'='*70}")
-                        print(f"🔍 PROCESANDO RATING {rating}")
-                        print(f"{'='*70}")
-                        
-                        # Buscar el elemento que contiene el texto del rating
-                        target_element = None
-                        for idx, element in enumerate(elements):
-                            try:
-                                text = await element.text_content()
-                                if text:
-                                    # Usar word boundary para buscar rating exacto, no parcial
-                                    # Buscar el rating como palabra completa o como inicio de línea
-                                    text_cleaned = text.strip()
-                                    
-                                    # Patrón para encontrar el rating exacto: "\b83\b" o "83 " o "83\n"
-                                    # pero no "835" o "183"
-                                    rating_pattern = rf'\b{rating}\b'
-                                    
-                                    if re.search(rating_pattern, text_cleaned):
-                                        target_element = element
-                                        print(f"✅ Encontrado elemento #{idx+1} con rating {rating}")
-                                        print(f"   Texto del elemento: {text_cleaned[:200]}...")  # Primeros 200 chars
-                                        break
-                                    
-                                    # Debugging: mostrar todos los elementos para identificar el patrón
-                                    if idx < 5:  # Solo mostrar los primeros 5 para no saturar
-                                        print(f"   Elemento #{idx+1}: {text_cleaned[:100]}")
-                            except Exception as e:
-                                print(f"   ⚠️ Error al leer elemento #{idx+1}: {e}")
-                                continue
-                        
-                        if target_element:
-                            # Buscar TODAS las apariciones de platform-price-wrapper-small
-                            print(f"🔍 Buscando 'platform-price-wrapper-small' dentro del elemento de rating {rating}...")
-                            
-                            # Buscar dentro de target_element - obtener TODOS los elementos
-                            inner_selector = ".platform-price-wrapper-small"
-                            price_wrappers = await target_element.query_selector_all(inner_selector)
-                            
-                            if price_wrappers and len(price_wrappers) > 0:
-                                print(f"✅ Se encontraron {len(price_wrappers)} elementos 'platform-price-wrapper-small' para rating {rating}")
-                                
-                                # Extraer texto y valores de los primeros 5 elementos
-                                all_prices_text = []
-                                all_prices_values = []
-                                
-                                print(f"\n📋 Precios encontrados para rating {rating}:")
-                                print(f"{'─'*70}")
-                                
-                                for i, wrapper in enumerate(price_wrappers[:5], 1):
-                                    try:
-                                        price_text = await wrapper.text_content()
-                                        if price_text:
-                                            price_text = price_text.strip()
-                                        all_prices_text.append(price_text)
-                                        
-                                        # Extraer valor numérico
-                                        value = extract_price_value(price_text)
-                                        all_prices_values.append(value)
-                                        
-                                        # IMPRIMIR CADA PRECIO ENCONTRADO
-                                        print(f"  Precio #{i}:")
-                                        print(f"    Texto original: '{price_text}'")
-                                        print(f"    Valor extraído: {value}")
-                                        
-                                    except Exception as e:
-                                        all_prices_values.append(None)
-                                        print(f"  Precio #{i}: ERROR - {e}")
-                                
-                                # Mostrar todos los valores antes del cálculo
-                                print(f"\n  📊 Valores antes del cálculo: {all_prices_values}")
-                                
-                                # Calcular precio según reglas del rating
-                                result_price = calculate_price_for_rating(rating, all_prices_values)
-                                print(f"  ✅ Precio final calculado: {result_price}")
-                                print(f"{'─'*70}")
-                                
-                                all_results.append(result_price)
-                            else:
-                                print(f"❌ No se encontró ningún elemento 'platform-price-wrapper-small' para rating {rating}")
-                                all_results.append(None)
-                        else:
-                            print(f"❌ No se encontró ningún elemento con rating {rating}")
-                            all_results.append(None)
-                    
-                    # Retornar todos los resultados
-                    print(f"\n{'='*70}")
-                    print(f"📊 RESUMEN DE RESULTADOS")
-                    print(f"{'='*70}")
-                    for i, (rating, price) in enumerate(zip(ratings, all_results)):
-                        if price is not None:
-                            print(f"Rating {rating}: Precio = {price} coins")
-                        else:
-                            print(f"Rating {rating}: No se pudo calcular el precio")
-                    
-                    return all_results
-                else:
-                    print("❌ No se encontró ningún elemento con el selector especificado")
-                    
-                    # Debugging adicional
-                    print("🔍 Intentando buscar selectores alternativos...")
+                logger.warning("Error al leer elemento #%d: %s", idx + 1, e)
+                continue
+
+        if target_element:
+            # Buscar dentro de target_element - obtener TODOS los elementos
+            price_wrappers = await target_element.query_selector_all(PRICE_WRAPPER_SELECTOR)
+
+            if price_wrappers and len(price_wrappers) > 0:
+                logger.debug("Rating %d: %d precios en la columna", rating, len(price_wrappers))
+
+                # Extraer texto y valores de los primeros 5 elementos
+                all_prices_text = []
+                all_prices_values = []
+
+                for i, wrapper in enumerate(price_wrappers[:max_prices_needed()], 1):
                     try:
-                        # Buscar elementos similares
-                        alt_selectors = [
-                            ".stc-player-column",
-                            ".player-column",
-                            ".xs-column",
-                            "[class*='player']",
-                            "[class*='stc']"
-                        ]
-                        
-                        for alt_selector in alt_selectors:
-                            alt_elements = await page.query_selector_all(alt_selector)
-                            if alt_elements:
-                                print(f"🔍 Selector alternativo '{alt_selector}' encontró {len(alt_elements)} elementos")
-                        
-                        # Buscar cualquier elemento que contenga "rating" o números
-                        rating_elements = await page.query_selector_all("[class*='rating'], [class*='83'], [class*='84'], [class*='85']")
-                        if rating_elements:
-                            print(f"🔍 Elementos relacionados con ratings: {len(rating_elements)}")
-                            
-                    except Exception as debug_e:
-                        print(f"⚠️ Error en debugging: {debug_e}")
-                    
-                    return None
-                    
-            except Exception as e:
-                print(f"❌ Error al buscar el elemento: {e}")
-                return None
-            
-    except Exception as e:
-        print(f"❌ Error general: {e}")
-        return None
\ No newline at end of file
+                        price_text = await wrapper.text_content()
+                        if price_text:
+                            price_text = price_text.strip()
+                        all_prices_text.append(price_text)
+
+                        # Extraer valor numérico
+                        value = extract_price_value(price_text)
+                        all_prices_values.append(value)
+
+                        logger.debug("Precio #%d: '%s' -> %s", i, price_text, value)
+
+                    except Exception as e:
+                        all_prices_values.append(None)
+                        logger.warning("Error al leer el precio #%d del rating %d: %s", i, rating, e)
+
+                # Calcular precio según reglas del rating
+                result_price = calculate_price_for_rating(rating, all_prices_values)
+
+                all_results.append(result_price)
+            else:
+                logger.warning("No se encontró ningún elemento 'platform-price-wrapper-small' para rating %d", rating)
+                all_results.append(None)
+        else:
+            logger.warning("No se encontró ningún elemento con rating %d", rating)
+            all_results.append(None)
+
+    return all_results
+
+
+# Modos de extracción disponibles
+EXTRACTION_MODES = {
+    "evaluate": _extract_prices_with_evaluate,
+    "handles": _extract_prices_with_handles,
+}
+
+
+async def extract_prices(page, platforms, ratings, extraction="evaluate", stats=None):
+    """
+    Extrae los precios de la página usando el modo de extracción indicado
+
+    Args:
+        page: Página de Playwright ya cargada
+        platforms (list): Plataformas a procesar
+        ratings (list): Ratings a procesar
+        extraction (str): "evaluate" (una sola llamada) o "handles" (elemento por elemento)
+        stats (dict): Diccionario donde registrar la duración de extracción y parseo
+
+    Returns:
+        dict: {(plataforma, rating): precio}, None si no se encontraron columnas
+    """
+    if extraction not in EXTRACTION_MODES:
+        raise ValueError(f"Modo de extracción desconocido: {extraction}")
+
+    return await EXTRACTION_MODES[extraction](page, platforms, ratings, stats)
+
+
+async def launch_browser(playwright, headless=True, stats=None):
+    """
+    Lanza Chromium con la configuración del scraper
+
+    Args:
+        playwright: Instancia de async_playwright
+        headless (bool): Si ejecutar el navegador sin ventana visible
+        stats (dict): Diccionario donde registrar la duración del lanzamiento
+
+    Returns:
+        Browser: Navegador de Playwright
+    """
+    logger.info("Iniciando navegador")
+    with phase(stats, "launch"):
+        # Configuración más robusta del navegador
+        return await playwright.chromium.launch(
+            headless=headless,
+            args=[
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-blink-features=AutomationControlled',
+                '--disable-web-security',
+                '--disable-features=VizDisplayCompositor'
+            ]
+        )
+
+
+async def new_scraper_context(browser, session_state=None, resource_policy="env", stats=None):
+    """
+    Crea el contexto del scraper: viewport, user agent, sesión guardada y bloqueo de recursos
+
+    Args:
+        browser: Navegador de Playwright
+        session_state (dict): Estado de sesión guardado (None para empezar sin cookies)
+        resource_policy (dict): Política de bloqueo de recursos; "env" la carga de
+            SCRAPER_RESOURCE_POLICY y None desactiva el bloqueo
+        stats (dict): Diccionario donde registrar los recursos bloqueados ("resources")
+
+    Returns:
+        tuple: (context, contadores de recursos o None si no hay bloqueo)
+    """
+    context = await browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        storage_state=session_state
+    )
+
+    # Bloquear imágenes, fuentes, anuncios y analítica: solo se lee texto
+    if resource_policy == "env":
+        resource_policy = load_resource_policy()
+    resource_counters = None
+    if resource_policy:
+        resource_counters = await install_resource_policy(context, resource_policy, stats)
+
+    return context, resource_counters
+
+
+async def new_scraper_page(context):
+    """
+    Abre una pestaña con los timeouts del scraper
+
+    Args:
+        context: BrowserContext de Playwright
+
+    Returns:
+        Page: Página de Playwright
+    """
+    page = await context.new_page()
+
+    # Configurar timeouts más largos
+    page.set_default_timeout(60000)  # 60 segundos
+    page.set_default_navigation_timeout(60000)  # 60 segundos
+
+    return page
+
+
+async def log_missing_columns(page):
+    """
+    Registra qué selectores alternativos encuentran elementos cuando no aparecen las columnas de rating
+
+    Args:
+        page: Página de Playwright ya cargada
+    """
+    try:
+        # Buscar elementos similares
+        alt_selectors = [
+            ".stc-player-column",
+            ".player-column",
+            ".xs-column",
+            "[class*='player']",
+            "[class*='stc']"
+        ]
+
+        for alt_selector in alt_selectors:
+            alt_elements = await page.query_selector_all(alt_selector)
+            if alt_elements:
+                logger.info("Selector alternativo '%s' encontró %d elementos", alt_selector, len(alt_elements))
+
+        # Buscar cualquier elemento que contenga "rating" o números
+        rating_elements = await page.query_selector_all("[class*='rating'], [class*='83'], [class*='84'], [class*='85']")
+        if rating_elements:
+            logger.info("Elementos relacionados con ratings: %d", len(rating_elements))
+
+    except Exception as debug_e:
+        logger.warning("Error en debugging: %s", debug_e)
+
+
+async def scrape_futbin_cheapest(headless=True, extraction="evaluate", ready_timeout_ms=READY_TIMEOUT_MS,
+                                 resource_policy="env", session_state_path=SESSION_STATE_PATH, base_url=FUTBIN_URL,
+                                 platforms=None, stats=None, browser=None):
+    """
+    Scrapea la página de jugadores más baratos de FUTBIN usando Playwright
+
+    Es el motor de scraping (engine.scrape_targets) con un único target.
+
+    Args:
+        headless (bool): Si ejecutar el navegador en modo headless (sin ventana visible)
+        extraction (str): Modo de extracción, "evaluate" (por defecto) o "handles"
+        ready_timeout_ms (int): Tiempo máximo de cada espera de carga en milisegundos
+        resource_policy (dict): Política de bloqueo de recursos; "env" la carga de
+            SCRAPER_RESOURCE_POLICY y None desactiva el bloqueo
+        session_state_path (str): Archivo donde se guarda el estado de sesión entre
+            ejecuciones; None desactiva la reutilización
+        base_url (str): URL base de FUTBIN (se puede apuntar a un servidor local)
+        platforms (list): Plataformas a leer en la misma visita (por defecto get_platforms())
+        stats (dict): Diccionario opcional donde se registran las esperas ("waits"),
+            los recursos bloqueados ("resources"), el uso de la sesión ("session")
+            y la duración de cada fase ("phases")
+        browser: Navegador ya lanzado a reutilizar (por defecto se lanza uno)
+
+    Returns:
+        dict: {(plataforma, rating): precio} para los ratings configurados (get_ratings),
+            None si no se pudo scrapear la página
+    """
+    # Import diferido: engine usa las funciones de este módulo
+    from .engine import CHEAPEST_TARGET, scrape_targets
+
+    results = await scrape_targets(
+        [CHEAPEST_TARGET],
+        concurrency=1,
+        headless=headless,
+        extraction=extraction,
+        ready_timeout_ms=ready_timeout_ms,
+        resource_policy=resource_policy,
+        session_state_path=session_state_path,
+        base_url=base_url,
+        platforms=platforms,
+        stats=stats,
+        browser=browser,
+    )
+    return results[CHEAPEST_TARGET["name"]]["prices"]
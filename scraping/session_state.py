@@ -0,0 +1,112 @@
+"""
+Módulo para guardar y reutilizar el estado de sesión del navegador (cookies y local storage)
+
+Con un estado válido guardado, el scraper va directo a la página de jugadores más
+baratos sin pasar antes por la portada de FUTBIN para obtener cookies.
+"""
+
+import json
+import logging
+import os
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+# Ruta del archivo de estado (en GitHub Actions se guarda con actions/cache)
+SESSION_STATE_PATH = os.getenv("SCRAPER_SESSION_STATE", ".cache/futbin-session/state.json")
+
+# Antigüedad máxima del estado guardado, en horas
+SESSION_MAX_AGE_HOURS = float(os.getenv("SCRAPER_SESSION_MAX_AGE_HOURS", "12"))
+
+# Dominio cuyas cookies deben seguir vigentes
+SESSION_DOMAIN = "futbin.com"
+
+
+def load_session_state(path=SESSION_STATE_PATH, max_age_hours=SESSION_MAX_AGE_HOURS):
+    """
+    Carga el estado de sesión guardado si sigue vigente
+
+    Args:
+        path (str): Ruta del archivo de estado
+        max_age_hours (float): Antigüedad máxima del archivo en horas
+
+    Returns:
+        dict: Estado para browser.new_context(storage_state=...), None si no existe o expiró
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    age_hours = (time.time() - os.path.getmtime(path)) / 3600
+    if age_hours > max_age_hours:
+        logger.info("Estado de sesión expirado (%.1f h), se descarta", age_hours)
+        discard_session_state(path)
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except Exception as e:
+        logger.warning("No se pudo leer el estado de sesión: %s", e)
+        discard_session_state(path)
+        return None
+
+    # Las cookies de sesión tienen expires = -1; el resto se compara con la hora actual
+    now = time.time()
+    cookies = [
+        cookie for cookie in state.get("cookies", [])
+        if cookie.get("domain", "").lstrip(".").endswith(SESSION_DOMAIN)
+    ]
+    valid = [cookie for cookie in cookies if cookie.get("expires", -1) < 0 or cookie["expires"] > now]
+    if not valid:
+        logger.info("El estado de sesión no tiene cookies vigentes de FUTBIN, se descarta")
+        discard_session_state(path)
+        return None
+
+    logger.info("Reutilizando estado de sesión (%d cookies, %.1f h)", len(valid), age_hours)
+    return state
+
+
+async def save_session_state(context, path=SESSION_STATE_PATH):
+    """
+    Guarda el estado de sesión del contexto (cookies y local storage)
+
+    Args:
+        context: BrowserContext de Playwright
+        path (str): Ruta del archivo de estado
+
+    Returns:
+        bool: True si se guardó correctamente
+    """
+    try:
+        state = await context.storage_state()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Escribir en un archivo temporal y renombrar para no dejar un estado a medias
+        # (uno por proceso: los workers del modo por shards guardan a la vez)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+        logger.info("Estado de sesión guardado en %s", path)
+        return True
+    except Exception as e:
+        logger.warning("No se pudo guardar el estado de sesión: %s", e)
+        return False
+
+
+def discard_session_state(path=SESSION_STATE_PATH):
+    """
+    Borra el estado de sesión guardado (expirado o rechazado por el sitio)
+
+    Args:
+        path (str): Ruta del archivo de estado
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
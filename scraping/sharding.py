@@ -0,0 +1,163 @@
+"""
+Scraping repartido entre varios procesos, cada uno con su propio navegador
+
+Con decenas de páginas, un solo Chromium manejado desde un único event loop
+queda limitado por CPU. En este modo la lista de targets se reparte en shards,
+uno por worker; cada worker es un proceso con su propio navegador que ejecuta
+engine.scrape_targets sobre su shard y envía cada resultado al proceso padre en
+cuanto lo tiene. El padre los junta en un único lote.
+
+Con SCRAPER_WORKERS=1 (por defecto) todo corre en el proceso actual.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import queue
+import time
+
+from .engine import scrape_targets
+from monitoring.monitoring import configure_logging, record_phase
+
+
+logger = logging.getLogger(__name__)
+
+
+# Procesos con navegador propio
+SCRAPER_WORKERS = int(os.getenv("SCRAPER_WORKERS", "1"))
+
+# Cada cuánto revisar si un worker terminó sin avisar (segundos)
+WORKER_POLL_S = 1.0
+
+
+def shard_targets(targets, workers):
+    """
+    Reparte los targets en shards intercalados (el primero al worker 0, el segundo al 1...)
+
+    Args:
+        targets (list): Targets {"name", "path"}
+        workers (int): Cantidad de workers
+
+    Returns:
+        list: Lista de shards no vacíos
+    """
+    workers = max(1, workers)
+    return [targets[index::workers] for index in range(workers) if targets[index::workers]]
+
+
+def _worker(index, shard, options, results_queue):
+    """Proceso worker: scrapea su shard y envía cada resultado y, al final, sus métricas"""
+    configure_logging()
+    stats = {}
+    try:
+        asyncio.run(scrape_targets(
+            shard,
+            stats=stats,
+            on_result=lambda result: results_queue.put(("result", index, result)),
+            **options,
+        ))
+    finally:
+        results_queue.put(("done", index, stats))
+
+
+def _merge_worker_stats(stats, worker_stats):
+    """Suma las fases y junta las esperas, targets y sesiones de un worker"""
+    for name, seconds in worker_stats.get("phases", {}).items():
+        record_phase(stats, name, seconds)
+    stats.setdefault("waits", []).extend(worker_stats.get("waits", []))
+    stats.setdefault("targets", {}).update(worker_stats.get("targets", {}))
+    if "session" in worker_stats:
+        stats.setdefault("worker_sessions", []).append(worker_stats["session"])
+
+
+def _collect(processes, results_queue, stats, on_result):
+    """Lee los resultados de los workers hasta que todos terminan"""
+    results = {}
+    pending = set(range(len(processes)))
+    while pending:
+        try:
+            kind, index, payload = results_queue.get(timeout=WORKER_POLL_S)
+        except queue.Empty:
+            # Un worker que murió sin enviar "done" (por ejemplo, por falta de memoria)
+            for index in list(pending):
+                if not processes[index].is_alive():
+                    logger.error("El worker %d terminó sin informar (exit code %s)", index, processes[index].exitcode)
+                    pending.discard(index)
+            continue
+
+        if kind == "result":
+            results[payload["name"]] = payload
+            if on_result is not None:
+                on_result(payload)
+        else:
+            pending.discard(index)
+            if stats is not None:
+                _merge_worker_stats(stats, payload)
+
+    for process in processes:
+        process.join()
+    return results
+
+
+async def scrape_sharded(targets, workers=SCRAPER_WORKERS, stats=None, on_result=None, **options):
+    """
+    Scrapea los targets repartidos entre varios procesos con navegador propio
+
+    Args:
+        targets (list): Targets {"name", "path"}
+        workers (int): Cantidad de procesos (no más que targets); 1 ejecuta en este proceso
+            (y es el único caso que usa options["browser"], un navegador ya lanzado)
+        stats (dict): Diccionario donde juntar las métricas de todos los workers
+            ("phases", "waits", "targets") y la cantidad de workers ("workers")
+        on_result (callable): Se llama en este proceso con cada resultado apenas llega
+        **options: Argumentos de engine.scrape_targets (concurrency, base_url, platforms...)
+
+    Returns:
+        dict: {nombre: resultado} en el orden de los targets, igual que scrape_targets
+    """
+    shards = shard_targets(targets, min(workers, len(targets)))
+    if stats is not None:
+        stats["workers"] = len(shards)
+
+    if len(shards) <= 1:
+        return await scrape_targets(targets, stats=stats, on_result=on_result, **options)
+
+    # Cada worker lanza su propio navegador: uno compartido no se puede pasar a otro proceso
+    options.pop("browser", None)
+
+    logger.info("Repartiendo %d targets entre %d workers", len(targets), len(shards))
+    start = time.perf_counter()
+
+    # spawn: cada worker arranca limpio, sin heredar el estado de asyncio ni de Playwright
+    context = multiprocessing.get_context("spawn")
+    results_queue = context.Queue()
+    processes = [
+        context.Process(target=_worker, args=(index, shard, options, results_queue), daemon=True)
+        for index, shard in enumerate(shards)
+    ]
+    for process in processes:
+        process.start()
+
+    results = await asyncio.to_thread(_collect, processes, results_queue, stats, on_result)
+
+    # Targets de un worker que murió sin informarlos
+    for target in targets:
+        if target["name"] not in results:
+            results[target["name"]] = {
+                "name": target["name"], "path": target["path"], "prices": None,
+                "ready": False, "error": "el worker terminó sin resultado", "seconds": 0.0,
+            }
+            if stats is not None:
+                stats.setdefault("targets", {})[target["name"]] = {
+                    "ok": False, "seconds": 0.0, "error": "el worker terminó sin resultado",
+                }
+
+    if stats is not None:
+        sessions = stats.pop("worker_sessions", [])
+        if sessions:
+            stats["session"] = "reused" if all(session == "reused" for session in sessions) else "warmed"
+
+    failed = sum(1 for result in results.values() if result["error"])
+    logger.info("Workers: %d targets en %.2fs, %d con error", len(targets), time.perf_counter() - start, failed)
+    return {target["name"]: results[target["name"]] for target in targets}
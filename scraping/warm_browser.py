@@ -0,0 +1,115 @@
+"""
+Navegador que sigue abierto entre ejecuciones del scraper (modo daemon)
+
+Lanzar Playwright y Chromium cuesta más que el propio scraping cuando la página
+carga rápido. WarmBrowser lo lanza una vez y lo presta a cada ejecución
+(engine.scrape_targets(browser=...)). Se recicla (se cierra y se vuelve a lanzar
+en la próxima ejecución) cada BROWSER_MAX_RUNS ejecuciones, cuando el RSS de
+Chromium y el driver supera BROWSER_MAX_RSS_MB, después de una ejecución
+fallida o si se desconectó.
+"""
+
+import logging
+import os
+
+from playwright.async_api import async_playwright
+
+from monitoring.monitoring import process_tree_rss_mb
+from .scraper import launch_browser
+
+
+logger = logging.getLogger(__name__)
+
+
+# Ejecuciones con el mismo navegador antes de reciclarlo (0 para no reciclar por cantidad)
+BROWSER_MAX_RUNS = int(os.getenv("SCHEDULER_BROWSER_MAX_RUNS", "50"))
+
+# RSS de Chromium y el driver a partir del cual se recicla (MB, 0 para no medirlo)
+BROWSER_MAX_RSS_MB = float(os.getenv("SCHEDULER_BROWSER_MAX_RSS_MB", "1024"))
+
+
+class WarmBrowser:
+    """
+    Chromium lanzado una vez y reutilizado por varias ejecuciones
+
+    Uso (siempre en el mismo event loop):
+        warm = WarmBrowser()
+        browser = await warm.get()
+        ... scrape_targets(browser=browser) ...
+        await warm.release(ok=True)
+        await warm.close()
+    """
+
+    def __init__(self, headless=True, max_runs=None, max_rss_mb=None):
+        self.headless = headless
+        self.max_runs = BROWSER_MAX_RUNS if max_runs is None else max_runs
+        self.max_rss_mb = BROWSER_MAX_RSS_MB if max_rss_mb is None else max_rss_mb
+        self.runs = 0
+        self.launches = 0
+        self._playwright = None
+        self._browser = None
+
+    async def get(self, stats=None):
+        """
+        Navegador listo para usar; lo lanza si todavía no hay uno o si se desconectó
+
+        Args:
+            stats (dict): Diccionario donde registrar la fase "launch" si hay que lanzarlo
+
+        Returns:
+            Browser: Navegador de Playwright
+        """
+        if self._browser is not None and not self._browser.is_connected():
+            logger.warning("El navegador se desconectó, se vuelve a lanzar")
+            await self.close()
+
+        if self._browser is None:
+            self._playwright = await async_playwright().start()
+            self._browser = await launch_browser(self._playwright, self.headless, stats)
+            self.launches += 1
+            self.runs = 0
+        return self._browser
+
+    async def release(self, ok=True):
+        """
+        Marca el fin de una ejecución y recicla el navegador si hace falta
+
+        Args:
+            ok (bool): Si la ejecución terminó bien (si no, se recicla por las dudas)
+
+        Returns:
+            str: Motivo del reciclaje, o None si el navegador sigue abierto
+        """
+        if self._browser is None:
+            return None
+        self.runs += 1
+
+        reason = None
+        if not ok:
+            reason = "ejecución fallida"
+        elif self.max_runs and self.runs >= self.max_runs:
+            reason = f"{self.runs} ejecuciones"
+        elif self.max_rss_mb:
+            rss = process_tree_rss_mb(include_self=False)
+            if rss is not None and rss >= self.max_rss_mb:
+                reason = f"RSS {rss:.0f} MB >= {self.max_rss_mb:.0f} MB"
+
+        if reason:
+            logger.info("Reciclando navegador (%s)", reason)
+            await self.close()
+        return reason
+
+    async def close(self):
+        """Cierra el navegador y el driver de Playwright"""
+        browser, playwright = self._browser, self._playwright
+        self._browser = None
+        self._playwright = None
+        self.runs = 0
+        try:
+            if browser is not None:
+                await browser.close()
+        except Exception as e:
+            logger.warning("Error al cerrar el navegador: %s", e)
+        finally:
+            if playwright is not None:
+                await playwright.stop()
@@ -0,0 +1,72 @@
+"""
+Configuración de pytest
+
+Los tests usan los datos y servidores simulados que comparten con los benchmarks
+(benchmarks/common.py y benchmarks/fake_postgrest.py), nunca los scripts
+bench_*.py: se agrega ese directorio a sys.path, y common agrega la raíz del
+proyecto.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+import common  # noqa: E402,F401
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    """Backend SQLite en un archivo temporal, elegido como backend del proceso"""
+    from database import sqlite_backend
+    from database.database import use_backend
+
+    sqlite_backend.reset_connection()
+    sqlite_backend.get_connection(str(tmp_path / "prices.sqlite3"))
+    use_backend("sqlite")
+    yield sqlite_backend
+    sqlite_backend.reset_connection()
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+    """Backend de Supabase contra benchmarks/fake_postgrest.py, con las tablas vacías"""
+    pytest.importorskip("supabase")
+    from fake_postgrest import FAKE_KEY, fake_postgrest, reset
+
+    with fake_postgrest() as url:
+        monkeypatch.setenv("SUPABASE_URL", url)
+        monkeypatch.setenv("SUPABASE_KEY", FAKE_KEY)
+        from database import supabase_backend
+
+        reset()
+        supabase_backend.reset_supabase_client()
+        yield supabase_backend
+        supabase_backend.reset_supabase_client()
+
+
+@pytest.fixture(scope="session")
+def chromium():
+    """Salta los tests si falta el navegador (python -m playwright install chromium)"""
+    pytest.importorskip("playwright")
+    import asyncio
+    from playwright.async_api import async_playwright
+
+    async def launch():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            await browser.close()
+
+    try:
+        asyncio.run(launch())
+    except Exception as e:
+        pytest.skip(f"Chromium de Playwright no disponible: {str(e).splitlines()[0]}")
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    """URL del servidor local con las páginas guardadas de benchmarks/fixtures/"""
+    with common.fixture_server() as url:
+        yield url
@@ -0,0 +1,138 @@
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from analytics.analytics import (correlations, forward_fill, pct_change, price_changes, price_matrix,
+                                 rolling_bands, rolling_mean, summarize, volatility)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(5)
+    values = rng.normal(1000, 50, size=(200, 4))
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:30, 3] = np.nan
+    return values
+
+
+def sliding(prices, window, function):
+    """Referencia directa: function sobre cada ventana, NaN si no tiene valores"""
+    result = np.full(prices.shape, np.nan)
+    for end in range(window - 1, len(prices)):
+        for column in range(prices.shape[1]):
+            values = prices[end - window + 1:end + 1, column]
+            values = values[~np.isnan(values)]
+            if len(values):
+                result[end, column] = function(values)
+    return result
+
+
+@pytest.mark.parametrize("window", [1, 7, 24, 200])
+def test_rolling_mean(prices, window):
+    assert np.allclose(rolling_mean(prices, window), sliding(prices, window, np.mean), equal_nan=True)
+
+
+@pytest.mark.parametrize("window", [1, 7, 24, 64, 200])
+def test_rolling_bands(prices, window):
+    low, high = rolling_bands(prices, window)
+    assert np.array_equal(low, sliding(prices, window, np.min), equal_nan=True)
+    assert np.array_equal(high, sliding(prices, window, np.max), equal_nan=True)
+
+
+def test_window_longer_than_history(prices):
+    assert np.isnan(rolling_mean(prices, 500)).all()
+    assert all(np.isnan(band).all() for band in rolling_bands(prices, 500))
+
+
+def test_pct_change():
+    change = pct_change(np.array([[100.0], [110.0], [99.0]]))
+    assert np.isnan(change[0, 0])
+    assert change[1:, 0] == pytest.approx([10.0, -10.0])
+
+
+@pytest.fixture
+def history():
+    """Dos precios de ps 84 en la misma hora, una hora sin precios y pc 85 con una sola muestra"""
+    return {
+        "timestamp": [datetime(2026, 1, 1, 10, 5), datetime(2026, 1, 1, 10, 10),
+                      datetime(2026, 1, 1, 10, 40), datetime(2026, 1, 1, 12, 0)],
+        "source": ["cheapest"] * 4,
+        "platform": ["ps", "pc", "ps", "ps"],
+        "rating": [84, 85, 84, 84],
+        "price": [100, 200, 110, 120],
+    }
+
+
+def test_price_matrix(history):
+    matrix = price_matrix(history)
+    assert matrix["keys"] == [("cheapest", "pc", 85), ("cheapest", "ps", 84)]
+    assert matrix["timestamp"].tolist() == [datetime(2026, 1, 1, hour) for hour in (10, 11, 12)]
+    assert np.array_equal(matrix["prices"], [[200, 110], [np.nan, np.nan], [np.nan, 120]], equal_nan=True)
+
+
+def test_price_matrix_empty():
+    matrix = price_matrix({"timestamp": [], "source": [], "platform": [], "rating": [], "price": []})
+    assert matrix["keys"] == [] and matrix["prices"].size == 0
+
+
+def test_forward_fill():
+    filled = forward_fill(np.array([[np.nan, 1], [2, np.nan], [np.nan, np.nan], [3, 4]]))
+    assert np.array_equal(filled, [[np.nan, 1], [2, 1], [2, 1], [3, 4]], equal_nan=True)
+
+
+def test_volatility():
+    # Cambios: 10 %, -10 %, 0 %; la segunda columna tiene un hueco y no llega a dos cambios
+    result = volatility(np.array([[100, 100], [110, np.nan], [99, 110], [99, 110]]), 3)
+    assert np.isnan(result[:2]).all()
+    assert result[2:, 0] == pytest.approx([200 ** 0.5, 10.0])
+    assert np.isnan(result[:, 1]).all()
+
+
+def test_volatility_single_sample():
+    assert np.isnan(volatility(np.array([[100.0]]), 2)).all()
+
+
+def test_correlations():
+    base = np.array([100, 110, 99, 108.9])
+    prices = np.column_stack([base, base * 2, [100, 90, 99, 89.1], [np.nan, np.nan, np.nan, 50]])
+    result = correlations(prices)
+    assert result[0, 1] == pytest.approx(1.0)
+    assert result[0, 2] == pytest.approx(-1.0)
+    assert np.isnan(result[3]).all() and np.isnan(result[:, 3]).all()
+
+
+def test_summarize():
+    matrix = {"keys": [("cheapest", "ps", 84), ("cheapest", "pc", 85)],
+              "prices": np.array([[100, np.nan], [np.nan, np.nan], [110, np.nan], [121, 50]])}
+    summary = summarize(matrix, changes={"1h": 1, "2h": 2}, volatility_hours=2, band_hours=3)
+    assert summary[("cheapest", "ps", 84)] == {
+        "price": 121.0, "change_1h": 10.0, "change_2h": 21.0,
+        "low": 110.0, "high": 121.0, "mean": 115.5, "volatility": 0.0,
+    }
+    assert summary[("cheapest", "pc", 85)] == {
+        "price": 50.0, "change_1h": None, "change_2h": None,
+        "low": 50.0, "high": 50.0, "mean": 50.0, "volatility": None,
+    }
+
+
+def test_summarize_single_sample():
+    summary = summarize({"keys": [("cheapest", "ps", 84)], "prices": np.array([[100.0]])})
+    assert summary[("cheapest", "ps", 84)] == {
+        "price": 100.0, "change_1h": None, "change_24h": None, "change_7d": None,
+        "low": 100.0, "high": 100.0, "mean": 100.0, "volatility": None,
+    }
+    assert summarize({"keys": [], "prices": np.empty((0, 0))}) == {}
+
+
+def test_price_changes(history):
+    matrix = price_matrix(history)
+    prices = {("pc", 85): 220, ("ps", 84): None, 84: 99, ("ps", 86): 100}
+
+    # Hace 2 horas (11:30) cae en la fila de las 11, sin precios: se usa el anterior
+    changes = price_changes(matrix, prices, 2, now=datetime(2026, 1, 1, 13, 30))
+    assert changes == {("pc", 85): 10.0, ("ps", 84): None, 84: -10.0, ("ps", 86): None}
+
+    # Antes del historial no hay referencia
+    assert set(price_changes(matrix, prices, 5, now=datetime(2026, 1, 1, 13, 30)).values()) == {None}
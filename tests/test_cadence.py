@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scheduler.cadence import MAX_BACKOFF_FACTOR, choose_interval, price_activity
+
+
+def history(prices_by_series, minutes=10):
+    """Historial columnar con una fila por serie cada minutes minutos"""
+    start = np.datetime64("2026-01-01T00:00", "m")
+    columns = {"timestamp": [], "source": [], "platform": [], "rating": [], "price": []}
+    for (platform, rating), prices in prices_by_series.items():
+        for index, price in enumerate(prices):
+            columns["timestamp"].append(start + np.timedelta64(index * minutes, "m"))
+            columns["source"].append("cheapest")
+            columns["platform"].append(platform)
+            columns["rating"].append(rating)
+            columns["price"].append(price)
+    columns["timestamp"] = np.array(columns["timestamp"])
+    columns["price"] = np.array(columns["price"])
+    return columns
+
+
+def test_activity_is_range_percentile():
+    activity = price_activity(history({("ps", 83): [1000, 1100, 1050], ("ps", 84): [2000, 2000, 2000]}), 100)
+    assert activity["activity"] == pytest.approx(10.0)
+    assert activity["series"] == 2
+    assert activity["top"][1] == pytest.approx(10.0)
+
+
+def test_activity_without_data():
+    assert price_activity(None)["activity"] is None
+    assert price_activity(history({("ps", 83): [1000]}))["activity"] is None
+
+
+@pytest.mark.parametrize("activity, expected", [
+    (None, 5400),
+    (0.5, 5400),
+    (1.0, 5400),
+    (5.0, 600),
+    (20.0, 600),
+])
+def test_choose_interval_limits(activity, expected):
+    seconds, _ = choose_interval(activity, None, min_s=600, max_s=5400, calm_pct=1, busy_pct=5)
+    assert seconds == pytest.approx(expected)
+
+
+def test_choose_interval_between_thresholds():
+    seconds, _ = choose_interval(2.0, None, min_s=600, max_s=5400, calm_pct=1, busy_pct=5)
+    assert 600 < seconds < 5400
+    # Más actividad, intervalo más corto
+    assert choose_interval(3.0, None, min_s=600, max_s=5400, calm_pct=1, busy_pct=5)[0] < seconds
+
+
+def test_choose_interval_limits_backoff():
+    seconds, reason = choose_interval(0.1, 600, min_s=600, max_s=5400, calm_pct=1, busy_pct=5)
+    assert seconds == 600 * MAX_BACKOFF_FACTOR
+    assert "limitada" in reason
+    # Sin datos se mantiene el intervalo anterior
+    assert choose_interval(None, 900, min_s=600, max_s=5400)[0] == 900
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from scheduler.cron import next_run, parse_cron
+
+
+def test_parse_fields():
+    cron = parse_cron("*/15 8-10 1,15 * 7")
+    assert cron["minutes"] == {0, 15, 30, 45}
+    assert cron["hours"] == {8, 9, 10}
+    assert cron["days"] == {1, 15}
+    assert cron["months"] == set(range(1, 13))
+    assert cron["weekdays"] == {0}
+    assert not cron["any_day"] and not cron["any_weekday"]
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "*/0 * * * *", "a * * * *",
+                                        "5-1 * * * *"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        parse_cron(expression)
+
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("0 * * * *", datetime(2026, 3, 1, 10, 0), datetime(2026, 3, 1, 11, 0)),
+    ("*/15 * * * *", datetime(2026, 3, 1, 10, 7, 30), datetime(2026, 3, 1, 10, 15)),
+    ("30 2 * * *", datetime(2026, 12, 31, 3, 0), datetime(2027, 1, 1, 2, 30)),
+    # Día del mes y de la semana restringidos: alcanza con uno (el 2026-03-02 es lunes)
+    ("0 0 15 * 1", datetime(2026, 3, 1, 12, 0), datetime(2026, 3, 2, 0, 0)),
+    ("0 0 29 2 *", datetime(2026, 3, 1), datetime(2028, 2, 29)),
+])
+def test_next_run(expression, after, expected):
+    assert next_run(expression, after) == expected
+
+
+def test_impossible_date():
+    with pytest.raises(ValueError):
+        next_run("0 0 31 2 *", datetime(2026, 1, 1))
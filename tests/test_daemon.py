@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from common import EXPECTED
+
+
+class CountingBrowser:
+    """WarmBrowser que solo cuenta cuántas veces se pidió el navegador"""
+
+    runs = 0
+
+    def __init__(self):
+        self.gets = 0
+
+    async def get(self, stats=None):
+        self.gets += 1
+        return "navegador"
+
+    async def release(self, ok=True):
+        return None
+
+
+def pipeline(scrape, summary_fields):
+    return 0 if scrape({}) else 1
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    from scheduler import lock
+    from scraping import main
+
+    monkeypatch.setattr(lock, "SCHEDULER_LOCK_PATH", str(tmp_path / "pipeline.lock"))
+    monkeypatch.delenv("SCRAPER_TARGETS_PATH", raising=False)
+    monkeypatch.delenv("SCRAPER_HTTP_FAST_PATH", raising=False)
+    return main
+
+
+def run_once(warm):
+    from scheduler.daemon import run_once
+
+    loop = asyncio.new_event_loop()
+    try:
+        return run_once(pipeline, loop, warm, 1)
+    finally:
+        loop.close()
+
+
+def test_http_path_does_not_launch_browser(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "fetch_cheapest_http", lambda *args, **kwargs: dict(EXPECTED))
+    warm = CountingBrowser()
+    assert run_once(warm) == 0
+    assert warm.gets == 0
+
+
+def test_failed_scrape_returns_exit_code(scraper, monkeypatch):
+    browsers = []
+
+    async def scrape_futbin_cheapest(platforms=None, stats=None, browser=None):
+        browsers.append(browser)
+        return None
+
+    monkeypatch.setattr(scraper, "fetch_cheapest_http", lambda *args, **kwargs: None)
+    monkeypatch.setattr(scraper, "scrape_futbin_cheapest", scrape_futbin_cheapest)
+    warm = CountingBrowser()
+    # Sin precios el scraper devuelve None (no sys.exit) y el pipeline termina con 1
+    assert run_once(warm) == 1
+    assert warm.gets == 1 and browsers == ["navegador"]
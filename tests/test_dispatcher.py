@@ -0,0 +1,60 @@
+import json
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from common import SinkHandler, reset_sinks, sink_server
+from notifications import dispatcher
+
+
+@pytest.fixture
+def sinks(monkeypatch):
+    monkeypatch.setattr(dispatcher, "NOTIFY_RETRY_BASE_S", 0.01)
+    with sink_server() as base:
+        reset_sinks()
+        yield base
+    dispatcher.close_sessions()
+
+
+def test_parse_sinks(monkeypatch):
+    monkeypatch.delenv("NOTIFY_SINKS", raising=False)
+    monkeypatch.setenv("NTFY_TOPIC", "uno, dos")
+    assert [sink["name"] for sink in dispatcher.parse_sinks()] == ["ntfy:uno", "ntfy:dos"]
+    assert dispatcher.parse_sinks("webhook:http://x/y, file:out.jsonl") == [
+        {"name": "webhook:http://x/y", "kind": "webhook", "target": "http://x/y"},
+        {"name": "file:out.jsonl", "kind": "file", "target": "out.jsonl"},
+    ]
+    for value in ("smtp:someone", "webhook:"):
+        with pytest.raises(ValueError):
+            dispatcher.parse_sinks(value)
+
+
+def test_file_sink(tmp_path):
+    path = tmp_path / "notifications" / "out.jsonl"
+    results = dispatcher.dispatch("título", "mensaje", dispatcher.parse_sinks(f"file:{path}"))
+    assert results[f"file:{path}"]["ok"]
+    assert json.loads(path.read_text(encoding="utf-8"))["message"] == "mensaje"
+
+
+def test_hung_sink_does_not_block_others(sinks):
+    start = time.perf_counter()
+    results = dispatcher.dispatch("t", "m", dispatcher.parse_sinks(
+        f"webhook:{sinks}/fast,webhook:{sinks}/slow,webhook:{sinks}/hang"), deadline_s=1.0)
+    assert time.perf_counter() - start < 1.5
+    assert results[f"webhook:{sinks}/hang"]["timed_out"]
+    assert results[f"webhook:{sinks}/fast"]["ok"] and results[f"webhook:{sinks}/slow"]["ok"]
+
+
+def test_retries_on_503(sinks):
+    result = dispatcher.dispatch("t", "m", dispatcher.parse_sinks(f"webhook:{sinks}/flaky"))[f"webhook:{sinks}/flaky"]
+    assert result["ok"]
+    assert result["attempts"] == SinkHandler.flaky_failures + 1
+
+
+def test_sessions_reuse_connections(sinks):
+    sink = dispatcher.parse_sinks(f"webhook:{sinks}/fast")
+    for _ in range(3):
+        dispatcher.dispatch("t", "m", sink)
+    assert SinkHandler.connections == 1
@@ -0,0 +1,15 @@
+import asyncio
+
+import pytest
+
+from common import EXPECTED, PLATFORMS, make_targets
+
+pytestmark = pytest.mark.usefixtures("chromium")
+
+
+def test_engine_pool(base_url):
+    from scraping.engine import scrape_targets
+
+    results = asyncio.run(scrape_targets(make_targets(3), concurrency=2, session_state_path=None,
+                                         base_url=base_url, platforms=PLATFORMS))
+    assert [result["prices"] for result in results.values()] == [EXPECTED] * 3
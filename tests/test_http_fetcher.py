@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from common import EXPECTED, PLATFORMS, RATINGS, read_fixture
+from scraping.http_fetcher import is_blocked_response, parse_cheapest_html, parse_rating_rows
+
+
+def test_parse_matches_playwright_prices():
+    assert parse_cheapest_html(read_fixture("futbin_cheapest.html"), RATINGS, PLATFORMS) == EXPECTED
+
+
+def test_page_without_columns():
+    assert parse_cheapest_html(read_fixture("futbin_home.html"), RATINGS, PLATFORMS) is None
+
+
+def test_blocked_responses():
+    assert not is_blocked_response(200, read_fixture("futbin_cheapest.html"))
+    assert is_blocked_response(200, read_fixture("futbin_blocked.html"))
+    assert is_blocked_response(429, "")
+
+
+def test_cloudflare_script_on_normal_page():
+    # Las páginas normales también cargan el script de challenge de Cloudflare
+    html = read_fixture("futbin_cheapest.html").replace(
+        "</body>", '<script src="/cdn-cgi/challenge-platform/scripts/jsd/main.js"></script></body>'
+    )
+    assert "challenge-platform" in html
+    assert not is_blocked_response(200, html)
+    assert parse_cheapest_html(html, RATINGS, PLATFORMS) == EXPECTED
+
+
+def test_pc_columns_use_hide_not_pc():
+    html = read_fixture("futbin_cheapest.html")
+    assert 'class="stc-player-column xs-column hide-not-pc"' in html
+    rows = parse_rating_rows(html, ["pc"])
+    assert rows and {row["platform"] for row in rows} == {"pc"}
+    assert parse_cheapest_html(html, RATINGS, ["pc"]) == {
+        key: price for key, price in EXPECTED.items() if key[0] == "pc"
+    }
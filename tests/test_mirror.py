@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from common import make_runs
+from database.mirror import filter_mirror, load_mirror, sync_mirror
+
+
+def test_incremental_sync(sqlite_storage, tmp_path):
+    runs = make_runs(2)
+    for run in runs[:-1]:
+        sqlite_storage.write_records(run, run)
+    path = str(tmp_path / "mirror")
+
+    full = sync_mirror(path)
+    assert full["fetched"] == full["rows"] == sum(len(run) for run in runs[:-1])
+
+    sqlite_storage.write_records(runs[-1], runs[-1])
+    incremental = sync_mirror(path, overlap_hours=0)
+    # Sin solapamiento se vuelve a pedir solo la última ejecución ya copiada (mismo timestamp)
+    assert incremental["fetched"] == 2 * len(runs[-1])
+    assert incremental["rows"] == sum(len(run) for run in runs)
+    assert incremental["last_timestamp"] == runs[-1][0]["timestamp"]
+
+    mirror = load_mirror(path)
+    assert len(mirror["price"]) == incremental["rows"]
+    latest = filter_mirror(mirror, since=runs[-1][0]["timestamp"])
+    assert sorted(latest["price"].tolist()) == sorted(row["price"] for row in runs[-1])
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from notifications import notifications
+
+
+PREVIOUS = {("cheapest", "ps", 84): 2000, ("cheapest", "ps", 85): 5000}
+
+
+@pytest.mark.parametrize("min_pct, min_coins, new_price, notified", [
+    (5, 0, 2090, False),
+    (5, 0, 2100, True),
+    (0, 200, 2150, False),
+    (0, 200, 2200, True),
+    (5, 200, 1850, True),
+    (0, 0, 2001, True),
+])
+def test_diff_thresholds(min_pct, min_coins, new_price, notified):
+    changes = notifications.diff_prices(PREVIOUS, {("ps", 84): new_price, ("ps", 85): 5000},
+                                        min_pct=min_pct, min_coins=min_coins)
+    assert changes == ({("cheapest", "ps", 84): (2000, new_price)} if notified else {})
+
+
+def test_diff_appeared_and_disappeared():
+    changes = notifications.diff_prices(PREVIOUS, {("ps", 84): None, ("ps", 85): 5000, ("ps", 86): 9000},
+                                        min_pct=50, min_coins=10000)
+    assert changes == {("cheapest", "ps", 84): (2000, None), ("cheapest", "ps", 86): (None, 9000)}
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "notify" / "snapshot.json")
+    assert notifications.load_snapshot(path) is None
+    snapshot = {**PREVIOUS, ("futbin", "pc", 86): None}
+    notifications.save_snapshot(snapshot, path)
+    assert notifications.load_snapshot(path) == snapshot
+    assert list((tmp_path / "notify").iterdir()) == [tmp_path / "notify" / "snapshot.json"]
+
+
+def test_invalid_snapshot_is_ignored(tmp_path):
+    path = tmp_path / "snapshot.json"
+    path.write_text("{", encoding="utf-8")
+    assert notifications.load_snapshot(str(path)) is None
+
+
+@pytest.fixture
+def changes_mode(tmp_path, monkeypatch):
+    """Modo changes con el snapshot y un destino file en tmp_path; devuelve los mensajes enviados"""
+    sink = tmp_path / "sent.jsonl"
+    monkeypatch.setenv("NOTIFY_SINKS", f"file:{sink}")
+    monkeypatch.setattr(notifications, "NOTIFY_MODE", "changes")
+    monkeypatch.setattr(notifications, "NOTIFY_MIN_CHANGE_PCT", 5)
+    monkeypatch.setattr(notifications, "NOTIFY_MIN_CHANGE_COINS", 0)
+    monkeypatch.setattr(notifications, "NOTIFY_SNAPSHOT_PATH", str(tmp_path / "snapshot.json"))
+
+    def sent():
+        if not sink.exists():
+            return []
+        return [json.loads(line)["message"] for line in sink.read_text(encoding="utf-8").splitlines()]
+    return sent
+
+
+def test_first_run_sends_everything_and_saves_snapshot(changes_mode):
+    assert notifications.send_scraper_notification({("ps", 84): 2000, ("ps", 85): 5000})
+    assert len(changes_mode()) == 1
+    assert notifications.load_snapshot() == PREVIOUS
+
+
+def test_snapshot_only_advances_for_notified_keys(changes_mode):
+    notifications.save_snapshot(PREVIOUS)
+
+    # 84 cambia un 3 %: no se avisa y el snapshot queda igual
+    assert notifications.send_scraper_notification({("ps", 84): 2060, ("ps", 85): 5000})
+    assert changes_mode() == []
+    assert notifications.load_snapshot() == PREVIOUS
+
+    # 84 llega al 6 % frente al último avisado y 85 se mueve un 2 %: solo avanza 84
+    assert notifications.send_scraper_notification({("ps", 84): 2120, ("ps", 85): 5100})
+    assert len(changes_mode()) == 1
+    assert "2.000 -> 2.120" in changes_mode()[0]
+    assert notifications.load_snapshot() == {("cheapest", "ps", 84): 2120, ("cheapest", "ps", 85): 5000}
@@ -0,0 +1,96 @@
+import pytest
+
+from common import EXPECTED
+from database import outbox
+from database.database import write_price_records
+
+
+def records(timestamp, prices=EXPECTED):
+    return [
+        {"source": "cheapest", "platform": platform, "rating": rating, "timestamp": timestamp, "price": price}
+        for (platform, rating), price in prices.items()
+    ]
+
+
+def test_flush_in_order_and_in_chunks(tmp_path):
+    path = str(tmp_path / "outbox.sqlite3")
+    for hour in range(3):
+        outbox.enqueue(records(f"2026-01-01T0{hour}:00:00"), path)
+
+    sent = []
+    result = outbox.flush(sent.append, path, max_rows=2 * len(EXPECTED), retries=0)
+
+    assert result == {"sent_batches": 3, "sent_rows": 3 * len(EXPECTED), "pending_batches": 0, "error": None}
+    assert [len(chunk) for chunk in sent] == [2 * len(EXPECTED), len(EXPECTED)]
+    assert [row["timestamp"] for chunk in sent for row in chunk] == sorted(
+        row["timestamp"] for chunk in sent for row in chunk
+    )
+
+
+def test_failed_send_keeps_batches_pending(tmp_path):
+    path = str(tmp_path / "outbox.sqlite3")
+    outbox.enqueue(records("2026-01-01T00:00:00"), path)
+    outbox.enqueue(records("2026-01-01T01:00:00"), path)
+    calls = []
+
+    def down(rows):
+        calls.append(rows)
+        raise ConnectionError("Supabase no responde")
+
+    result = outbox.flush(down, path, max_rows=len(EXPECTED), retries=2, retry_base_s=0)
+    assert result["pending_batches"] == 2
+    assert result["error"] == "Supabase no responde"
+    # Se detiene en el primer lote: el segundo no se envía antes que el primero
+    assert len(calls) == 3 and all(rows == calls[0] for rows in calls)
+    assert outbox.status(path)["last_error"] == "Supabase no responde"
+
+    sent = []
+    assert outbox.flush(sent.append, path, retries=0)["pending_batches"] == 0
+    assert sum(len(rows) for rows in sent) == 2 * len(EXPECTED)
+
+
+def test_compaction(tmp_path, monkeypatch):
+    path = str(tmp_path / "outbox.sqlite3")
+    outbox.enqueue(records("2026-01-01T00:00:00"), path)
+    outbox.flush(lambda rows: None, path, retries=0)
+    assert outbox.status(path)["sent_batches"] == 1
+
+    # Con un plazo vencido los lotes enviados se borran en el próximo flush
+    monkeypatch.setattr(outbox, "OUTBOX_KEEP_DAYS", -1)
+    outbox.flush(lambda rows: None, path, retries=0)
+    assert outbox.status(path)["sent_batches"] == 0
+
+
+def test_resend_is_idempotent(sqlite_storage):
+    batch = records("2026-01-01T00:00:00")
+    write_price_records(batch)
+    write_price_records(batch)
+    history = sqlite_storage.read_histories(None, None, None, None, None)
+    assert len(history["price"]) == len(EXPECTED)
+
+
+def test_resend_does_not_overwrite_newer_latest(sqlite_storage):
+    newer = records("2026-01-01T01:00:00", {("ps", 83): 1500})
+    older = records("2026-01-01T00:00:00", {("ps", 83): 1100})
+    write_price_records(newer)
+    write_price_records(older)
+    assert sqlite_storage.read_latest() == [{"source": "cheapest", "platform": "ps", "rating": 83, "price": 1500}]
+
+
+def test_supabase_resend_does_not_overwrite_newer_latest(fake_supabase):
+    newer = records("2026-01-01T01:00:00", {("ps", 83): 1500})
+    older = records("2026-01-01T00:00:00", {("ps", 83): 1100})
+    fake_supabase.write_records(newer, newer)
+    fake_supabase.write_records(older, older)
+    assert fake_supabase.read_latest() == [{"source": "cheapest", "platform": "ps", "rating": 83, "price": 1500}]
+
+
+def test_supabase_failed_latest_update_raises(fake_supabase, monkeypatch):
+    import fake_postgrest
+    from postgrest.exceptions import APIError
+
+    # Sin la función upsert_latest_prices el lote falla y queda pendiente en el outbox
+    monkeypatch.setattr(fake_postgrest, "RPC_FUNCTIONS", {})
+    batch = records("2026-01-01T00:00:00")
+    with pytest.raises(APIError):
+        fake_supabase.write_records(batch, batch)
@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+
+import pytest
+
+import run_pipeline
+from monitoring.monitoring import PhaseTimer
+
+
+@pytest.fixture
+def release():
+    """Evento que desbloquea las etapas colgadas al terminar el test"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def test_stage_past_timeout_is_abandoned(release):
+    timer = PhaseTimer()
+    start = time.perf_counter()
+    results = run_pipeline.run_stages(timer, {
+        "hang": (release.wait, (5,)),
+        "fast": (lambda value: value, (42,)),
+    }, timeouts={"hang": 0.05, "fast": 1})
+
+    assert time.perf_counter() - start < 1
+    assert results["hang"]["timed_out"] and results["hang"]["result"] is None
+    assert results["hang"]["error"].startswith("timeout")
+    assert results["fast"] == {"result": 42, "error": None, "timed_out": False}
+    phases = {span["name"]: span for span in timer.spans}
+    assert phases["hang"]["ok"] is False and phases["hang"]["timed_out"] is True
+    assert phases["fast"]["ok"] is True
+
+
+def test_stage_error_is_reported():
+    def fail():
+        raise RuntimeError("sin conexión")
+
+    results = run_pipeline.run_stages(PhaseTimer(), {"save_prices": (fail, ())}, timeouts={"save_prices": 1})
+    assert results["save_prices"] == {"result": None, "error": "sin conexión", "timed_out": False}
+
+
+def summary(output):
+    line = next(line for line in output.splitlines() if line.startswith("PIPELINE_SUMMARY "))
+    return json.loads(line[len("PIPELINE_SUMMARY "):])
+
+
+@pytest.fixture
+def pipeline(sqlite_storage, monkeypatch, release):
+    """Pipeline con scraper simulado y etapas reemplazables; devuelve (código, resumen, llamadas)"""
+    from database import database
+    from notifications import notifications
+
+    monkeypatch.setitem(run_pipeline.STAGE_TIMEOUTS, "save_prices", 0.2)
+    monkeypatch.setitem(run_pipeline.STAGE_TIMEOUTS, "notify", 0.2)
+    calls = []
+
+    def run(capsys, save_hangs=False, notify_hangs=False):
+        def save_prices(prices):
+            calls.append("save_prices")
+            return release.wait(5) if save_hangs else True
+
+        def send_scraper_notification(prices, stats=None):
+            calls.append("notify")
+            return release.wait(5) if notify_hangs else True
+
+        monkeypatch.setattr(database, "save_prices", save_prices)
+        monkeypatch.setattr(notifications, "send_scraper_notification", send_scraper_notification)
+        code = run_pipeline.run_complete_pipeline(scrape=lambda stats: {("ps", 84): 1500})
+        return code, summary(capsys.readouterr().out), calls
+
+    return run
+
+
+def test_slow_save_does_not_block_notify(pipeline, capsys):
+    code, result, calls = pipeline(capsys, save_hangs=True)
+    # Guardar es secundario: la notificación igual sale y el pipeline termina bien
+    assert code == 0 and result["status"] == "ok"
+    assert sorted(calls) == ["notify", "save_prices"]
+    phases = {phase["name"]: phase for phase in result["phases"]}
+    assert phases["save_prices"]["timed_out"] is True
+    assert phases["notify"]["ok"] is True
+
+
+def test_notify_timeout_fails_pipeline(pipeline, capsys):
+    code, result, calls = pipeline(capsys, notify_hangs=True)
+    assert code == 1 and result["status"] == "error"
+    phases = {phase["name"]: phase for phase in result["phases"]}
+    assert phases["notify"]["timed_out"] is True
+    assert phases["save_prices"]["ok"] is True
@@ -0,0 +1,19 @@
+import pytest
+
+from scraping.platforms import DEFAULT_PLATFORM, column_selector, get_platforms
+
+
+def test_default_is_single_platform(monkeypatch):
+    monkeypatch.delenv("SCRAPER_PLATFORMS", raising=False)
+    assert get_platforms() == [DEFAULT_PLATFORM] == ["ps"]
+
+
+def test_platforms_from_env(monkeypatch):
+    monkeypatch.setenv("SCRAPER_PLATFORMS", "PS, pc")
+    assert get_platforms() == ["ps", "pc"]
+    with pytest.raises(ValueError):
+        get_platforms("ps,xbox")
+
+
+def test_column_selector():
+    assert column_selector("pc") == ".stc-player-column.xs-column.hide-not-pc"
@@ -0,0 +1,74 @@
+import pytest
+
+from scraping.price_extractor import extract_price_value, extract_price_values
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("850", 850),
+    ("1,500", 1500),
+    ("1.500", 1500),
+    ("1.500.000", 1500000),
+    ("15K", 15000),
+    ("15k", 15000),
+    ("15.5K", 15500),
+    ("15,5K", 15500),
+    ("1.2M", 1200000),
+    ("  12.3K coins\n", 12300),
+    ("15 min", 15),
+])
+def test_auto_formats(text, expected):
+    assert extract_price_value(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "-", "N/A", "sin precio"])
+def test_not_a_price(text):
+    assert extract_price_value(text) is None
+
+
+def test_unknown_locale():
+    with pytest.raises(ValueError):
+        extract_price_value("1,500", locale="fr")
+
+
+@pytest.mark.parametrize("text, locale, expected", [
+    ("1,234.5K", "auto", 1234500),
+    ("1.234,5K", "auto", 1234500),
+    ("1,234.5K", "en", 1234500),
+    ("1.234,5K", "es", 1234500),
+    ("7,499K", "en", 7499000),
+    ("7.499K", "es", 7499000),
+    ("1,500", "en", 1500),
+    ("1.500", "es", 1500),
+    ("1,25M", "de", 1250000),
+])
+def test_separators_with_locale(text, locale, expected):
+    assert extract_price_value(text, locale=locale) == expected
+
+
+@pytest.mark.parametrize("text, locale", [
+    ("1,500", "es"),
+    ("1.500", "en"),
+    ("1,5", "auto"),
+    ("1.2345K", "auto"),
+    ("1,23,4K", "en"),
+])
+def test_invalid_for_locale(text, locale):
+    assert extract_price_value(text, locale=locale) is None
+
+
+def test_batch_returns_one_reason_per_text():
+    values, reasons = extract_price_values(["1,500", "", "N/A", "1,5", "1.2345K", "15K"])
+    assert values == [1500, None, None, None, None, 15000]
+    assert reasons[0] is None and reasons[-1] is None
+    assert reasons[1] == "texto vacío o inválido"
+    assert reasons[2] == "no contiene números"
+    assert reasons[3].startswith("número inválido para el locale")
+    assert reasons[4].startswith("no es un precio entero")
+
+
+def test_batch_uses_locale():
+    assert extract_price_values(["1.500", "1,500"], locale="es") == (
+        [1500, None], [None, "no es un precio entero: '1,500'"]
+    )
+    with pytest.raises(ValueError):
+        extract_price_values([], locale="fr")
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from scraping.ratings_processor import (
+    apply_rule,
+    calculate_price_for_rating,
+    load_rating_rules,
+    max_prices_needed,
+    process_platform_rows,
+    process_rating_rows,
+)
+
+
+def write_rules(tmp_path, config):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return load_rating_rules(str(path))
+
+
+def test_default_table():
+    rules = load_rating_rules()
+    assert rules["ratings"] == list(range(83, 91))
+    assert rules["rules"][87] == {"rule": "index", "index": 4}
+    assert rules["rules"][88] == {"rule": "index", "index": 3}
+    assert rules["rules"][90] == {"rule": "index", "index": 0}
+    assert max_prices_needed(rules) == 5
+
+
+@pytest.mark.parametrize("rule, expected", [
+    ({"rule": "index", "index": 1}, 900),
+    ({"rule": "index", "index": 9}, None),
+    ({"rule": "min", "first": 4}, 800),
+    ({"rule": "median", "first": 4}, 900),
+])
+def test_apply_rule(rule, expected):
+    assert apply_rule(rule, [1000, 900, None, 800, 1200]) == expected
+
+
+def test_rule_list_and_overrides(tmp_path):
+    rules = write_rules(tmp_path, {
+        "ratings": [91, 85],
+        "default": {"rule": "index", "index": 0},
+        "rules": {"91": {"rule": "min", "first": 2}},
+    })
+    assert rules["ratings"] == [85, 91]
+    assert calculate_price_for_rating(91, [500, 400, 100], rules) == 400
+    assert calculate_price_for_rating(85, [500, 400, 100], rules) == 500
+    assert calculate_price_for_rating(86, [500], rules) is None
+
+
+@pytest.mark.parametrize("config", [
+    {"ratings": [85], "default": {"rule": "avg", "first": 2}},
+    {"ratings": [85], "default": {"rule": "index", "index": -1}},
+    {"ratings": [85], "default": {"rule": "min"}},
+])
+def test_invalid_rules(tmp_path, config):
+    with pytest.raises(ValueError):
+        write_rules(tmp_path, config)
+
+
+def test_rows_by_column_title(tmp_path):
+    rules = write_rules(tmp_path, {
+        "ratings": [75, 85], "default": {"rule": "index", "index": 0},
+    })
+    rows = [
+        # Un precio "1.75K" no hace que esta columna sea la del rating 75
+        {"text": "85 1.75K", "prices": ["1.75K"]},
+        {"text": "75 900", "prices": ["900"]},
+    ]
+    assert process_rating_rows(rows, rules=rules) == [900, 1750]
+
+
+def test_text_fallback_for_ratings_without_title(tmp_path):
+    rules = write_rules(tmp_path, {
+        "ratings": [75, 85], "default": {"rule": "index", "index": 0},
+    })
+    rows = [
+        {"text": "85", "prices": ["2K"]},
+        # Sin título: el rating 75 solo aparece dentro del texto
+        {"text": "Rating 75", "prices": ["900"]},
+    ]
+    assert process_rating_rows(rows, rules=rules) == [900, 2000]
+
+
+def test_rules_path_read_on_each_call(tmp_path, monkeypatch):
+    first = tmp_path / "first.json"
+    second = tmp_path / "second.json"
+    first.write_text(json.dumps({"ratings": [80], "default": {"rule": "index", "index": 0}}), encoding="utf-8")
+    second.write_text(json.dumps({"ratings": [81], "default": {"rule": "index", "index": 0}}), encoding="utf-8")
+
+    monkeypatch.setenv("RATING_RULES_PATH", str(first))
+    assert load_rating_rules()["ratings"] == [80]
+    monkeypatch.setenv("RATING_RULES_PATH", str(second))
+    assert load_rating_rules()["ratings"] == [81]
+    monkeypatch.delenv("RATING_RULES_PATH")
+    assert load_rating_rules()["ratings"] == list(range(83, 91))
+
+
+def test_platform_rows():
+    rows = [
+        {"platform": "ps", "text": "83", "prices": ["1K", "1.1K", "1.2K", "1.3K", "1.4K"]},
+        {"platform": "pc", "text": "83", "prices": ["2K", "2.1K", "2.2K", "2.3K", "2.4K"]},
+    ]
+    assert process_platform_rows(rows, ["ps", "pc"], ratings=[83]) == {("ps", 83): 1400, ("pc", 83): 2400}
+    assert process_platform_rows(rows[:1], ["ps", "pc"], ratings=[83]) == {("ps", 83): 1400, ("pc", 83): None}
@@ -0,0 +1,35 @@
+"""
+Scraping con Playwright contra las páginas guardadas (benchmarks/fixtures/) en un servidor local
+"""
+
+import asyncio
+
+import pytest
+
+from common import EXPECTED, PLATFORMS, RATINGS, read_fixture
+
+pytestmark = pytest.mark.usefixtures("chromium")
+
+
+def test_extraction_modes_agree():
+    from playwright.async_api import async_playwright
+    from scraping.scraper import extract_prices
+
+    async def extract():
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            page = await browser.new_page()
+            await page.set_content(read_fixture("futbin_cheapest.html"))
+            results = [await extract_prices(page, PLATFORMS, RATINGS, mode) for mode in ("handles", "evaluate")]
+            await browser.close()
+        return results
+
+    handles, evaluate = asyncio.run(extract())
+    assert handles == evaluate == EXPECTED
+
+
+def test_scrape_cheapest(base_url):
+    from scraping.scraper import scrape_futbin_cheapest
+
+    prices = asyncio.run(scrape_futbin_cheapest(session_state_path=None, base_url=base_url, platforms=PLATFORMS))
+    assert prices == EXPECTED
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+
+from common import EXPECTED, PLATFORMS, make_targets
+
+
+def test_shard_targets():
+    from scraping.sharding import shard_targets
+
+    targets = make_targets(5)
+    shards = shard_targets(targets, 3)
+    assert [[target["name"] for target in shard] for shard in shards] == [
+        ["target-0", "target-3"], ["target-1", "target-4"], ["target-2"],
+    ]
+    assert shard_targets(targets[:1], 4) == [targets[:1]]
+
+
+@pytest.mark.usefixtures("chromium")
+def test_sharded(base_url):
+    from scraping.sharding import scrape_sharded
+
+    stats = {}
+    results = asyncio.run(scrape_sharded(make_targets(4), 2, stats=stats, concurrency=2,
+                                         session_state_path=None, base_url=base_url, platforms=PLATFORMS))
+    assert stats["workers"] == 2
+    assert [result["prices"] for result in results.values()] == [EXPECTED] * 4
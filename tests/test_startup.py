@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from monitoring import startup
+from run_pipeline import PROFILE_CODE
+
+# Paquetes que los subcomandos sin scraping no deben importar al arrancar
+HEAVY_PACKAGES = ("playwright", "supabase", "numpy")
+
+# Arranque máximo de un subcomando sin scraping por encima del intérprete solo (ms, con margen para CI)
+STARTUP_BUDGET_MS = 150
+
+# Termina con error si load_command dejó cargado alguno de HEAVY_PACKAGES
+CHECK_CODE = PROFILE_CODE + """
+import sys
+loaded = sorted({{name.split(".")[0] for name in sys.modules}} & set({packages!r}))
+sys.exit(f"importa {{loaded}}" if loaded else 0)"""
+
+
+@pytest.fixture
+def fresh_env(tmp_path, monkeypatch):
+    """load_env sin cargar, con ENV_PATH inexistente y el directorio de trabajo en tmp_path"""
+    pytest.importorskip("dotenv")
+    monkeypatch.setattr(startup, "_env_loaded", False)
+    monkeypatch.setattr(startup, "ENV_PATH", str(tmp_path / "proyecto" / ".env"))
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    os.environ.pop("STARTUP_TEST_VALUE", None)
+
+
+def test_falls_back_to_env_in_working_directory(fresh_env):
+    (fresh_env / ".env").write_text("STARTUP_TEST_VALUE=cwd\n")
+    assert startup.load_env()
+    assert os.environ["STARTUP_TEST_VALUE"] == "cwd"
+
+
+def test_loads_once_and_without_file(fresh_env):
+    assert not startup.load_env()
+    (fresh_env / ".env").write_text("STARTUP_TEST_VALUE=tarde\n")
+    assert not startup.load_env()
+    assert "STARTUP_TEST_VALUE" not in os.environ
+
+
+@pytest.mark.parametrize("command", ["save", "notify", "history", "dry-run"])
+def test_command_startup_stays_light(command):
+    interpreter = startup.import_profile("pass")
+    profile = startup.import_profile(CHECK_CODE.format(command=command, packages=HEAVY_PACKAGES))
+    assert profile["returncode"] == 0, profile["error"]
+    assert profile["wall_ms"] - interpreter["wall_ms"] < STARTUP_BUDGET_MS
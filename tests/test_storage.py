@@ -0,0 +1,38 @@
+from common import PLATFORMS, RATINGS, make_runs
+
+
+def load(backend, runs):
+    for run in runs:
+        backend.write_records(run, run)
+
+
+def test_backends_return_same_data(sqlite_storage, fake_supabase):
+    runs = make_runs(2)
+    since = runs[-12][0]["timestamp"]
+    results = []
+    for backend in (sqlite_storage, fake_supabase):
+        load(backend, runs)
+        results.append({
+            "latest": sorted((row["platform"], row["rating"], row["price"]) for row in backend.read_latest()),
+            "history": backend.read_history("cheapest", PLATFORMS[0], RATINGS[0], 10),
+            "window": backend.read_histories(None, None, None, since, None, 100),
+        })
+
+    sqlite, supabase = results
+    assert sqlite == supabase
+    assert len(sqlite["window"]["price"]) == 12 * len(PLATFORMS) * len(RATINGS)
+    assert [row["price"] for row in sqlite["history"]] == [
+        next(row["price"] for row in run if row["platform"] == PLATFORMS[0] and row["rating"] == RATINGS[0])
+        for run in reversed(runs[-10:])
+    ]
+
+
+def test_price_histories_filters(sqlite_storage):
+    from database.database import get_price_histories
+
+    runs = make_runs(1)
+    load(sqlite_storage, runs)
+    history = get_price_histories(ratings=[RATINGS[0]], platforms=["pc"], since=runs[-3][0]["timestamp"])
+    assert history["rating"] == [RATINGS[0]] * 3
+    assert history["platform"] == ["pc"] * 3
+    assert history["timestamp"] == sorted(history["timestamp"])